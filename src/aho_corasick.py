@@ -0,0 +1,194 @@
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Characters re.IGNORECASE matches to others, although their lower or
+# upper cases have several characters, and so cannot be folded through
+_EXTRA_FOLDS = {
+    "\u0130": "i",
+    "\u1fd3": "\u0390",
+    "\u1fe3": "\u03b0",
+    "\ufb05": "\ufb06",
+}
+
+
+class _Folding(dict):
+    """
+    Table for str.translate, folding the case of each character the \
+first time it is met.
+    """
+
+    def __missing__(self, code: int) -> str:
+        char = chr(code)
+        folded = _EXTRA_FOLDS.get(char, char)
+        upper = folded.upper()
+        if len(upper) == 1 and len(upper.lower()) == 1:
+            folded = upper.lower()
+        elif len(folded.lower()) == 1:
+            folded = folded.lower()
+        self[code] = folded
+        return folded
+
+
+_folding = _Folding()
+
+
+def fold_case(text: str) -> str:
+    """
+    Folds the case of a text character by character, so that two \
+characters fold to the same one exactly when re.IGNORECASE matches them \
+to each other, e.g. "s", "S" and "\u017f" (long s) all fold to "s". \
+Unlike str.lower and str.casefold, no character becomes several, so \
+offsets in the folded text are those of the text.
+
+    Parameters:
+        text (str): Text to be folded.
+
+    Returns:
+        str: The folded text, of the same length.
+    """
+    if text.isascii():
+        return text.lower()
+    return text.translate(_folding)
+
+
+class Automaton:
+    """
+    Aho-Corasick automaton finding any of many fixed strings in a text \
+in a single pass, however many strings there are.
+
+    The strings are stored in a trie. Every node also has a failure \
+link to the node of the longest proper suffix of its string that is in \
+the trie, so on a character with no edge the search follows failure \
+links instead of going back in the text, and every character of the \
+text is read once.
+
+    Attributes:
+        patterns (Tuple[str, ...]): Strings searched for.
+        ignore_case (bool): Whether case is ignored, as re.IGNORECASE \
+ignores it.
+
+    Methods:
+        search (str): Returns the first occurrence of any string.
+        find_all (str): Yields every occurrence of every string.
+    """
+
+    def __init__(self, patterns: Iterable[str], ignore_case: bool = False):
+        self.patterns = tuple(patterns)
+        self.ignore_case = ignore_case
+        # Edges, failure link and strings ending at each node, node 0
+        # being the root
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[str, ...]] = [()]
+        # The empty string occurs at every offset, so is kept apart
+        self._empty = ("",) if "" in self.patterns else ()
+        for pattern in self.patterns:
+            if pattern:
+                key = fold_case(pattern) if ignore_case else pattern
+                self._add(key, pattern)
+        self._link()
+
+    def _add(self, key: str, pattern: str) -> None:
+        """
+        Adds a string to the trie.
+
+        Parameters:
+            key (str): Characters of the string as searched.
+            pattern (str): String reported for a match.
+        """
+        goto = self._goto
+        state = 0
+        for char in key:
+            child = goto[state].get(char)
+            if child is None:
+                child = len(goto)
+                goto[state][char] = child
+                goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = child
+        if pattern not in self._output[state]:
+            self._output[state] += (pattern,)
+
+    def _link(self) -> None:
+        """
+        Sets the failure links, in breadth first order, so the link of \
+a node's parent is set before its own, and adds to every node the \
+strings ending at the node it links to.
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in goto[state].items():
+                queue.append(child)
+                link = fail[state]
+                while link and char not in goto[link]:
+                    link = fail[link]
+                if state:
+                    fail[child] = goto[link].get(char, 0)
+                output[child] += output[fail[child]]
+
+    def search(self, text: str) -> Optional[Tuple[int, str]]:
+        """
+        Finds the occurrence of any string that ends first in a text.
+
+        Parameters:
+            text (str): Text to be searched.
+
+        Returns:
+            Optional[Tuple[int, str]]: Offset just past the end of the \
+occurrence, and the string, or None if no string occurs.
+        """
+        if self._empty:
+            return 0, ""
+        goto, fail, output = self._goto, self._fail, self._output
+        if self.ignore_case:
+            text = fold_case(text)
+        state = 0
+        for end, char in enumerate(text, 1):
+            child = goto[state].get(char)
+            while child is None and state:
+                state = fail[state]
+                child = goto[state].get(char)
+            if child:
+                state = child
+                if output[state]:
+                    return end, output[state][0]
+            else:
+                state = 0
+        return None
+
+    def find_all(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+        Yields every occurrence of every string in a text, including \
+overlapping ones, in the order they end.
+
+        Parameters:
+            text (str): Text to be searched.
+
+        Returns:
+            Iterator[Tuple[int, str]]: Offset just past the end of each \
+occurrence, and the string.
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        empty = self._empty
+        for pattern in empty:
+            yield 0, pattern
+        if self.ignore_case:
+            text = fold_case(text)
+        state = 0
+        for end, char in enumerate(text, 1):
+            child = goto[state].get(char)
+            while child is None and state:
+                state = fail[state]
+                child = goto[state].get(char)
+            state = child or 0
+            for pattern in output[state]:
+                yield end, pattern
+            for pattern in empty:
+                yield end, pattern
+
+    def __len__(self) -> int:
+        return len(self._goto)
@@ -1,6 +1,7 @@
 import sys
 from error import ArgumentError, ApplicationError
-from typing import List
+from itertools import chain
+from typing import Callable, Iterable, Iterator, List, Optional
 
 
 class Application:
@@ -8,29 +9,137 @@ class Application:
     Interface for all applications.
 
     Methods:
-        execute (List[str], List[str]): Executes the application.
-        stdin_check (): Checks for stdin.
+        execute (List[str], List[str], Iterable[str]): Executes the \
+application.
+        stream (List[str], Iterable[str]): Executes the application lazily.
+        combiner (List[str]): Tells whether stdin can be split in batches.
+        file_arguments (List[str], str): Reads a file instead of stdin.
+        stdin_check (Iterable[str]): Checks for stdin.
+        stdin_lines (Iterable[str]): Checks for stdin without reading it.
+        ensure_newline (Iterable[str]): Terminates the last line.
 
     Exceptions:
         ApplicationError: If parent class execute method is called.
     """
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         raise ApplicationError("Calling parent class execute method")
 
+    def stream(
+        self, args: List[str], stdin: Iterable[str] = None
+    ) -> Iterator[str]:
+        """
+        Executes the application, yielding its output line by line.
+
+        Applications that can work on one line at a time override this; \
+by default the application runs to completion on the first request for \
+a line.
+
+        Parameters:
+            args (List[str]): Arguments to be passed.
+            stdin (Iterable[str]): Lines of stdin. If not specified, \
+uses sys.stdin.
+
+        Returns:
+            (Iterator[str]): Output lines.
+        """
+        out = []
+        self.execute(args, out, stdin)
+        yield from out
+
+    def combiner(
+        self, args: List[str]
+    ) -> Optional[Callable[[Iterable[List[str]]], Iterator[str]]]:
+        """
+        Tells whether the application can process consecutive batches of \
+stdin separately, for example in other processes.
+
+        Parameters:
+            args (List[str]): Arguments to be passed.
+
+        Returns:
+            (Optional[Callable]): Function joining the outputs for the \
+batches, in order, into the output for the whole of stdin, or None if \
+stdin cannot be split.
+        """
+        return None
+
+    def file_arguments(
+        self, args: List[str], path: str
+    ) -> Optional[List[str]]:
+        """
+        Gives the arguments that make the application read a file, with \
+the same output as if the lines of the file were its stdin.
+
+        Parameters:
+            args (List[str]): Arguments to be passed, reading stdin.
+            path (str): Path of a non-empty, newline terminated file.
+
+        Returns:
+            (Optional[List[str]]): Arguments reading the file, or None if \
+the application cannot read it in place of stdin.
+        """
+        return None
+
     @staticmethod
-    def stdin_check() -> List[str]:
+    def stdin_check(stdin: Iterable[str] = None) -> List[str]:
         """
         Stdin handling with exception.
 
+        Parameters:
+            stdin (Iterable[str]): Lines of stdin. If not specified, \
+uses sys.stdin.
+
         Returns:
             (List[str]): Returns list of lines read from stdin.
 
         Exceptions:
             ArgumentError: If no standard input detected.
         """
-        lines = sys.stdin.readlines()
+        lines = list(sys.stdin if stdin is None else stdin)
         if lines:
             return lines
         else:
             raise ArgumentError("No standard input detected")
+
+    @staticmethod
+    def stdin_lines(stdin: Iterable[str] = None) -> Iterator[str]:
+        """
+        Stdin handling with exception, reading only the first line.
+
+        Parameters:
+            stdin (Iterable[str]): Lines of stdin. If not specified, \
+uses sys.stdin.
+
+        Returns:
+            (Iterator[str]): Returns iterator over the lines of stdin.
+
+        Exceptions:
+            ArgumentError: If no standard input detected.
+        """
+        lines = iter(sys.stdin if stdin is None else stdin)
+        first = next(lines, None)
+        if first is None:
+            raise ArgumentError("No standard input detected")
+        return chain([first], lines)
+
+    @staticmethod
+    def ensure_newline(lines: Iterable[str]) -> Iterator[str]:
+        """
+        Yields the lines, adding a newline to the last one if it is missing.
+
+        Parameters:
+            lines (Iterable[str]): Lines to be yielded.
+
+        Returns:
+            (Iterator[str]): The same lines, newline terminated.
+        """
+        previous = None
+        for line in lines:
+            if previous is not None:
+                yield previous
+            previous = line
+        if previous is not None:
+            yield previous if previous.endswith("\n") else previous + "\n"
@@ -0,0 +1,184 @@
+from collections.abc import Mapping
+from error import ApplicationError
+from functools import partial
+from help_decorator import HelpDecorator
+from importlib import import_module
+from typing import Callable, Dict, Tuple
+from unsafe_decorator import UnsafeDecorator
+from application import Application
+
+
+# Module and class of every application, imported on first use.
+APPLICATIONS: Dict[str, Tuple[str, str]] = {
+    "cat": ("apps.cat", "Cat"),
+    "cd": ("apps.cd", "Cd"),
+    "color": ("apps.color", "Color"),
+    "cp": ("apps.cp", "Cp"),
+    "cut": ("apps.cut", "Cut"),
+    "echo": ("apps.echo", "Echo"),
+    "exit": ("apps.exit", "Exit"),
+    "find": ("apps.find", "Find"),
+    "font": ("apps.font", "Font"),
+    "grep": ("apps.grep", "Grep"),
+    "head": ("apps.head", "Head"),
+    "ls": ("apps.ls", "Ls"),
+    "mkdir": ("apps.mkdir", "Mkdir"),
+    "mv": ("apps.mv", "Mv"),
+    "pwd": ("apps.pwd", "Pwd"),
+    "remove": ("apps.rm", "Rm"),
+    "rmdir": ("apps.rmdir", "Rmdir"),
+    "sed": ("apps.sed", "Sed"),
+    "sort": ("apps.sort", "Sort"),
+    "tail": ("apps.tail", "Tail"),
+    "touch": ("apps.touch", "Touch"),
+    "uniq": ("apps.uniq", "Uniq"),
+    "wc": ("apps.wc", "Wc"),
+}
+
+
+def load_application(module: str, name: str) -> Application:
+    """
+    Imports an application module and instantiates the application.
+
+    Parameters:
+        module (str): Module the application is defined in.
+        name (str): Class name of the application.
+
+    Returns:
+        Application: New application object.
+    """
+    return getattr(import_module(module), name)()
+
+
+class LazyApplicationMap(Mapping):
+    """
+    Maps application names to applications, creating each application \
+the first time it is looked up.
+
+    Attributes:
+        loaders (Dict[str, Callable[[], Application]]): Maps the name of \
+the application to the function creating it.
+        applications (Dict[str, Application]): Applications created so far.
+
+    Methods:
+        add (str, Callable[[], Application]): Adds an application.
+
+    Implements:
+        Mapping: Read-only dictionary interface.
+    """
+
+    def __init__(self) -> None:
+        self.loaders: Dict[str, Callable[[], Application]] = {}
+        self.applications: Dict[str, Application] = {}
+
+    def add(self, name: str, loader: Callable[[], Application]) -> None:
+        """
+        Adds or replaces an application.
+
+        Parameters:
+            name (str): Name of the application.
+            loader (Callable[[], Application]): Creates the application.
+        """
+        self.loaders[name] = loader
+        self.applications.pop(name, None)
+
+    def __getitem__(self, name: str) -> Application:
+        try:
+            return self.applications[name]
+        except KeyError:
+            pass
+        application = self.loaders[name]()
+        self.applications[name] = application
+        return application
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.loaders
+
+    def __iter__(self):
+        return iter(self.loaders)
+
+    def __len__(self) -> int:
+        return len(self.loaders)
+
+
+class ApplicationRegistry(LazyApplicationMap):
+    """
+    Resolves application names to ready-to-run applications.
+
+    Nothing is created up front. The loader of a name decides how to \
+wrap the application when it is first looked up: a leading underscore \
+selects the unsafe variant and every application but help answers -h \
+and --help. The result is kept, so later lookups are a single dictionary \
+lookup.
+
+    Attributes:
+        helpful (bool): Whether applications are wrapped in HelpDecorator.
+        unsafe (bool): Whether "_<name>" resolves to UnsafeDecorator.
+
+    Methods:
+        resolve (str): Returns the application for a name.
+    """
+
+    def __init__(self, helpful: bool = True, unsafe: bool = True) -> None:
+        super().__init__()
+        self.helpful = helpful
+        self.unsafe = unsafe
+        for name, (module, class_name) in APPLICATIONS.items():
+            self.add(name, partial(self.load, module, class_name))
+        if helpful:
+            self.add("help", partial(load_application, "apps.help", "Help"))
+        if unsafe:
+            for name in list(self.loaders):
+                self.add(f"_{name}", partial(self.load_unsafe, name))
+
+    def load(self, module: str, class_name: str) -> Application:
+        """
+        Creates an application, answering -h and --help if helpful.
+
+        Parameters:
+            module (str): Module the application is defined in.
+            class_name (str): Class name of the application.
+
+        Returns:
+            Application: New application object.
+        """
+        application = load_application(module, class_name)
+        return HelpDecorator(application) if self.helpful else application
+
+    def load_unsafe(self, name: str) -> Application:
+        """
+        Creates the unsafe variant of an application, which wraps the \
+application resolved for its name.
+
+        Parameters:
+            name (str): Name of the application, without the underscore.
+
+        Returns:
+            Application: New UnsafeDecorator.
+        """
+        return UnsafeDecorator(self[name])
+
+    def resolve(self, name: str) -> Application:
+        """
+        Returns the application for a name, creating it on first use.
+
+        Parameters:
+            name (str): Name of the application.
+
+        Returns:
+            Application: Application ready to be executed.
+
+        Exceptions:
+            ApplicationError: If the application is not supported.
+        """
+        try:
+            return self.applications[name]
+        except KeyError:
+            pass
+        if name not in self.loaders:
+            raise ApplicationError(f"Unsupported application {name}")
+        return self[name]
+
+
+# Shared by every call in the process.
+registry = ApplicationRegistry()
@@ -1,5 +1,5 @@
 from error import FileError
-from typing import List
+from typing import Iterable, Iterator, List
 from application import Application
 
 
@@ -12,26 +12,62 @@ class Cat(Application):
 If no files are specified, uses stdin.
     """
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Executes the cat command.
 
         Parameters:
             args (List[str]): Arguments (filenames) to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin. If not specified, \
+uses sys.stdin.
+
+        Exceptions:
+            FileError: If file does not exist.
+        """
+        out.extend(self.stream(args, stdin))
+
+    def stream(
+        self, args: List[str], stdin: Iterable[str] = None
+    ) -> Iterator[str]:
+        """
+        Executes the cat command lazily, one line at a time.
+
+        Parameters:
+            args (List[str]): Arguments (filenames) to be passed.
+            stdin (Iterable[str]): Lines of stdin.
+
+        Returns:
+            (Iterator[str]): Output lines.
 
         Exceptions:
             FileError: If file does not exist.
         """
         if len(args) == 0:
-            out.extend(self.stdin_check())
+            yield from self.ensure_newline(self.stdin_lines(stdin))
         else:
-            for a in args:
-                try:
-                    with open(a.rstrip()) as f:
-                        # out.append(f.read())
-                        out.extend(f.readlines())
-                except FileNotFoundError:
-                    raise FileError(f"File does not exist - {a}")
-        if len(out) > 0 and out[-1][-1] != "\n":
-            out[-1] += "\n"
+            yield from self.ensure_newline(self.read_files(args))
+
+    @staticmethod
+    def read_files(args: List[str]) -> Iterator[str]:
+        """
+        Yields the lines of the given files.
+
+        Parameters:
+            args (List[str]): Filenames.
+
+        Returns:
+            (Iterator[str]): Lines of the files, in order.
+
+        Exceptions:
+            FileError: If file does not exist.
+        """
+        for a in args:
+            try:
+                f = open(a.rstrip())
+            except FileNotFoundError:
+                raise FileError(f"File does not exist - {a}")
+            with f:
+                yield from f
@@ -1,5 +1,5 @@
 from error import ArgumentError, FlagError
-from typing import List
+from typing import Iterable, List
 from application import Application
 
 
@@ -15,13 +15,16 @@ class Color(Application):
             - [reset]: resets the text color.
     """
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Executes the color command.
 
         Parameters:
             args (List[str]): Arguments to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin, not read.
 
         Exceptions:
             ArgumentError: If wrong number of arguments passed.
@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import Iterable, List
 from application import Application
 from error import ArgumentError, FlagError, DirectoryError, FileError
 
@@ -73,13 +73,16 @@ directories (All subfiles and subdirectories copied).
             with open(dest_file, "w") as f:
                 f.writelines(source_lines)
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Executes the cp command.
 
         Parameters:
             args (List[str]): Arguments to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin, not read.
 
         Exceptions:
             ArgumentError: If wrong number of arguments passed.
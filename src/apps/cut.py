@@ -1,5 +1,6 @@
+from itertools import chain
 from error import ArgumentError, FileError, FlagError
-from typing import List
+from typing import Callable, Iterable, Iterator, List, Optional
 from application import Application
 
 
@@ -63,13 +64,37 @@ line to 3rd, and from 5th to the end of line.
 
         return intervals[1:]
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Executes the cut command.
 
         Parameters:
             args (List[str]): Arguments to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin. If not specified, \
+uses sys.stdin.
+
+        Exceptions:
+            ArgumentError: If wrong number of arguments passed.
+            FlagError: If wrong flags passed.
+            FileError: If file does not exist.
+        """
+        out.extend(self.stream(args, stdin))
+
+    def stream(
+        self, args: List[str], stdin: Iterable[str] = None
+    ) -> Iterator[str]:
+        """
+        Executes the cut command lazily, one line at a time.
+
+        Parameters:
+            args (List[str]): Arguments to be passed.
+            stdin (Iterable[str]): Lines of stdin.
+
+        Returns:
+            (Iterator[str]): Cut lines.
 
         Exceptions:
             ArgumentError: If wrong number of arguments passed.
@@ -86,15 +111,30 @@ line to 3rd, and from 5th to the end of line.
             raise FlagError("Wrong flag [cut -b <byte_range> <file>?]")
 
         bytes_range = args[1]
+
         if len(args) == 2:
-            lines = self.stdin_check()
+            yield from self.cut_lines(self.stdin_lines(stdin), bytes_range)
         else:
             try:
-                with open(args[2], "r") as file:
-                    lines = file.readlines()
+                file = open(args[2], "r")
             except FileNotFoundError:
                 raise FileError(f"File does not exist - {args[2]}")
+            with file:
+                yield from self.cut_lines(file, bytes_range)
 
+    def cut_lines(
+        self, lines: Iterable[str], bytes_range: str
+    ) -> Iterator[str]:
+        """
+        Cuts the byte ranges out of each line.
+
+        Parameters:
+            lines (Iterable[str]): Lines to be cut.
+            bytes_range (str): Byte ranges, as passed to -b.
+
+        Returns:
+            (Iterator[str]): Cut lines.
+        """
         byte_ranges_interval = self.define_ranges(bytes_range)
 
         for line in lines:
@@ -105,5 +145,21 @@ line to 3rd, and from 5th to the end of line.
                 start = int(start) - 1 if start else None
                 end = int(end) if end else None
                 line_output.append(line[start:end])
+            yield "".join(line_output) + "\n"
 
-            out.append("".join(line_output) + "\n")
+    def combiner(
+        self, args: List[str]
+    ) -> Optional[Callable[[Iterable[List[str]]], Iterator[str]]]:
+        """
+        Lines of stdin are cut one at a time, so batches are independent.
+
+        Parameters:
+            args (List[str]): Arguments to be passed.
+
+        Returns:
+            (Optional[Callable]): Function joining the outputs for the \
+batches, or None if stdin is not read.
+        """
+        if len(args) == 2 and args[0] == "-b":
+            return chain.from_iterable
+        return None
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Iterable, List
 from application import Application
 
 
@@ -11,12 +11,15 @@ class Echo(Application):
 When no arguments are presented, stdin is used.
     """
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Executes the echo command.
 
         Parameters:
             args (List[str]): Arguments to be repeated by function.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin, not read.
         """
         out.append(" ".join(args) + "\n")
@@ -1,6 +1,6 @@
 import sys
 from application import Application
-from typing import List
+from typing import Iterable, List
 
 
 class Exit(Application):
@@ -10,13 +10,19 @@ class Exit(Application):
     Usage: exit
     """
 
-    def execute(self, args: List[str] = None, out: List[str] = None) -> None:
+    def execute(
+        self,
+        args: List[str] = None,
+        out: List[str] = None,
+        stdin: Iterable[str] = None,
+    ) -> None:
         """
         Executes the exit command.
 
         Parameters:
             args (List[str]): Arguments to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin, not read.
         """
         print("Exiting shell. Goodbye! 👋")
         sys.exit()
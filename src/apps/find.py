@@ -2,7 +2,7 @@ import fnmatch
 import os
 from error import ArgumentError, FlagError, DirectoryError
 from os import listdir
-from typing import List
+from typing import Iterable, Iterator, List
 from application import Application
 
 
@@ -17,58 +17,64 @@ uses the current directory.
     """
 
     def find(
-        self, dire: str, prev: str, pattern: str, found: List[str], flag: bool
-    ) -> None:
+        self, dire: str, prev: str, pattern: str, flag: bool
+    ) -> Iterator[str]:
         """
-        Finds paths which match the pattern.
+        Finds paths which match the pattern, one directory entry at a time.
 
         Parameters:
             dire (str): Current directory.
             prev (str): Previous output directory.
             pattern (str): Pattern to be matched.
-            found (List[str]): Output array for matched paths.
             flag (bool): Flag for if it has been matched previously.
+
+        Returns:
+            (Iterator[str]): Matched paths.
         """
         if os.path.isdir(dire):
-            if flag:
-                for f in listdir(dire):
-                    if not f.startswith("."):
-                        self.find(
-                            os.path.join(dire, f),
-                            os.path.join(prev, f),
-                            pattern,
-                            found,
-                            True,
-                        )
-                        found.append(os.path.join(prev, f) + "\n")
-            else:
-                for f in listdir(dire):
-                    if not f.startswith("."):
-                        if fnmatch.fnmatch(f, pattern):
-                            self.find(
-                                os.path.join(dire, f),
-                                os.path.join(prev, f),
-                                pattern,
-                                found,
-                                True,
-                            )
-                            found.append(os.path.join(prev, f) + "\n")
-                        else:
-                            self.find(
-                                os.path.join(dire, f),
-                                os.path.join(prev, f),
-                                pattern,
-                                found,
-                                False,
-                            )
+            for f in listdir(dire):
+                if not f.startswith("."):
+                    matched = flag or fnmatch.fnmatch(f, pattern)
+                    yield from self.find(
+                        os.path.join(dire, f),
+                        os.path.join(prev, f),
+                        pattern,
+                        matched,
+                    )
+                    if matched:
+                        yield os.path.join(prev, f) + "\n"
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Executes the find command.
 
         Parameters:
             args (List[str]): Arguments to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin, not read.
+
+        Exceptions:
+            ArgumentError: If wrong number of arguments passed.
+            FlagError: If wrong flags passed.
+            DirectoryError: If directory does not exist.
+        """
+        out.extend(self.stream(args, stdin))
+
+    def stream(
+        self, args: List[str], stdin: Iterable[str] = None
+    ) -> Iterator[str]:
+        """
+        Executes the find command lazily, so a consumer that needs only \
+the first paths stops the search early.
+
+        Parameters:
+            args (List[str]): Arguments to be passed.
+            stdin (Iterable[str]): Lines of stdin, not read.
+
+        Returns:
+            (Iterator[str]): Matched paths.
 
         Exceptions:
             ArgumentError: If wrong number of arguments passed.
@@ -84,17 +90,16 @@ uses the current directory.
             # Without PATH name.
             if len(args) == 2 and args[0] == "-name":
                 ls_dir = os.getcwd()
-                self.find(ls_dir, ".", args[1], out, False)
+                yield from self.find(ls_dir, ".", args[1], False)
 
             # With PATH name.
             elif len(args) == 3 and args[1] == "-name":
                 ls_dir = os.getcwd()
                 if os.path.isdir(ls_dir + "/" + args[0]):
-                    self.find(
+                    yield from self.find(
                         os.path.join(ls_dir, args[0]),
                         os.path.join(args[0]),
                         args[2],
-                        out,
                         False,
                     )
                 else:
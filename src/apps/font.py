@@ -1,5 +1,5 @@
 from error import ArgumentError, FlagError
-from typing import List
+from typing import Iterable, List
 from application import Application
 
 
@@ -13,13 +13,16 @@ the following:
             - bold, italic, underline, crossed, dark, reversed, reset.
     """
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Changes the curent font.
 
         Parameters:
             args (List[str]): Arguments to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin, not read.
 
         Exceptions:
             ArgumentError: If wrong number of arguments passed.
@@ -1,64 +1,929 @@
+import codecs
+import io
+import locale
+import os
 import re
-from error import ArgumentError, FileError
-from typing import List
+from itertools import chain, filterfalse, islice
+from operator import itemgetter
+from aho_corasick import Automaton
+from error import ArgumentError, FileError, FlagError
+from literal_filter import (
+    RequiredLiteral,
+    candidate_lines,
+    find_lines,
+    required_literal,
+)
+from mapped_file import chunk_bounds, read_chunk
+from pattern_cache import PatternCache, pattern_cache
+from process_stage import map_ordered, read_batches
+from typing import (
+    AnyStr,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 from application import Application
+from walk import walk_files
+
+
+# Name printed by -l for matches in stdin.
+STDIN_NAME = "(standard input)"
+
+# Files of at least this many bytes are searched in chunks, by every core.
+LARGE_FILE_SIZE = 64 * 2**20
+
+# Approximate size of the chunks of a large file, in bytes.
+CHUNK_SIZE = 8 * 2**20
+
+# Number of files sent to a worker process at once by -r.
+FILES_PER_BATCH = 32
+
+# Several files are only searched by worker processes, which take a while
+# to start, once they hold this many bytes in total, or are this many.
+PARALLEL_MIN_SIZE = 64 * 2**20
+PARALLEL_MIN_FILES = 4096
+
+# An unescaped \s or \S, which also matches the separators \x1c to \x1f in
+# str patterns, but not in bytes patterns. No other class differs on ASCII.
+SPACE_CLASS = re.compile(r"(?<!\\)(?:\\\\)*\\[sS]")
+
+# Fixed strings of -F are found by an Aho-Corasick automaton from this many
+# strings on. Fewer are joined into a regular expression, which tries them
+# one at a time, but in C, so is faster until there are hundreds of them.
+AUTOMATON_MIN_STRINGS = 256
+
+
+class GrepOptions(NamedTuple):
+    """
+    Flags of a grep call.
+
+    Attributes:
+        invert (bool): -v, selects the lines that do not match.
+        ignore_case (bool): -i, ignores case when matching.
+        count (bool): -c, prints the number of selected lines per input.
+        files_with_matches (bool): -l, prints the name of every input \
+with a selected line.
+        line_number (bool): -n, prefixes lines with their line number.
+        max_count (Optional[int]): -m, stops reading an input after this \
+many selected lines, or None if unlimited.
+        recursive (bool): -r, searches the files in directories.
+        fixed_strings (bool): -F, matches fixed strings, one per line of \
+the pattern, anywhere in a line, rather than a regular expression.
+        pattern_file (Optional[str]): -f, file holding the patterns, one \
+per line, or None if the pattern is an argument.
+    """
+
+    invert: bool = False
+    ignore_case: bool = False
+    count: bool = False
+    files_with_matches: bool = False
+    line_number: bool = False
+    max_count: Optional[int] = None
+    recursive: bool = False
+    fixed_strings: bool = False
+    pattern_file: Optional[str] = None
+
+
+# Options set by each single letter flag.
+FLAGS = {
+    "v": "invert",
+    "i": "ignore_case",
+    "c": "count",
+    "l": "files_with_matches",
+    "n": "line_number",
+    "r": "recursive",
+    "F": "fixed_strings",
+}
+
+
+def compile_fixed(strings: str, flags: int = 0) -> Callable:
+    """
+    Builds the matcher finding any of the fixed strings of -F.
+
+    Parameters:
+        strings (str): Fixed strings, one per line.
+        flags (int): Flags of the re module, only re.IGNORECASE is used.
+
+    Returns:
+        (Callable): Search method of an Aho-Corasick automaton of the \
+strings, or of a regular expression if there are only a few.
+    """
+    patterns = strings.split("\n")
+    if len(patterns) < AUTOMATON_MIN_STRINGS:
+        return re.compile("|".join(map(re.escape, patterns)), flags).search
+    return Automaton(patterns, bool(flags & re.IGNORECASE)).search
+
+
+# Matchers of -F, which take a while to build for many strings, so are
+# only built once per process for the same strings.
+fixed_cache = PatternCache(maxsize=16, compile=compile_fixed)
+
+
+def compile_patterns(patterns: AnyStr, flags: int = 0) -> Callable:
+    """
+    Builds the matcher matching any of the regular expressions of -f.
+
+    Patterns without groups or flags of their own are joined into one \
+alternation, which tries them in C. The others are compiled apart, as \
+joining them would renumber their groups, so a backreference such as \
+\\1 would refer to a group of another pattern.
+
+    Parameters:
+        patterns (AnyStr): Regular expressions, one per line.
+        flags (int): Flags of the re module, e.g. re.IGNORECASE.
+
+    Returns:
+        (Callable): Function matching a line against every pattern, \
+returning the first match, or None if no pattern matches.
+
+    Exceptions:
+        re.error: If a pattern is invalid.
+    """
+    if isinstance(patterns, str):
+        newline, bar, group = "\n", "|", "(?:%s)"
+    else:
+        newline, bar, group = b"\n", b"|", b"(?:%s)"
+    compiled = [re.compile(p, flags) for p in patterns.split(newline)]
+    default = re.compile(patterns[:0], flags).flags
+    plain = [c for c in compiled if not c.groups and c.flags == default]
+    matchers = [c.match for c in compiled if c not in plain]
+    if len(plain) == 1:
+        matchers.append(plain[0].match)
+    elif plain:
+        alternation = bar.join(group % c.pattern for c in plain)
+        matchers.append(re.compile(alternation, flags).match)
+    if len(matchers) == 1:
+        return matchers[0]
+
+    def match(line: AnyStr) -> Optional[re.Match]:
+        for matcher in matchers:
+            found = matcher(line)
+            if found is not None:
+                return found
+        return None
+
+    return match
+
+
+# Matchers of -f, built once per process for the same patterns.
+patterns_cache = PatternCache(maxsize=16, compile=compile_patterns)
+
+
+def search_chunk(
+    path: str, start: int, end: int, pattern: str, options: GrepOptions
+) -> Tuple[int, int, List]:
+    """
+    Searches the lines of one chunk of a large file, in a worker process.
+
+    A chunk of ASCII text without carriage returns reads the same as \
+bytes as it does as text, so its lines are matched with a bytes pattern \
+and only the selected lines are decoded, unless the pattern holds \\s or \
+\\S, which match differently in bytes. Any other chunk, or any chunk \
+searched for fixed strings, is decoded as the file would be read, as \
+UTF-8. If every match contains some string, the bytes of the chunk are \
+scanned for it, and only the lines around it are split out and matched.
+
+    Parameters:
+        path (str): Path of the file.
+        start (int): Offset of the chunk.
+        end (int): Offset past the end of the chunk.
+        pattern (str): A regular expression, or fixed strings with -F.
+        options (GrepOptions): Flags of the call.
+
+    Returns:
+        (Tuple[int, int, List]): Number of lines in the chunk, number of \
+selected lines, up to max_count, and the selected lines, with their line \
+number in the chunk if -n is passed. Lines are only returned if printed.
+    """
+    chunk = read_chunk(path, start, end)
+    as_bytes = False
+    if (
+        not options.fixed_strings
+        and pattern.isascii()
+        and not SPACE_CLASS.search(pattern)
+        and chunk.isascii()
+        and b"\r" not in chunk
+    ):
+        try:
+            match = Grep.matcher(
+                pattern.encode(),
+                options.ignore_case,
+                from_file=options.pattern_file is not None,
+            )
+            as_bytes = True
+        except ArgumentError:
+            # Escapes such as \u are only understood in str patterns
+            pass
+    literal = Grep.prefilter(pattern, options)
+    candidates = None
+    if as_bytes:
+        if literal is not None and literal.text.isascii():
+            candidates = find_lines(chunk, literal)
+            line_count = chunk.count(b"\n") + (not chunk.endswith(b"\n"))
+        else:
+            lines = chunk.splitlines(keepends=True)
+            line_count = len(lines)
+    else:
+        match = Grep.matcher(
+            pattern,
+            options.ignore_case,
+            options.fixed_strings,
+            options.pattern_file is not None,
+        )
+        lines = io.TextIOWrapper(io.BytesIO(chunk), "utf-8").readlines()
+        line_count = len(lines)
+        if literal is not None:
+            candidates = candidate_lines(lines, literal)
+
+    numbered = options.line_number and not (
+        options.count or options.files_with_matches
+    )
+    if candidates is not None:
+        selected = []
+        for number, line in candidates:
+            if match(line) is None:
+                continue
+            selected.append((number, line) if numbered else line)
+            if len(selected) == options.max_count:
+                break
+    elif numbered:
+        selected = []
+        for number, line in enumerate(lines, 1):
+            if (match(line) is None) is not options.invert:
+                continue
+            selected.append((number, line))
+            if len(selected) == options.max_count:
+                break
+    else:
+        if options.invert:
+            selected = filterfalse(match, lines)
+        else:
+            selected = filter(match, lines)
+        selected = list(islice(selected, options.max_count))
+    count = len(selected)
+    if options.count or options.files_with_matches:
+        selected = []
+    elif as_bytes:
+        if options.line_number:
+            selected = [(n, line.decode()) for n, line in selected]
+        else:
+            selected = [line.decode() for line in selected]
+    return line_count, count, selected
+
+
+def search_batch(
+    cwd: str,
+    paths: List[Tuple[str, bool]],
+    pattern: str,
+    options: GrepOptions,
+    named: bool,
+) -> Tuple[List[str], Optional[Exception]]:
+    """
+    Searches a batch of files in turn, in a worker process.
+
+    Parameters:
+        cwd (str): Working directory of the shell, which relative paths \
+start from.
+        paths (List[Tuple[str, bool]]): Path of each file, and whether it \
+was found in a directory.
+        pattern (str): A regular expression, or fixed strings with -F.
+        options (GrepOptions): Flags of the call.
+        named (bool): Whether output is prefixed with file names.
+
+    Returns:
+        (Tuple[List[str], Optional[Exception]]): Output for the files, \
+and the error that stopped the batch, if any, raised by the caller once \
+the output before it is printed.
+    """
+    os.chdir(cwd)
+    match = Grep.matcher(
+        pattern,
+        options.ignore_case,
+        options.fixed_strings,
+        options.pattern_file is not None,
+    )
+    out = []
+    try:
+        for path, walked in paths:
+            out.extend(
+                Grep.search_path(
+                    path, pattern, match, options, named, walked, False
+                )
+            )
+    except Exception as error:
+        return out, error
+    return out, None
 
 
 class Grep(Application):
     """
     Matches a pattern in the files provided.
 
-    Usage: grep [PATTERN] [FILE]...
+    Usage: grep [-viclnrF] [-m <num>]? [-f <file>]? [PATTERN] [FILE]...
+        - [-v]: Selects the lines that do not match.
+        - [-i]: Ignores case when matching.
+        - [-c]: Prints the number of selected lines of each file.
+        - [-l]: Prints the name of each file with a selected line.
+        - [-n]: Prefixes each line with its line number.
+        - [-m <num>]: Stops reading a file after num selected lines.
+        - [-r]: Searches the files in directories and their subdirectories.
+        - [-F]: Matches fixed strings, one per line of PATTERN, anywhere \
+in a line, rather than a regular expression.
+        - [-f <file>]: Reads the patterns from file, one per line, \
+instead of PATTERN. A line matching any of them is selected.
         - PATTERN: A regular expression to be matched.
         - FILE(s): Name(s) of the file(s) to be searched. \
-If not specified, uses stdin.
+If not specified, uses stdin, or the current directory with -r.
     """
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Executes the grep command.
 
         Parameters:
             args (List[str]): Arguments to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin. If not specified, \
+uses sys.stdin.
 
         Exceptions:
             ArgumentError: If wrong number of arguments passed.
             FileError: If file does not exist.
+            FlagError: If an invalid flag is passed.
+        """
+        out.extend(self.stream(args, stdin))
+
+    def stream(
+        self, args: List[str], stdin: Iterable[str] = None
+    ) -> Iterator[str]:
         """
-        if len(args) < 1:
+        Executes the grep command lazily, one line at a time.
+
+        Parameters:
+            args (List[str]): Arguments to be passed.
+            stdin (Iterable[str]): Lines of stdin.
+
+        Returns:
+            (Iterator[str]): Matching lines.
+
+        Exceptions:
+            ArgumentError: If wrong number of arguments passed.
+            FileError: If file does not exist.
+            FlagError: If an invalid flag is passed.
+        """
+        options, args = self.parse_arguments(args)
+        pattern, options, files = self.pattern(options, args)
+        match = self.matcher(
+            pattern,
+            options.ignore_case,
+            options.fixed_strings,
+            options.pattern_file is not None,
+        )
+
+        if not files and options.recursive:
+            yield from self.search_files(pattern, [], options)
+
+        elif not files:
+            lines = self.stdin_lines(stdin)
+            literal = self.prefilter(pattern, options)
+            yield from self.search(lines, match, options, None, literal)
+
+        else:
+            yield from self.search_files(pattern, files, options)
+
+    @staticmethod
+    def parse_arguments(args: List[str]) -> Tuple[GrepOptions, List[str]]:
+        """
+        Separates the flags from the pattern and files. Flags come first \
+and may be combined, as in -vn; -- ends them.
+
+        Parameters:
+            args (List[str]): Arguments to be passed.
+
+        Returns:
+            (Tuple[GrepOptions, List[str]]): Flags, and the pattern \
+followed by the files.
+
+        Exceptions:
+            ArgumentError: If the number of matches is missing or invalid.
+            FlagError: If an invalid flag is passed.
+        """
+        options = {}
+        i = 0
+        while i < len(args) and args[i].startswith("-") and args[i] != "-":
+            arg = args[i]
+            i += 1
+            if arg == "--":
+                break
+            for j, flag in enumerate(arg[1:], 1):
+                if flag in FLAGS:
+                    options[FLAGS[flag]] = True
+                    continue
+                if flag not in "mf":
+                    raise FlagError(f"Invalid flag: {flag}")
+                # The value is the rest of the flag, or the next argument,
+                # so -m5 and -m 5 are the same
+                value = arg[j + 1:]
+                if not value:
+                    if i == len(args):
+                        raise ArgumentError(
+                            "Missing pattern file"
+                            if flag == "f"
+                            else "Missing number of matches"
+                        )
+                    value = args[i]
+                    i += 1
+                if flag == "f":
+                    options["pattern_file"] = value
+                else:
+                    try:
+                        options["max_count"] = max(int(value), 0)
+                    except ValueError:
+                        raise ArgumentError(
+                            f"Invalid number of matches - {value}"
+                        )
+                break
+        return GrepOptions(**options), args[i:]
+
+    @staticmethod
+    def pattern(
+        options: GrepOptions, args: List[str]
+    ) -> Tuple[str, GrepOptions, List[str]]:
+        """
+        Separates the pattern from the files, reading it from a file with \
+-f. The patterns of a file are kept one per line, and matched by one \
+matcher, which selects the lines any of them matches. A file without any \
+pattern selects no line.
+
+        Parameters:
+            options (GrepOptions): Flags of the call.
+            args (List[str]): Arguments after the flags.
+
+        Returns:
+            (Tuple[str, GrepOptions, List[str]]): Pattern, flags to match \
+it with, and names of the files to be searched.
+
+        Exceptions:
+            ArgumentError: If no pattern is passed.
+            FileError: If the pattern file does not exist.
+        """
+        if options.pattern_file is None:
+            if not args:
+                raise ArgumentError(
+                    """Wrong number of command line arguments \
+        [grep (-viclnrF)? (-m <num>)? (-f <file>)? <pattern> <file>?]"""
+                )
+            return args[0], options, args[1:]
+
+        try:
+            with open(options.pattern_file) as f:
+                patterns = f.read().splitlines()
+        except FileNotFoundError:
+            raise FileError(f"File does not exist - {options.pattern_file}")
+        if not patterns:
+            # Matches nothing
+            return "(?!)", options._replace(fixed_strings=False), args
+        return "\n".join(patterns), options, args
+
+    @staticmethod
+    def matcher(
+        pattern: AnyStr,
+        ignore_case: bool = False,
+        fixed: bool = False,
+        from_file: bool = False,
+    ) -> Callable:
+        """
+        Compiles the pattern once, through the cache shared by the process.
+
+        Many fixed strings are found by an Aho-Corasick automaton, which \
+reads each line once however many strings there are, unlike an \
+alternation tried one string at a time.
+
+        Parameters:
+            pattern (AnyStr): A regular expression, or fixed strings with \
+-F, as bytes to match bytes.
+            ignore_case (bool): Whether case is ignored when matching.
+            fixed (bool): Whether the pattern is fixed strings, one per \
+line, matched anywhere in a line.
+            from_file (bool): Whether the pattern is the regular \
+expressions of -f, one per line, any of which may match.
+
+        Returns:
+            (Callable): Match method of the compiled pattern, returning \
+None for a line that does not match.
+
+        Exceptions:
+            ArgumentError: If the pattern is invalid.
+        """
+        flags = re.IGNORECASE if ignore_case else 0
+        if fixed:
+            return fixed_cache.get(pattern, flags)
+        try:
+            if from_file:
+                return patterns_cache.get(pattern, flags)
+            return pattern_cache.get(pattern, flags).match
+        except re.error:
             raise ArgumentError(
-                """Wrong number of command line arguments \
-                [grep <pattern> <file>?]"""
+                f"""Invalid regular
+                        expression pattern {pattern}"""
             )
 
-        elif len(args) == 1:
-            pattern = args[0]
-            lines = self.stdin_check()
-            for line in lines:
-                if re.match(pattern, line):
-                    out.append(line)
+    @staticmethod
+    def prefilter(
+        pattern: str, options: GrepOptions
+    ) -> Optional[RequiredLiteral]:
+        """
+        Finds a string that every line matching the pattern contains, so \
+the other lines are rejected by a string search, without running the \
+pattern. There is none with -v, which selects the other lines, nor with \
+-F or -f, any of whose strings or patterns may match.
+
+        Parameters:
+            pattern (str): A regular expression, or fixed strings with -F.
+            options (GrepOptions): Flags of the call.
+
+        Returns:
+            (Optional[RequiredLiteral]): The string, or None if every line \
+is matched.
+        """
+        if options.invert or options.fixed_strings:
+            return None
+        if options.pattern_file is not None:
+            return None
+        flags = re.IGNORECASE if options.ignore_case else 0
+        return required_literal(pattern, flags)
+
+    @staticmethod
+    def search(
+        lines: Iterable[str],
+        match: Callable,
+        options: GrepOptions,
+        name: Optional[str] = None,
+        literal: Optional[RequiredLiteral] = None,
+    ) -> Iterator[str]:
+        """
+        Yields the output of grep for one input. Reading stops at the \
+first selected line with -l, and at max_count selected lines with -m, \
+also with -c.
+
+        Parameters:
+            lines (Iterable[str]): Lines of the input.
+            match (Callable): Match method of the compiled pattern.
+            options (GrepOptions): Flags of the call.
+            name (Optional[str]): Name prefixed to the output, or None \
+if there is only one input.
+            literal (Optional[RequiredLiteral]): String every match \
+contains, if any, so only the lines containing it are matched. Not with \
+-v.
+
+        Returns:
+            (Iterator[str]): Output for the input.
+        """
+        prefix = "" if name is None else f"{name}:"
+        numbered = enumerate(lines, 1)
+        if literal is not None:
+            numbered = candidate_lines(lines, literal)
+            lines = map(itemgetter(1), numbered)
 
+        if options.line_number and not (
+            options.count or options.files_with_matches
+        ):
+            matches = 0
+            if options.max_count != 0:
+                invert = options.invert
+                for number, line in numbered:
+                    if (match(line) is None) is not invert:
+                        continue
+                    yield f"{prefix}{number}:{line}"
+                    matches += 1
+                    if matches == options.max_count:
+                        break
+            return
+
+        # Otherwise lines are selected without running any Python code
+        # per line
+        if options.invert:
+            selected = filterfalse(match, lines)
+        else:
+            selected = filter(match, lines)
+        selected = islice(selected, options.max_count)
+        if options.files_with_matches:
+            if next(selected, None) is not None:
+                yield f"{STDIN_NAME if name is None else name}\n"
+        elif options.count:
+            yield f"{prefix}{sum(1 for _ in selected)}\n"
+        elif prefix:
+            yield from map(prefix.__add__, selected)
         else:
-            pattern = args[0]
-            files = args[1:]
-            for file in files:
-                try:
-                    with open(file) as f:
-                        lines = f.readlines()
-                        for line in lines:
-                            try:
-                                if re.match(pattern, line):
-                                    if len(files) > 1:
-                                        out.append(f"{file}:{line}")
-                                    else:
-                                        out.append(line)
-                            except re.error:
-                                raise ArgumentError(
-                                    f"""Invalid regular
-                                    expression pattern {pattern}"""
-                                )
-                except FileNotFoundError:
-                    raise FileError(f"File does not exist - {file}")
-            if len(out) > 0 and out[-1][-1] != "\n":
-                out[-1] += "\n"
+            yield from selected
+
+    def search_files(
+        self, pattern: str, files: List[str], options: GrepOptions
+    ) -> Iterator[str]:
+        """
+        Yields the output of grep for each file in turn, in the order of \
+the files, and with -r, of the files in each directory by name.
+
+        With more than one core, enough files are searched at once by \
+worker processes, in batches; otherwise each file is closed as soon as \
+grep is done with it, and a large file is searched in chunks.
+
+        Parameters:
+            pattern (str): A regular expression, or fixed strings with -F.
+            files (List[str]): Names of the files to be searched. With \
+-r, none searches the current directory.
+            options (GrepOptions): Flags of the call.
+
+        Returns:
+            (Iterator[str]): Output, prefixed with the file name if there \
+is more than one file.
+
+        Exceptions:
+            FileError: If file does not exist.
+        """
+        several = len(files) != 1 or (
+            options.recursive and os.path.isdir(files[0])
+        )
+        # Output is only prefixed with file names if there may be several,
+        # while -l prints the name even of a single file
+        named = several or options.files_with_matches
+        paths = self.file_paths(files, options.recursive)
+        workers = os.cpu_count() or 1
+        parallel = False
+        if workers > 1 and several:
+            parallel, paths = self.enough_work(paths)
+        if parallel:
+            cwd = os.getcwd()
+            calls = (
+                (cwd, batch, pattern, options, named)
+                for batch in read_batches(paths, FILES_PER_BATCH)
+            )
+            results = map_ordered(search_batch, calls, workers)
+            try:
+                for out, error in results:
+                    yield from out
+                    if error is not None:
+                        raise error
+            finally:
+                results.close()
+            return
+
+        match = self.matcher(
+            pattern,
+            options.ignore_case,
+            options.fixed_strings,
+            options.pattern_file is not None,
+        )
+        for path, walked in paths:
+            yield from self.search_path(
+                path, pattern, match, options, named, walked
+            )
+
+    @staticmethod
+    def enough_work(
+        paths: Iterator[Tuple[str, bool]]
+    ) -> Tuple[bool, Iterator[Tuple[str, bool]]]:
+        """
+        Tells whether files are worth searching in worker processes, \
+which is once they hold PARALLEL_MIN_SIZE bytes or are \
+PARALLEL_MIN_FILES files. Files are only listed until either is reached.
+
+        Parameters:
+            paths (Iterator[Tuple[str, bool]]): Path of each file, and \
+whether it was found in a directory.
+
+        Returns:
+            (Tuple[bool, Iterator[Tuple[str, bool]]]): Whether they are, \
+and the paths, including those already listed.
+        """
+        listed = []
+        size = 0
+        for item in paths:
+            listed.append(item)
+            try:
+                size += os.path.getsize(item[0])
+            except OSError:
+                # Reported when the file is searched
+                pass
+            if size >= PARALLEL_MIN_SIZE or len(listed) >= PARALLEL_MIN_FILES:
+                return True, chain(listed, paths)
+        return False, iter(listed)
+
+    @staticmethod
+    def file_paths(
+        files: List[str], recursive: bool
+    ) -> Iterator[Tuple[str, bool]]:
+        """
+        Lists the files to be searched.
+
+        Parameters:
+            files (List[str]): Names of the files to be searched.
+            recursive (bool): Whether the files in directories are searched.
+
+        Returns:
+            (Iterator[Tuple[str, bool]]): Path of each file, and whether it \
+was found in a directory.
+        """
+        if not files:
+            # Paths in the current directory are printed without ./
+            yield from ((path[2:], True) for path in walk_files("."))
+        for file in files:
+            if recursive and os.path.isdir(file):
+                yield from ((path, True) for path in walk_files(file))
+            else:
+                yield file, False
+
+    @staticmethod
+    def search_path(
+        path: str,
+        pattern: str,
+        match: Callable,
+        options: GrepOptions,
+        named: bool,
+        walked: bool = False,
+        chunked: bool = True,
+    ) -> Iterator[str]:
+        """
+        Yields the output of grep for one file.
+
+        Files found in directories by -r are skipped if they hold a NUL \
+character near the start, as they are most likely binary, and bytes \
+that are not UTF-8 are replaced rather than raising an error halfway.
+
+        Parameters:
+            path (str): Path of the file.
+            pattern (str): A regular expression, or fixed strings with -F.
+            match (Callable): Match method of the compiled pattern.
+            options (GrepOptions): Flags of the call.
+            named (bool): Whether output is prefixed with the file name.
+            walked (bool): Whether the file was found in a directory.
+            chunked (bool): Whether a large file may be searched in chunks.
+
+        Returns:
+            (Iterator[str]): Output for the file.
+
+        Exceptions:
+            FileError: If file does not exist.
+        """
+        try:
+            f = open(path, errors="replace" if walked else None)
+        except FileNotFoundError:
+            raise FileError(f"File does not exist - {path}")
+        with f:
+            if walked:
+                if "\0" in f.read(8192):
+                    return
+                f.seek(0)
+            name = path if named else None
+            if chunked and Grep.is_large(f):
+                lines = Grep.search_large(path, pattern, options, name)
+            else:
+                literal = Grep.prefilter(pattern, options)
+                lines = Grep.search(f, match, options, name, literal)
+            yield from Application.ensure_newline(lines)
+
+    @staticmethod
+    def is_large(f: io.TextIOWrapper) -> bool:
+        """
+        Tells whether a file is searched in chunks by worker processes. \
+This needs more than one core, and the file to be a large regular file, \
+read as UTF-8, which is split into chunks at newlines without splitting \
+any character. On one core, reading the lines in turn is faster.
+
+        Parameters:
+            f (TextIOWrapper): The open file.
+
+        Returns:
+            (bool): Whether the file is large.
+        """
+        try:
+            size = os.fstat(f.fileno()).st_size
+        except (OSError, io.UnsupportedOperation):
+            return False
+        if size < LARGE_FILE_SIZE or not os.path.isfile(f.name):
+            return False
+        if (os.cpu_count() or 1) < 2:
+            return False
+        encoding = f.encoding or locale.getpreferredencoding(False)
+        return codecs.lookup(encoding).name == "utf-8"
+
+    @staticmethod
+    def search_large(
+        path: str,
+        pattern: str,
+        options: GrepOptions,
+        name: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        Yields the output of grep for a large file.
+
+        The file is memory-mapped and split into chunks of whole lines, \
+which are searched by a worker process per core, so the file is never \
+read into memory as a whole. Results are combined in the order of the \
+chunks, and once -l or -m has all it needs, the remaining chunks are \
+not searched.
+
+        Parameters:
+            path (str): Path of the file.
+            pattern (str): A regular expression, or fixed strings with -F.
+            options (GrepOptions): Flags of the call.
+            name (Optional[str]): Name prefixed to the output, or None \
+if there is only one input.
+
+        Returns:
+            (Iterator[str]): Output for the file.
+        """
+        prefix = "" if name is None else f"{name}:"
+        workers = os.cpu_count() or 1
+        # Workers may have been started in another directory
+        calls = (
+            (os.path.abspath(path), start, end, pattern, options)
+            for start, end in chunk_bounds(path, CHUNK_SIZE)
+        )
+        # With a single core, chunks are searched in this process
+        results = map_ordered(
+            search_chunk, calls, workers if workers > 1 else 0
+        )
+        lines, matches = 0, 0
+        try:
+            for chunk_lines, count, selected in results:
+                if options.max_count is not None:
+                    count = min(count, options.max_count - matches)
+                    selected = selected[:count]
+                matches += count
+                if options.line_number:
+                    for number, line in selected:
+                        yield f"{prefix}{lines + number}:{line}"
+                else:
+                    yield from map(prefix.__add__, selected)
+                lines += chunk_lines
+                if matches == options.max_count or (
+                    matches and options.files_with_matches
+                ):
+                    break
+        finally:
+            results.close()
+        if options.files_with_matches:
+            if matches:
+                yield f"{STDIN_NAME if name is None else name}\n"
+        elif options.count:
+            yield f"{prefix}{matches}\n"
+
+    def file_arguments(
+        self, args: List[str], path: str
+    ) -> Optional[List[str]]:
+        """
+        Searches the file instead of stdin, if the pattern is valid, \
+unless -l is passed, which names stdin differently from a file, or -r, \
+which does not read stdin.
+
+        Parameters:
+            args (List[str]): Arguments to be passed, reading stdin.
+            path (str): Path of the file to be read.
+
+        Returns:
+            (Optional[List[str]]): Arguments searching the file, or None \
+if stdin is not read.
+        """
+        try:
+            options, rest = self.parse_arguments(args)
+            if len(rest) != 1 or options.files_with_matches:
+                return None
+            if options.recursive:
+                return None
+            self.matcher(rest[0], options.ignore_case, options.fixed_strings)
+        except (ArgumentError, FlagError):
+            return None
+        return args + [path]
+
+    def combiner(
+        self, args: List[str]
+    ) -> Optional[Callable[[Iterable[List[str]]], Iterator[str]]]:
+        """
+        Lines of stdin are matched one at a time, so batches are \
+independent, unless the selected lines are limited, counted, numbered \
+or only named.
+
+        Parameters:
+            args (List[str]): Arguments to be passed.
+
+        Returns:
+            (Optional[Callable]): Function joining the outputs for the \
+batches, or None if stdin is not read.
+        """
+        try:
+            options, args = self.parse_arguments(args)
+        except (ArgumentError, FlagError):
+            return None
+        line_filter = options._replace(
+            invert=False, ignore_case=False, fixed_strings=False
+        )
+        if len(args) == 1 and line_filter == GrepOptions():
+            return chain.from_iterable
+        return None
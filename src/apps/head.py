@@ -1,5 +1,6 @@
 from error import ArgumentError, FileError, FlagError
-from typing import List
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
 from application import Application
 
 
@@ -13,13 +14,37 @@ If not specified, returns the first 10 lines.
         - FILE: The name of the file. If not specified, uses stdin.
     """
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Executes the head command.
 
         Parameters:
             args (List[str]): Arguments to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin. If not specified, \
+uses sys.stdin.
+
+        Exceptions:
+            ArgumentError: If wrong number of arguments passed.
+            FlagError: If wrong flags passed.
+            FileError: If file does not exist.
+        """
+        out.extend(self.stream(args, stdin))
+
+    def stream(
+        self, args: List[str], stdin: Iterable[str] = None
+    ) -> Iterator[str]:
+        """
+        Executes the head command lazily, reading no more lines than needed.
+
+        Parameters:
+            args (List[str]): Arguments to be passed.
+            stdin (Iterable[str]): Lines of stdin.
+
+        Returns:
+            (Iterator[str]): First lines of the input.
 
         Exceptions:
             ArgumentError: If wrong number of arguments passed.
@@ -55,12 +80,28 @@ If not specified, returns the first 10 lines.
 
         if file:
             try:
-                with open(file) as f:
-                    lines = f.readlines()
+                f = open(file)
             except FileNotFoundError:
                 raise FileError(f"File does not exist - {file}")
+            with f:
+                yield from islice(f, max(num_lines, 0))
         else:
-            lines = self.stdin_check()
+            yield from islice(self.stdin_lines(stdin), max(num_lines, 0))
+
+    def file_arguments(
+        self, args: List[str], path: str
+    ) -> Optional[List[str]]:
+        """
+        Reads the file instead of stdin.
+
+        Parameters:
+            args (List[str]): Arguments to be passed, reading stdin.
+            path (str): Path of the file to be read.
 
-        for i in range(0, min(len(lines), num_lines)):
-            out.append(lines[i])
+        Returns:
+            (Optional[List[str]]): Arguments reading the file, or None if \
+stdin is not read.
+        """
+        if len(args) == 0 or (len(args) == 2 and args[0] == "-n"):
+            return args + [path]
+        return None
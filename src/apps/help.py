@@ -7,13 +7,14 @@ class Help(Application):
     Prints the help message.
     """
 
-    def execute(self, args=None, out=None) -> None:
+    def execute(self, args=None, out=None, stdin=None) -> None:
         """
         Executes the help command.
 
         Parameters:
             args (List[str]): Arguments to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin, not read.
 
         Exceptions:
             ArgumentError: If wrong number of arguments passed.
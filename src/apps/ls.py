@@ -1,7 +1,7 @@
 import os
 from error import ArgumentError, DirectoryError
 from os import listdir
-from typing import List
+from typing import Iterable, List
 from application import Application
 
 
@@ -14,13 +14,16 @@ class Ls(Application):
 uses the current directory.
     """
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Executes the ls command.
 
         Parameters:
             args (List[str]): Arguments to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin, not read.
 
         Exceptions:
             ArgumentError: If wrong number of arguments passed.
@@ -1,6 +1,6 @@
 import os
 from error import ArgumentError, FileError
-from typing import List
+from typing import Iterable, List
 from application import Application
 
 
@@ -44,13 +44,16 @@ class Mv(Application):
             dest_file = destination
         os.rename(source, dest_file)
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Executes the mv command.
 
         Parameters:
             args (List[str]): Arguments to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin, not read.
 
         Exceptions:
             ArgumentError: If wrong number of arguments passed.
@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import Iterable, List
 from application import Application
 
 
@@ -10,12 +10,15 @@ class Pwd(Application):
     Usage: pwd
     """
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Executes the pwd command.
 
         Parameters:
             args (List[str]): Arguments to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin, not read.
         """
         out.append(os.getcwd() + "\n")
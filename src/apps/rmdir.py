@@ -1,6 +1,6 @@
 import os
 from error import ArgumentError, FlagError, DirectoryError
-from typing import List
+from typing import Iterable, List
 from application import Application
 
 
@@ -41,13 +41,16 @@ class Rmdir(Application):
                 dir_path = os.path.join(root, dir_name)
                 os.rmdir(dir_path)
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Executes the rmdir command.
 
         Parameters:
             args (List[str]): Arguments to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin, not read.
 
         Exceptions:
             ArgumentError: If wrong number of arguments passed.
@@ -1,7 +1,10 @@
 import os
 import re
+from itertools import chain
 from error import ArgumentError, FileError
-from typing import List
+from literal_filter import required_literal
+from pattern_cache import pattern_cache
+from typing import Callable, Iterable, Iterator, List, Optional
 from application import Application
 
 
@@ -18,67 +21,146 @@ class Sed(Application):
         - FILE: File to be modified.
     """
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    @staticmethod
+    def split_argument(arg: str) -> List[str]:
+        """
+        Splits an s/pattern/replacement_string/flags argument.
+
+        Parameters:
+            arg (str): Argument to be split.
+
+        Returns:
+            (List[str]): Process, pattern, replacement string and flags.
+
+        Exceptions:
+            ArgumentError: If the argument is invalid.
+        """
+        try:
+            process, pattern, replacement_string, flags = re.split(
+                r"[/|]", arg
+            )
+        except Exception:
+            raise ArgumentError(
+                f"""Invalid regular expression pattern {arg}"""
+            )
+        return [process, pattern, replacement_string, flags]
+
+    @staticmethod
+    def substitute(
+        lines: Iterable[str], pattern: str, replacement_string: str, flags: str
+    ) -> Iterator[str]:
+        """
+        Yields the lines with the pattern replaced.
+
+        The pattern is compiled once. If every match contains some \
+string, lines without it are yielded as they are, without running the \
+pattern on them.
+
+        Parameters:
+            lines (Iterable[str]): Lines to be modified.
+            pattern (str): Regular expression pattern to be matched.
+            replacement_string (str): String to be replaced with.
+            flags (str): Substitution flags.
+
+        Returns:
+            (Iterator[str]): Modified lines.
+
+        Exceptions:
+            ArgumentError: If the pattern is invalid.
+        """
+        count = 0 if "g" in flags else 1
+        try:
+            sub = pattern_cache.get(pattern).sub
+        except re.error:
+            raise ArgumentError(
+                f"""Invalid regular expression pattern {pattern}"""
+            )
+        literal = required_literal(pattern)
+        if literal is None or literal.ignore_case:
+            for line in lines:
+                yield sub(replacement_string, line, count=count)
+            return
+        text = literal.text
+        for line in lines:
+            if text in line:
+                yield sub(replacement_string, line, count=count)
+            else:
+                yield line
+
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Executes the sed command.
 
         Parameters:
             args (List[str]): Arguments to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin. If not specified, \
+uses sys.stdin.
 
         Exceptions:
             ArgumentError: If invalid (regex) or wrong \
 number of arguments passed.
         """
+        out.extend(self.stream(args, stdin))
+
+    def stream(
+        self, args: List[str], stdin: Iterable[str] = None
+    ) -> Iterator[str]:
+        """
+        Executes the sed command. Lines from stdin are substituted one at \
+a time; a file is rewritten as a whole.
+
+        Parameters:
+            args (List[str]): Arguments to be passed.
+            stdin (Iterable[str]): Lines of stdin.
+
+        Returns:
+            (Iterator[str]): Modified lines.
+
+        Exceptions:
+            ArgumentError: If invalid (regex) or wrong \
+number of arguments passed.
+            FileError: If the file does not exist.
+        """
         if len(args) > 2 or len(args) == 0:
             raise ArgumentError("Wrong number of command line arguments")
         if len(args) == 1:
             # read from stdin
-            try:
-                process, pattern, replacement_string, flags = re.split(
-                    r"[/|]", args[0]
-                )
-            except Exception:
-                raise ArgumentError(
-                    f"""Invalid regular expression pattern {args[0]}"""
-                )
-            lines = self.stdin_check()
-            for line in lines:
-                # handle regex substitution here
-                if "g" in flags:
-                    modified_line = re.sub(pattern, replacement_string, line)
-                else:
-                    modified_line = re.sub(
-                        pattern, replacement_string, line, count=1
-                    )
-                out.append(modified_line)
-            if out[-1][-1] != "\n":
-                out[-1] += "\n"
+            _, pattern, replacement_string, flags = self.split_argument(
+                args[0]
+            )
+            lines = self.stdin_lines(stdin)
+            yield from self.ensure_newline(
+                self.substitute(lines, pattern, replacement_string, flags)
+            )
         else:
             arg2, file_path = args
-            try:
-                process, pattern, replacement_string, flags = re.split(
-                    r"[/|]", arg2
-                )
-            except Exception:
-                raise ArgumentError(
-                    f"""Invalid regular expression pattern {arg2}"""
-                )
+            _, pattern, replacement_string, flags = self.split_argument(arg2)
             if not os.path.exists(file_path):
                 raise FileError(f"File '{file_path}' does not exist")
             with open(file_path, "r") as f:
                 lines = f.readlines()
+            modified_lines = list(
+                self.substitute(lines, pattern, replacement_string, flags)
+            )
             with open(file_path, "w") as f:
-                for line in lines:
-                    if "g" in flags:
-                        modified_line = re.sub(
-                            pattern, replacement_string, line
-                        )
-                    else:
-                        modified_line = re.sub(
-                            pattern, replacement_string, line, count=1
-                        )
-                    f.write(modified_line)
-                    out.append(modified_line)
-                if out[-1][-1] != "\n":
-                    out[-1] += "\n"
+                f.writelines(modified_lines)
+            yield from self.ensure_newline(modified_lines)
+
+    def combiner(
+        self, args: List[str]
+    ) -> Optional[Callable[[Iterable[List[str]]], Iterator[str]]]:
+        """
+        Lines of stdin are substituted one at a time, so batches are \
+independent.
+
+        Parameters:
+            args (List[str]): Arguments to be passed.
+
+        Returns:
+            (Optional[Callable]): Function joining the outputs for the \
+batches, or None if stdin is not read.
+        """
+        return chain.from_iterable if len(args) == 1 else None
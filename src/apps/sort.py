@@ -1,5 +1,6 @@
+import heapq
 from error import ArgumentError, FileError, FlagError
-from typing import List
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 from application import Application
 
 
@@ -12,19 +13,42 @@ class Sort(Application):
         - FILE: The name of the file. If not specified, uses stdin.
     """
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Executes the sort command.
 
         Parameters:
             args (List[str]): Arguments to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin. If not specified, \
+uses sys.stdin.
 
         Exceptions:
             ArgumentError: If wrong number of arguments passed.
             FlagError: If wrong flags passed.
             FileError: If file does not exist.
         """
+        reverse, filename = self.parse_arguments(args)
+        out.extend(sorted(self.input_lines(filename, stdin), reverse=reverse))
+
+    @staticmethod
+    def parse_arguments(args: List[str]) -> Tuple[bool, Optional[str]]:
+        """
+        Reads the arguments of the sort command.
+
+        Parameters:
+            args (List[str]): Arguments to be passed.
+
+        Returns:
+            (Tuple[bool, Optional[str]]): Whether the order is reversed, \
+and the name of the file, or None to use stdin.
+
+        Exceptions:
+            ArgumentError: If wrong number of arguments passed.
+            FlagError: If wrong flags passed.
+        """
         reverse = False
         filename = None
 
@@ -43,22 +67,66 @@ class Sort(Application):
                 filename = args[1]
             else:
                 raise FlagError("Wrong flags [sort -r? <file>?]")
-        else:
-            pass
+        return reverse, filename
+
+    def input_lines(
+        self, filename: Optional[str], stdin: Iterable[str] = None
+    ) -> Iterator[str]:
+        """
+        Yields the lines to be sorted, newline terminated.
+
+        Parameters:
+            filename (Optional[str]): Name of the file, or None to use stdin.
+            stdin (Iterable[str]): Lines of stdin.
 
+        Returns:
+            (Iterator[str]): Lines of the file or of stdin.
+
+        Exceptions:
+            ArgumentError: If no standard input detected.
+            FileError: If file does not exist.
+        """
         if filename:
             try:
-                with open(filename, "r") as file:
-                    lines = file.readlines()
-                    if len(lines) > 0 and lines[-1][-1] != "\n":
-                        lines[-1] += "\n"
+                file = open(filename, "r")
             except FileNotFoundError:
                 raise FileError(f"File does not exist - {filename}")
-
+            with file:
+                yield from self.ensure_newline(file)
         else:
             # If no filename, read from stdin
-            lines = self.stdin_check()
+            yield from self.stdin_lines(stdin)
+
+    def file_arguments(
+        self, args: List[str], path: str
+    ) -> Optional[List[str]]:
+        """
+        Sorts the file instead of stdin.
+
+        Parameters:
+            args (List[str]): Arguments to be passed, reading stdin.
+            path (str): Path of the file to be read.
+
+        Returns:
+            (Optional[List[str]]): Arguments sorting the file, or None if \
+stdin is not read.
+        """
+        return args + [path] if args in ([], ["-r"]) else None
+
+    def combiner(
+        self, args: List[str]
+    ) -> Optional[Callable[[Iterable[List[str]]], Iterator[str]]]:
+        """
+        Batches of stdin can be sorted separately and then merged.
 
-        sorted_lines = sorted(lines, reverse=reverse)
+        Parameters:
+            args (List[str]): Arguments to be passed.
 
-        out.extend(sorted_lines)
+        Returns:
+            (Optional[Callable]): Function joining the outputs for the \
+batches, or None if stdin is not read.
+        """
+        if args == [] or args == ["-r"]:
+            reverse = bool(args)
+            return lambda runs: heapq.merge(*runs, reverse=reverse)
+        return None
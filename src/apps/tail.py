@@ -1,5 +1,5 @@
 from error import ArgumentError, FileError, FlagError
-from typing import List
+from typing import Iterable, List
 from application import Application
 
 
@@ -13,13 +13,17 @@ If not specified, returns the last 10 lines.
         - FILE: The name of the file. If not specified, uses stdin.
     """
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Executes the tail command.
 
         Parameters:
             args (List[str]): Arguments to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin. If not specified, \
+uses sys.stdin.
 
         Exceptions:
             ArgumentError: If wrong number of arguments passed.
@@ -61,7 +65,7 @@ If not specified, returns the last 10 lines.
             except FileNotFoundError:
                 raise FileError(f"File does not exist - {file}")
         else:
-            lines = self.stdin_check()
+            lines = self.stdin_check(stdin)
 
         display_length = min(len(lines), num_lines)
         for i in range(0, display_length):
@@ -1,6 +1,6 @@
 import os
 from error import ArgumentError, FileError
-from typing import List
+from typing import Iterable, List
 from application import Application
 
 
@@ -12,13 +12,16 @@ class Touch(Application):
         - FILE: The name of the file to create.
     """
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Executes the touch command.
 
         Parameters:
             args (List[str]): Arguments to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin, not read.
 
         Exceptions:
             ArgumentError: If wrong number of arguments passed.
@@ -1,5 +1,5 @@
 from error import ArgumentError, FileError, FlagError
-from typing import List
+from typing import Iterable, Iterator, List, Optional
 from application import Application
 
 
@@ -13,29 +13,34 @@ class Uniq(Application):
     """
 
     @staticmethod
-    def return_uniq(lines: List[str], ignore_case: bool) -> List[str]:
+    def return_uniq(
+        lines: Iterable[str], ignore_case: bool
+    ) -> Iterator[str]:
         """
-        Returns a list with non-match adjacent lines.
+        Yields the lines that do not match the line before them.
 
         Parameters:
-            lines (List[str]): Lines to be checked.
+            lines (Iterable[str]): Lines to be checked.
             ignore_case (List[str]): Flag for whether case is ignored.
 
         Returns:
-            (List[str]): Returns list with non-unique adjacent lines removed.
+            (Iterator[str]): Returns lines with non-unique adjacent lines \
+removed.
         """
-        return_text = [lines[0].strip("\n")]
-        for i in range(1, len(lines)):
-            lines[i] = lines[i].strip("\n")
-            if ignore_case:
-                if lines[i].lower() != return_text[-1].lower():
-                    return_text.append(lines[i])
+        previous = None
+        for line in lines:
+            line = line.strip("\n")
+            if previous is None:
+                unique = True
+            elif ignore_case:
+                unique = line.lower() != previous.lower()
             else:
-                if lines[i] != return_text[-1]:
-                    return_text.append(lines[i])
-        return [s + "\n" for s in return_text]
+                unique = line != previous
+            if unique:
+                previous = line
+                yield line + "\n"
 
-    def unique_file(self, file_name: str, ignore_case: bool) -> List[str]:
+    def unique_file(self, file_name: str, ignore_case: bool) -> Iterator[str]:
         """
         File handling for uniq.
 
@@ -44,38 +49,67 @@ class Uniq(Application):
             ignore_case (bool): Flag for whether case is ignored.
 
         Returns:
-            (List[str]): Returns list with matching adjacent lines removed.
+            (Iterator[str]): Returns lines with matching adjacent lines \
+removed.
 
         Exceptions:
             FileError: If file does not exist.
         """
         try:
-            with open(file_name, "r") as file:
-                lines = file.readlines()
+            file = open(file_name, "r")
         except FileNotFoundError:
             raise FileError(f"File does not exist - {file_name}")
-        return self.return_uniq(lines, ignore_case)
+        with file:
+            yield from self.return_uniq(file, ignore_case)
 
-    def unique_stdin(self, ignore_case: bool) -> List[str]:
+    def unique_stdin(
+        self, ignore_case: bool, stdin: Iterable[str] = None
+    ) -> Iterator[str]:
         """
         Stdin handling for uniq.
 
         Parameters:
             ignore_case (bool): Flag for whether case is ignored.
+            stdin (Iterable[str]): Lines of stdin.
 
         Returns:
-            (List[str]): Returns list with matching adjacent lines removed.
+            (Iterator[str]): Returns lines with matching adjacent lines \
+removed.
         """
-        lines = self.stdin_check()
+        lines = self.stdin_lines(stdin)
         return self.return_uniq(lines, ignore_case)
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Executes the uniq command.
 
         Parameters:
             args (List[str]): Arguments to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin. If not specified, \
+uses sys.stdin.
+
+        Exceptions:
+            ArgumentError: If wrong number of arguments passed.
+            FlagError: If wrong flags passed.
+            FileError: If file does not exist.
+        """
+        out.extend(self.stream(args, stdin))
+
+    def stream(
+        self, args: List[str], stdin: Iterable[str] = None
+    ) -> Iterator[str]:
+        """
+        Executes the uniq command lazily, one line at a time.
+
+        Parameters:
+            args (List[str]): Arguments to be passed.
+            stdin (Iterable[str]): Lines of stdin.
+
+        Returns:
+            (Iterator[str]): Output lines.
 
         Exceptions:
             ArgumentError: If wrong number of arguments passed.
@@ -83,18 +117,34 @@ class Uniq(Application):
             FileError: If file does not exist.
         """
         if len(args) == 0:
-            out.extend(self.unique_stdin(False))
+            yield from self.unique_stdin(False, stdin)
         elif len(args) == 1:
             if args[0] == "-i":
-                out.extend(self.unique_stdin(True))
+                yield from self.unique_stdin(True, stdin)
             else:
-                out.extend(self.unique_file(args[0], False))
+                yield from self.unique_file(args[0], False)
         elif len(args) == 2:
             if args[0] == "-i":
-                out.extend(self.unique_file(args[1], True))
+                yield from self.unique_file(args[1], True)
             else:
                 raise FlagError("Wrong flags [uniq -i <file>?]")
         else:
             raise ArgumentError(
                 "Wrong number of command line arguments [uniq -i <file>?]"
             )
+
+    def file_arguments(
+        self, args: List[str], path: str
+    ) -> Optional[List[str]]:
+        """
+        Reads the file instead of stdin.
+
+        Parameters:
+            args (List[str]): Arguments to be passed, reading stdin.
+            path (str): Path of the file to be read.
+
+        Returns:
+            (Optional[List[str]]): Arguments reading the file, or None if \
+stdin is not read.
+        """
+        return args + [path] if args in ([], ["-i"]) else None
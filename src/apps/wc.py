@@ -1,5 +1,5 @@
 import os
-from typing import List, Tuple
+from typing import Iterable, List, Tuple
 from application import Application
 from error import FileError, FlagError
 
@@ -86,20 +86,24 @@ returns all three counts.
             else:
                 raise FlagError(f"Invalid flag: {flag}")
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Executes the wc command.
 
         Parameters:
             args (List[str]): Arguments to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin. If not specified, \
+uses sys.stdin.
 
         Exceptions:
             FlagError: If wrong flags passed.
         """
         flags, file_paths = self.parse_arguments(args)
         if not file_paths:
-            lines = self.stdin_check()
+            lines = self.stdin_check(stdin)
             num_lines, num_words, num_chars = self.count(lines)
             self.handle_flags(flags, num_lines, num_words, num_chars, out)
         else:
@@ -0,0 +1,207 @@
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from contextlib import redirect_stdout
+from process_stage import get_pool, read_batches
+from typing import TYPE_CHECKING, Deque, Iterable, Iterator, List, NamedTuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from concurrent.futures import Future
+
+
+class Result(NamedTuple):
+    """
+    Outcome of one command line of a batch.
+
+    Attributes:
+        command (str): Command line.
+        status (int): 0 on success, 1 if an error occurred, or the code \
+given to exit.
+        stdout (str): Output of the command line, up to the error if any.
+        stderr (str): Error message, or "" on success.
+        seconds (float): Time taken to run the command line.
+    """
+
+    command: str
+    status: int
+    stdout: str
+    stderr: str
+    seconds: float
+
+
+def read_commands(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Yields the command lines of a batch, one per line, skipping blank \
+lines.
+
+    Parameters:
+        lines (Iterable[str]): Lines of the batch file.
+
+    Returns:
+        Iterator[str]: Command lines, without their newlines.
+    """
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line.strip():
+            yield line
+
+
+def run_command(
+    cmdline: str,
+    cwd: str,
+    threaded: bool = False,
+    processes: int = 0,
+    optimized: bool = True,
+) -> Result:
+    """
+    Runs one command line of a batch, capturing its output and errors.
+
+    The command line starts in cwd, and the directory is restored once \
+it is done, so commands do not depend on each other whether they run in \
+turn or on worker processes. Its stdin is empty, as the batch itself may \
+be read from stdin, and text an application prints, such as the message \
+of exit, is captured in order with the output.
+
+    Parameters:
+        cmdline (str): Command line.
+        cwd (str): Directory the command line starts in.
+        threaded (bool): Whether to run each call of a pipeline in its \
+own thread.
+        processes (int): Number of worker processes for CPU-bound calls.
+        optimized (bool): Whether pipelines are rewritten by the optimizer.
+
+    Returns:
+        Result: Status, output and error message of the command line.
+    """
+    from shell import stream
+
+    out = io.StringIO()
+    status, error = 0, ""
+    stdin = sys.stdin
+    start = time.perf_counter()
+    try:
+        os.chdir(cwd)
+        sys.stdin = io.StringIO()
+        with redirect_stdout(out):
+            out.writelines(stream(cmdline, threaded, processes, optimized))
+    except SystemExit as e:
+        status = e.code if isinstance(e.code, int) else int(e.code is not None)
+    except Exception as e:
+        status = 1
+        error = f"[{e.__class__.__name__}] {e}\n"
+    finally:
+        sys.stdin = stdin
+        os.chdir(cwd)
+    seconds = time.perf_counter() - start
+    return Result(cmdline, status, out.getvalue(), error, seconds)
+
+
+def run_commands(
+    cmdlines: List[str], cwd: str, options: dict
+) -> List[Result]:
+    """
+    Runs a chunk of command lines in turn, in a worker process.
+
+    Parameters:
+        cmdlines (List[str]): Command lines.
+        cwd (str): Directory every command line starts in.
+        options (dict): Keyword arguments for run_command.
+
+    Returns:
+        List[Result]: Outcome of each command line, in order.
+    """
+    return [run_command(cmdline, cwd, **options) for cmdline in cmdlines]
+
+
+def stream_batch(
+    commands: Iterable[str],
+    workers: int = 0,
+    chunk_size: int = 32,
+    **options,
+) -> Iterator[Result]:
+    """
+    Runs the command lines of a batch, yielding their outcomes in order.
+
+    Without workers, the command lines run in this process one at a \
+time, sharing the parse cache and loaded applications. With workers, \
+chunks of command lines are sent to that many worker processes, with at \
+most two chunks per worker in flight at a time.
+
+    Parameters:
+        commands (Iterable[str]): Command lines.
+        workers (int): Number of worker processes, 0 to use none.
+        chunk_size (int): Number of command lines sent to a worker at once.
+        options: Keyword arguments for run_command.
+
+    Returns:
+        Iterator[Result]: Outcome of each command line.
+    """
+    cwd = os.getcwd()
+    if not workers:
+        for cmdline in commands:
+            yield run_command(cmdline, cwd, **options)
+        return
+
+    pool = get_pool(workers)
+    pending: Deque["Future"] = deque()
+    try:
+        for chunk in read_batches(commands, chunk_size):
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+            pending.append(pool.submit(run_commands, chunk, cwd, options))
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def frame(index: int, result: Result) -> str:
+    """
+    Formats the outcome of a command line as one line of JSON.
+
+    Parameters:
+        index (int): Position of the command line in the batch, from 0.
+        result (Result): Outcome of the command line.
+
+    Returns:
+        str: JSON object, ending with a newline.
+    """
+    record = {"index": index, **result._asdict()}
+    record["seconds"] = round(result.seconds, 6)
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def run_batch(
+    lines: Iterable[str], workers: int = 0, **options
+) -> Iterator[str]:
+    """
+    Runs a batch, yielding a frame per command line and then a summary.
+
+    Parameters:
+        lines (Iterable[str]): Lines of the batch file.
+        workers (int): Number of worker processes, 0 to use none.
+        options: Keyword arguments for run_command.
+
+    Returns:
+        Iterator[str]: JSON frames, in the order of the command lines, \
+followed by a frame holding the number of command lines, the number that \
+failed, the total time and the throughput.
+    """
+    start = time.perf_counter()
+    count = failed = 0
+    results = stream_batch(read_commands(lines), workers, **options)
+    for count, result in enumerate(results, 1):
+        failed += result.status != 0
+        yield frame(count - 1, result)
+    seconds = time.perf_counter() - start
+    summary = {
+        "commands": count,
+        "failed": failed,
+        "seconds": round(seconds, 6),
+        "commands_per_second": round(count / seconds, 1) if seconds else 0,
+    }
+    yield json.dumps({"summary": summary}) + "\n"
@@ -1,7 +1,7 @@
-from application_factory import ApplicationFactory
-import sys
-from error import RedirectError, ApplicationError
-from typing import List, IO
+from application_registry import registry
+from error import RedirectError
+from sink import open_sink
+from typing import IO, Iterable, List
 
 
 class Call:
@@ -9,7 +9,8 @@ class Call:
     Class to handle the execution of applications.
 
     Methods:
-        eval (List[str], List[str]): Evaluates the given commands.
+        eval (List[str], List[str], Iterable[str]): Evaluates the given \
+commands.
         redirect (str, List[str], List[str], List[str], IO): \
 Performs input/output redirection.
     """
@@ -24,22 +25,23 @@ Performs input/output redirection.
     ) -> None:
         self.redirect(app, inputIO, outputIO, output, pipe)
 
-    def eval(self, commands: List[str], out: List[str]) -> None:
+    def eval(
+        self, commands: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Evaluate the given commands and execute the corresponding application.
 
         Parameters:
             commands (List[str]): List of commands.
-            out (List[str]): List to which the output will be appended.
-        """
-        application_factory = ApplicationFactory()
-        app = commands[0]
-        args = commands[1:]
+            out (List[str]): List or sink to which the output will be \
+appended.
+            stdin (Iterable[str]): Lines of stdin. If not specified, \
+the application reads sys.stdin.
 
-        if app in application_factory.application_map:
-            application_factory.application_map[app].execute(args, out)
-        else:
-            raise ApplicationError(f"Unsupported application {app}")
+        Exceptions:
+            ApplicationError: If the application is not supported.
+        """
+        registry.resolve(commands[0]).execute(commands[1:], out, stdin)
 
     def redirect(
         self,
@@ -57,7 +59,7 @@ Performs input/output redirection.
             inputIO (List[str]): List of input file paths.
             outputIO (List[str]): List of output file paths.
             output (List[str]): List containing the final output.
-            pipe (StringIO): Pipe object for input redirection.
+            pipe (Pipe): Output of the previous call in a pipeline.
 
         Exceptions:
             RedirectError: If there are invalid redirections.
@@ -65,32 +67,32 @@ Performs input/output redirection.
         if len(inputIO) > 1 or len(outputIO) > 1:
             raise RedirectError("Too many redirections")
 
-        saved_stdin, saved_stdout = sys.stdin, sys.stdout
-        input_stream, output_file = None, None
+        input_stream = None
 
         if inputIO and pipe:
             raise RedirectError(
                 "Cannot redirect input and pipe at the same time"
             )
-        elif pipe:
-            sys.stdin = pipe
         elif inputIO:
             try:
                 input_stream = open(inputIO.pop(), "r")
             except FileNotFoundError:
                 raise RedirectError("Input file not found")
-            sys.stdin = input_stream
-
-        self.eval(app, output[-1])
-
-        if outputIO:
-            output_name, setting = outputIO.pop()
-            output_file = open(output_name, setting)
-            output_file.write("".join(output.pop()))
-
-        if input_stream:
-            input_stream.close()
-        if output_file:
-            output_file.close()
 
-        sys.stdin, sys.stdout = saved_stdin, saved_stdout
+        try:
+            # stdin is passed to the application rather than swapped in
+            # sys.stdin, so calls can run concurrently
+            if outputIO:
+                # The target is opened first and written to as the
+                # application runs, so the output is never held in memory
+                sink = open_sink(*outputIO.pop())
+                try:
+                    self.eval(app, sink, pipe or input_stream)
+                finally:
+                    sink.close()
+                output.pop()
+            else:
+                self.eval(app, output[-1], pipe or input_stream)
+        finally:
+            if input_stream:
+                input_stream.close()
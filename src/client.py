@@ -0,0 +1,148 @@
+# Kept to what the client needs, since its startup is what it exists to
+# save: annotations are not evaluated, so typing is not imported.
+from __future__ import annotations
+
+import array
+import os
+import socket
+import sys
+
+
+def default_socket_path() -> str:
+    """
+    Returns the socket the shell daemon listens on unless told otherwise.
+
+    Returns:
+        str: Path in the user's runtime directory, or in the temporary \
+directory if there is none.
+    """
+    directory = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"
+    return os.path.join(directory, f"comp0010shell-{os.getuid()}.sock")
+
+
+def peer_uid(sock: socket.socket, path: str) -> int:
+    """
+    Returns the user running the process at the other end of a socket, \
+as told by the kernel. Where SO_PEERCRED is not available, the owner of \
+the socket file is returned instead.
+
+    Parameters:
+        sock (socket): Connected Unix socket.
+        path (str): Path of the socket.
+
+    Returns:
+        int: User id.
+    """
+    if hasattr(socket, "SO_PEERCRED"):
+        # struct ucred: pid, uid and gid
+        credentials = array.array("i")
+        credentials.frombytes(
+            sock.getsockopt(
+                socket.SOL_SOCKET,
+                socket.SO_PEERCRED,
+                3 * credentials.itemsize,
+            )
+        )
+        return credentials[1]
+    return os.stat(path).st_uid
+
+
+def encode_request(cwd: str, argv: list[str]) -> bytes:
+    """
+    Encodes a request as its length, followed by the working directory \
+and the arguments separated by null bytes, which no argument can hold.
+
+    Parameters:
+        cwd (str): Working directory.
+        argv (List[str]): Arguments for the shell.
+
+    Returns:
+        bytes: Request to be sent.
+    """
+    payload = b"\0".join(os.fsencode(field) for field in [cwd] + argv)
+    return len(payload).to_bytes(4, "big") + payload
+
+
+def decode_request(data: bytes) -> tuple[str, list[str]]:
+    """
+    Decodes a request, without its length.
+
+    Parameters:
+        data (bytes): Request received.
+
+    Returns:
+        Tuple[str, List[str]]: Working directory and shell arguments.
+    """
+    cwd, *argv = [os.fsdecode(field) for field in data.split(b"\0")]
+    return cwd, argv
+
+
+def send_request(
+    path: str, argv: list[str], fds: list[int] = None
+) -> int | None:
+    """
+    Asks the shell daemon to run the shell with the given arguments.
+
+    The daemon is handed the caller's stdin, stdout and stderr, so the \
+output is written straight to them as it is produced. They are only \
+handed to a daemon run by the same user, since in a shared directory \
+such as /tmp, another user may have created the socket first.
+
+    Parameters:
+        path (str): Socket of the daemon.
+        argv (List[str]): Arguments for the shell, such as -c <cmdline>.
+        fds (List[int]): Stdin, stdout and stderr to be used. If not \
+specified, uses those of this process.
+
+    Returns:
+        Optional[int]: Exit status of the shell, or None if no daemon of \
+this user is listening on the socket.
+    """
+    data = encode_request(os.getcwd(), argv)
+    fds = array.array("i", [0, 1, 2] if fds is None else fds)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+        if peer_uid(sock, path) != os.getuid():
+            print(
+                f"Ignoring {path}, which is not run by this user",
+                file=sys.stderr,
+            )
+            return None
+        sock.sendmsg([data], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, fds)])
+        reply = b""
+        while True:
+            chunk = sock.recv(64)
+            if not chunk:
+                break
+            reply += chunk
+    try:
+        return int(reply)
+    except ValueError:
+        return 1
+
+
+def run(argv: list[str] = None) -> None:  # pragma: no cover
+    """
+    Runs a command line through the shell daemon, or in a new shell if \
+the daemon is not running.
+
+    Options:
+        --socket PATH: Socket of the daemon.
+    """
+    args = sys.argv[1:] if argv is None else list(argv)
+    path = default_socket_path()
+    if args[:1] == ["--socket"] and len(args) > 1:
+        path = args[1]
+        args = args[2:]
+    status = send_request(path, args)
+    if status is None:
+        shell = os.path.join(os.path.dirname(__file__), "shell.py")
+        os.execv(sys.executable, [sys.executable, shell] + args)
+    sys.exit(status)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    run()
@@ -0,0 +1,34 @@
+from fast_parser import parse_simple
+from ir import Sequence, from_simple
+
+
+def compile_line(
+    cmdline: str, fast: bool = True, cache=None, visitor_class: type = None
+) -> Sequence:
+    """
+    Compiles a command line into IR, without executing anything.
+
+    Simple command lines are parsed by the fast path; the others are \
+parsed by ANTLR, through the parse tree cache, and the tree is compiled \
+by a visitor. ANTLR is only loaded for the latter.
+
+    Parameters:
+        cmdline (str): Command line input.
+        fast (bool): Whether simple command lines may skip ANTLR.
+        cache (ParseCache): Parse tree cache. If not specified, uses the \
+cache shared by the process.
+        visitor_class (type): Visitor compiling parse trees. If not \
+specified, uses Visitor.
+
+    Returns:
+        Sequence: Compiled command line.
+    """
+    plan = parse_simple(cmdline) if fast else None
+    if plan is not None:
+        return from_simple(plan)
+
+    if cache is None:
+        from parse_cache import tree_cache as cache
+    if visitor_class is None:
+        from visitor import Visitor as visitor_class
+    return visitor_class().compile(cache.get(cmdline))
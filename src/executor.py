@@ -0,0 +1,35 @@
+from call import Call
+from collections import deque
+from ir import Sequence
+from pipe import Pipe
+from typing import List
+
+
+def execute(sequence: Sequence, substitution=None) -> List[str]:
+    """
+    Executes a compiled command line eagerly, one call at a time. Each \
+call runs to completion, and its output is handed to the next call of \
+its pipeline as a whole.
+
+    Parameters:
+        sequence (Sequence): Compiled command line.
+        substitution (Substitution): Command substitution engine. If not \
+specified, uses the engine shared by the process.
+
+    Returns:
+        List[str]: Output of the command line.
+    """
+    output = deque([])
+    for pipeline in sequence:
+        pipe = None
+        for i, command in enumerate(pipeline):
+            if i > 0:
+                pipe = output.pop()
+            output.append([])
+            arguments, input_io, output_io = command.expand(substitution)
+
+            if pipe:
+                pipe = Pipe(pipe)
+
+            Call(arguments, input_io, output_io, output, pipe)
+    return [item for sublist in output for item in sublist]
@@ -0,0 +1,101 @@
+import re
+from error import ArgumentError
+from glob import glob
+from typing import Callable, List, Tuple
+
+# Unquoted text and backquoted substitutions within double quotes.
+DOUBLE_QUOTED_PART = re.compile('[^\\"`]+|`([^`]*)`')
+
+
+def expand_glob(pattern: str) -> List[str]:
+    """
+    Expands a globbing pattern into the matching paths.
+
+    Parameters:
+        pattern (str): Argument containing an unquoted "*".
+
+    Returns:
+        List[str]: Matching paths.
+
+    Exceptions:
+        ArgumentError: If no path matches the pattern.
+    """
+    globbed = glob(pattern)
+    if globbed:
+        return globbed
+    raise ArgumentError(f"No matches found - {pattern}")
+
+
+def expand_quoted(
+    kind: str, text: str, evaluate: Callable[[str], str]
+) -> List[str]:
+    """
+    Expands a quoted part of an argument.
+
+    Parameters:
+        kind (str): "single", "double" or "back".
+        text (str): Text between the quotes.
+        evaluate (Callable[[str], str]): Returns the output of a \
+substituted command line.
+
+    Returns:
+        List[str]: Words of the part. A backquoted part is split on \
+spaces, so it may hold any number of words.
+    """
+    if kind == "single":
+        return [text]
+    if kind == "double":
+        quote = []
+        for sub_string in DOUBLE_QUOTED_PART.finditer(text):
+            if sub_string.group(1):
+                quote.append(evaluate(sub_string.group(1)))
+            else:
+                quote.append(sub_string.group(0))
+        return ["".join(quote)]
+    output = evaluate(text).split(" ")
+    while "" in output:
+        output.remove("")
+    return output
+
+
+def expand_word(
+    parts: List[Tuple[str, str]], evaluate: Callable[[str], str]
+) -> List[str]:
+    """
+    Expands an argument made of unquoted and quoted parts into words.
+
+    Unquoted parts are kept as written. The words holding an unquoted \
+"*" are then globbed.
+
+    Parameters:
+        parts (List[Tuple[str, str]]): Kind of every part, "unquoted", \
+"single", "double" or "back", and its text without the quotes.
+        evaluate (Callable[[str], str]): Returns the output of a \
+substituted command line.
+
+    Returns:
+        List[str]: Words of the argument.
+
+    Exceptions:
+        ArgumentError: If a globbing pattern matches no path.
+    """
+    argument = [""]
+    globbing = []
+
+    for kind, text in parts:
+        if kind == "unquoted":
+            argument[-1] += text
+            if "*" in text:
+                globbing.append(len(argument) - 1)
+        else:
+            sub_arg = expand_quoted(kind, text, evaluate)
+            if sub_arg:
+                argument[-1] += sub_arg.pop(0)
+                argument.extend(sub_arg)
+
+    if globbing:
+        globbing = list(set(globbing))
+        for i in globbing:
+            globbed = expand_glob(argument[i])
+            argument = argument[:i] + globbed + argument[i + 1:]
+    return argument
@@ -0,0 +1,124 @@
+import re
+from typing import List, Optional, Tuple
+
+
+TOKEN = re.compile(
+    r"(?P<space>[ \t]+)"
+    r"|(?P<word>(?:[^ \t\n'\"`<>|;]+|'[^\n']*')+)"
+    r"|(?P<redirection>>>|[<>])"
+    r"|(?P<separator>[|;])"
+)
+PART = re.compile(r"'([^\n']*)'|([^ \t\n'\"`<>|;]+)")
+
+
+class SimpleCall:
+    """
+    Call parsed by the fast path, compiled into IR by ir.from_simple.
+
+    Attributes:
+        arguments (List[Tuple[str, bool]]): Application and arguments, \
+each paired with whether it has to be globbed.
+        input_io (List[str]): Input file paths.
+        output_io (List[List[str]]): Output file paths and open modes.
+    """
+
+    def __init__(self) -> None:
+        self.arguments: List[Tuple[str, bool]] = []
+        self.input_io: List[str] = []
+        self.output_io: List[List[str]] = []
+
+
+def parse_word(text: str) -> Tuple[str, bool]:
+    """
+    Removes the quotes from a word made of unquoted and single quoted parts.
+
+    Parameters:
+        text (str): Word as written on the command line.
+
+    Returns:
+        Tuple[str, bool]: Unquoted word and whether it has to be globbed.
+    """
+    word, globbing = "", False
+    for part in PART.finditer(text):
+        if part.group(2) is None:
+            word += part.group(1)
+        else:
+            word += part.group(2)
+            globbing = globbing or "*" in part.group(2)
+    return word, globbing
+
+
+def parse_call(tokens: List[Tuple[str, str]]) -> Optional[SimpleCall]:
+    """
+    Parses the tokens between two separators into a call.
+
+    Parameters:
+        tokens (List[Tuple[str, str]]): Token kinds and texts.
+
+    Returns:
+        Optional[SimpleCall]: The call, or None if the grammar \
+would not accept it.
+    """
+    call = SimpleCall()
+    i = 0
+    while i < len(tokens):
+        kind, text = tokens[i]
+        i += 1
+        if kind == "word":
+            call.arguments.append(parse_word(text))
+        elif kind == "redirection":
+            if i < len(tokens) and tokens[i][0] == "space":
+                i += 1
+            if i == len(tokens) or tokens[i][0] != "word":
+                return None
+            target = tokens[i][1]
+            i += 1
+            # redirections before the application need trailing whitespace
+            if not call.arguments and (
+                i == len(tokens) or tokens[i][0] != "space"
+            ):
+                return None
+            if text == "<":
+                call.input_io.append(target)
+            else:
+                call.output_io.append([target, "w" if text == ">" else "a"])
+    return call if call.arguments else None
+
+
+def parse_simple(cmdline: str) -> Optional[List[List[SimpleCall]]]:
+    """
+    Parses command lines made of unquoted and single quoted words, \
+pipes, sequences and redirections without going through ANTLR.
+
+    Parameters:
+        cmdline (str): Command line input.
+
+    Returns:
+        Optional[List[List[SimpleCall]]]: Sequence of pipelines, or None \
+if the command line needs the full parser.
+    """
+    plan, pipeline, tokens = [], [], []
+    pos = 0
+    while pos < len(cmdline):
+        match = TOKEN.match(cmdline, pos)
+        if not match:
+            return None
+        pos = match.end()
+        if match.lastgroup != "separator":
+            tokens.append((match.lastgroup, match.group()))
+            continue
+        call = parse_call(tokens)
+        if call is None:
+            return None
+        pipeline.append(call)
+        if match.group() == ";":
+            plan.append(pipeline)
+            pipeline = []
+        tokens = []
+
+    call = parse_call(tokens)
+    if call is None:
+        return None
+    pipeline.append(call)
+    plan.append(pipeline)
+    return plan
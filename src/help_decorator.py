@@ -1,5 +1,5 @@
 from application import Application
-from typing import List
+from typing import Callable, Iterable, Iterator, List, Optional
 
 
 class HelpDecorator(Application):
@@ -10,7 +10,11 @@ class HelpDecorator(Application):
         wrapped_application (Application): Application to be decorated.
 
     Methods:
-        execute (List[str], List[str]): Executes the application.
+        execute (List[str], List[str], Iterable[str]): Executes the \
+application.
+        stream (List[str], Iterable[str]): Executes the application lazily.
+        combiner (List[str]): Tells whether stdin can be split in batches.
+        file_arguments (List[str], str): Reads a file instead of stdin.
 
     Implements:
         Application: Interface for all applications.
@@ -19,15 +23,69 @@ class HelpDecorator(Application):
     def __init__(self, wrapped_application: Application) -> None:
         self.wrapped_application = wrapped_application
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Adds the -h and --help flags to the wrapped application.
 
         Parameters:
             args (List[str]): Arguments to be passed.
             out (List[str]): Output for stdout.
+            stdin (Iterable[str]): Lines of stdin.
         """
         if args and (args[0] == "-h" or args[0] == "--help"):
             out.append(self.wrapped_application.__doc__ + "\n")
         else:
-            self.wrapped_application.execute(args, out)
+            self.wrapped_application.execute(args, out, stdin)
+
+    def stream(
+        self, args: List[str], stdin: Iterable[str] = None
+    ) -> Iterator[str]:
+        """
+        Adds the -h and --help flags to the wrapped application.
+
+        Parameters:
+            args (List[str]): Arguments to be passed.
+            stdin (Iterable[str]): Lines of stdin.
+
+        Returns:
+            (Iterator[str]): Output lines.
+        """
+        if args and (args[0] == "-h" or args[0] == "--help"):
+            yield self.wrapped_application.__doc__ + "\n"
+        else:
+            yield from self.wrapped_application.stream(args, stdin)
+
+    def combiner(
+        self, args: List[str]
+    ) -> Optional[Callable[[Iterable[List[str]]], Iterator[str]]]:
+        """
+        Asks the wrapped application, unless help is requested.
+
+        Parameters:
+            args (List[str]): Arguments to be passed.
+
+        Returns:
+            (Optional[Callable]): Combiner of the wrapped application.
+        """
+        if args and (args[0] == "-h" or args[0] == "--help"):
+            return None
+        return self.wrapped_application.combiner(args)
+
+    def file_arguments(
+        self, args: List[str], path: str
+    ) -> Optional[List[str]]:
+        """
+        Asks the wrapped application, unless help is requested.
+
+        Parameters:
+            args (List[str]): Arguments to be passed, reading stdin.
+            path (str): Path of the file to be read.
+
+        Returns:
+            (Optional[List[str]]): Arguments of the wrapped application.
+        """
+        if args and (args[0] == "-h" or args[0] == "--help"):
+            return None
+        return self.wrapped_application.file_arguments(args, path)
@@ -0,0 +1,184 @@
+from expansion import expand_word
+from typing import List, NamedTuple, Tuple
+
+
+class Word(NamedTuple):
+    """
+    Argument whose expansion is deferred until the call runs, since \
+globs and substitutions depend on the state at that time.
+
+    Attributes:
+        parts (Tuple[Tuple[str, str], ...]): Kind of every part, \
+"unquoted", "single", "double" or "back", and its text without the quotes.
+    """
+
+    parts: Tuple[Tuple[str, str], ...]
+
+
+class Redirection(NamedTuple):
+    """
+    Input or output redirection of a call.
+
+    Attributes:
+        operator (str): "<", ">" or ">>".
+        target (str): Path as written, which is not expanded.
+    """
+
+    operator: str
+    target: str
+
+
+class Command(NamedTuple):
+    """
+    Call of an application.
+
+    Attributes:
+        words (Tuple[Word, ...]): Application and arguments.
+        redirections (Tuple[Redirection, ...]): Redirections, in order.
+
+    Methods:
+        expand (Substitution): Returns the arguments and redirections \
+for a run.
+    """
+
+    words: Tuple[Word, ...]
+    redirections: Tuple[Redirection, ...]
+
+    def expand(
+        self, substitution=None
+    ) -> Tuple[List[str], List[str], List[List[str]]]:
+        """
+        Expands the quotes, substitutions and globs of the call.
+
+        Identical substitutions are only executed once within the call. \
+The parser is only loaded if a substitution needs it.
+
+        Parameters:
+            substitution (Substitution): Command substitution engine. If \
+not specified, uses the engine shared by the process.
+
+        Returns:
+            Tuple[List[str], List[str], List[List[str]]]: Arguments, \
+input file paths and output file paths.
+
+        Exceptions:
+            ArgumentError: If a globbing pattern matches no path.
+        """
+        engine = substitution
+        if engine is not None:
+            engine.clear()
+
+        def evaluate(cmdline: str) -> str:
+            nonlocal engine
+            if engine is None:
+                engine = default_substitution()
+            return engine.evaluate(cmdline)
+
+        arguments = []
+        for word in self.words:
+            arguments.extend(expand_word(word.parts, evaluate))
+        input_io, output_io = [], []
+        for operator, target in self.redirections:
+            if operator == "<":
+                input_io.append(target)
+            else:
+                output_io.append([target, "w" if operator == ">" else "a"])
+        return arguments, input_io, output_io
+
+
+class Pipeline(tuple):
+    """
+    Commands connected by pipes, as a tuple of Command.
+    """
+
+    __slots__ = ()
+
+
+class Sequence(tuple):
+    """
+    Pipelines run one after the other, as a tuple of Pipeline.
+    """
+
+    __slots__ = ()
+
+
+_substitution = None
+
+
+def default_substitution():
+    """
+    Returns the substitution engine shared by the process, creating it \
+on first use, with no memoized results.
+
+    Returns:
+        Substitution: Command substitution engine.
+    """
+    global _substitution
+    if _substitution is None:
+        from substitution import Substitution
+        from visitor import Visitor
+
+        _substitution = Substitution(Visitor)
+    _substitution.clear()
+    return _substitution
+
+
+def from_simple(plan: List[List]) -> Sequence:
+    """
+    Compiles a plan of the fast path into IR.
+
+    Parameters:
+        plan (List[List[SimpleCall]]): Sequence of pipelines.
+
+    Returns:
+        Sequence: The command line.
+    """
+    pipelines = []
+    for calls in plan:
+        commands = []
+        for call in calls:
+            # Quoted and unquoted parts are already joined; the word is
+            # globbed as a whole if any unquoted part holds a "*"
+            words = tuple(
+                Word((("unquoted" if globbing else "single", word),))
+                for word, globbing in call.arguments
+            )
+            redirections = [Redirection("<", path) for path in call.input_io]
+            redirections.extend(
+                Redirection(">" if mode == "w" else ">>", path)
+                for path, mode in call.output_io
+            )
+            commands.append(Command(words, tuple(redirections)))
+        pipelines.append(Pipeline(commands))
+    return Sequence(pipelines)
+
+
+def from_data(data: List) -> Sequence:
+    """
+    Rebuilds IR from its JSON form, the nested lists json.dump writes.
+
+    Parameters:
+        data (List): IR as nested lists.
+
+    Returns:
+        Sequence: The command line.
+
+    Exceptions:
+        TypeError, ValueError: If the data does not have the layout of IR.
+    """
+    return Sequence(
+        Pipeline(
+            Command(
+                tuple(
+                    Word(tuple((kind, text) for kind, text in parts))
+                    for (parts,) in words
+                ),
+                tuple(
+                    Redirection(operator, target)
+                    for operator, target in redirections
+                ),
+            )
+            for words, redirections in commands
+        )
+        for commands in data
+    )
@@ -0,0 +1,216 @@
+import io
+import re
+from functools import lru_cache
+from typing import (
+    AnyStr,
+    Callable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+
+# Size of the blocks a text file is scanned in, in characters.
+BLOCK_SIZE = 2**20
+
+# Operators repeating what they apply to.
+REPEATS = {
+    sre_parse.MAX_REPEAT,
+    sre_parse.MIN_REPEAT,
+    getattr(sre_parse, "POSSESSIVE_REPEAT", sre_parse.MAX_REPEAT),
+}
+
+
+class RequiredLiteral(NamedTuple):
+    """
+    String that every match of a regular expression contains.
+
+    Attributes:
+        text (str): The string.
+        ignore_case (bool): Whether case is ignored when matching.
+    """
+
+    text: str
+    ignore_case: bool = False
+
+    def finder(self, bytes_text: bool = False) -> Callable:
+        """
+        Returns a function finding the string, in the same way as the \
+regular expression would match it.
+
+        Parameters:
+            bytes_text (bool): Whether the string is found in bytes, \
+which needs it to be ASCII.
+
+        Returns:
+            (Callable): Function of a text and an offset, returning the \
+offset of the next occurrence from there, or -1 if there is none.
+        """
+        target = self.text.encode() if bytes_text else self.text
+        if not self.ignore_case:
+            return lambda text, start: text.find(target, start)
+        search = re.compile(re.escape(target), re.IGNORECASE).search
+
+        def find(text: AnyStr, start: int) -> int:
+            found = search(text, start)
+            return -1 if found is None else found.start()
+
+        return find
+
+
+@lru_cache(maxsize=512)
+def required_literal(
+    pattern: str, flags: int = 0
+) -> Optional[RequiredLiteral]:
+    """
+    Finds the longest string that every match of a regular expression \
+contains, e.g. "timeout" in ERROR.*timeout, so lines without it can be \
+rejected by a plain string search, without running the expression.
+
+    The pattern is parsed as the re module does. Consecutive literal \
+characters, also across groups and zero width assertions such as ^ or \
+\\b, form a string. Anything else ends it, and is only looked into if it \
+must match: the body of a repetition of at least once is, while \
+alternatives, optional parts and character classes are not.
+
+    Parameters:
+        pattern (str): Regular expression.
+        flags (int): Flags of the re module, e.g. re.IGNORECASE.
+
+    Returns:
+        (Optional[RequiredLiteral]): The string, or None if there is none \
+or the pattern is invalid.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, RecursionError, OverflowError):
+        return None
+    strings, current = [], []
+    for char in _characters(parsed):
+        if char is None:
+            strings.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    text = max(strings + ["".join(current)], key=len)
+    if not text:
+        return None
+    return RequiredLiteral(text, bool(parsed.state.flags & re.IGNORECASE))
+
+
+def _characters(items: Iterable[Tuple]) -> Iterator[Optional[str]]:
+    """
+    Yields the characters every match of parsed items contains, in \
+order, with None wherever they may not be adjacent.
+
+    Parameters:
+        items (Iterable[Tuple]): Operators and arguments of a parsed \
+regular expression.
+
+    Returns:
+        (Iterator[Optional[str]]): Characters and separators.
+    """
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            yield chr(av)
+        elif op is sre_parse.AT:
+            # Zero width, so the characters around it are adjacent
+            continue
+        elif op is sre_parse.SUBPATTERN and not (av[1] or av[2]):
+            # A group without flags of its own
+            yield from _characters(av[3])
+        elif op is getattr(sre_parse, "ATOMIC_GROUP", None):
+            yield from _characters(av)
+        elif op in REPEATS and av[0] >= 1:
+            yield None
+            yield from _characters(av[2])
+            yield None
+        else:
+            yield None
+
+
+def find_lines(
+    text: AnyStr, literal: RequiredLiteral
+) -> Iterator[Tuple[int, AnyStr]]:
+    """
+    Yields the lines of a block of text or bytes that contain a literal. \
+It is looked for in the whole block at once, so the other lines are \
+skipped without being looked at one by one.
+
+    Parameters:
+        text (AnyStr): Lines separated by newlines.
+        literal (RequiredLiteral): String to be found, ASCII if the text \
+is bytes.
+
+    Returns:
+        (Iterator[Tuple[int, AnyStr]]): Number of each line in the block, \
+from 1, and the line with its newline.
+    """
+    newline = "\n" if isinstance(text, str) else b"\n"
+    scanned = text
+    if literal.ignore_case and literal.text.isascii() and text.isascii():
+        # ASCII letters only fold to ASCII letters, so this finds the same
+        # lines, while a literal such as "ſ" also matches "s"
+        scanned = text.lower()
+        literal = RequiredLiteral(literal.text.lower())
+    find = literal.finder(not isinstance(text, str))
+    number, counted = 1, 0
+    position = find(scanned, 0)
+    while position != -1:
+        start = text.rfind(newline, 0, position) + 1
+        end = text.find(newline, position) + 1 or len(text)
+        number += text.count(newline, counted, start)
+        counted = start
+        yield number, text[start:end]
+        position = find(scanned, end)
+
+
+def candidate_lines(
+    lines: Iterable[str], literal: RequiredLiteral
+) -> Iterator[Tuple[int, str]]:
+    """
+    Yields the lines that contain a literal, and so may match.
+
+    A text file is read in large blocks of whole lines, which are \
+scanned by find_lines, so lines without the literal are never split out. \
+Other lines, including those of pipes, which would otherwise only be \
+printed once a whole block has been written, are checked one at a time.
+
+    Parameters:
+        lines (Iterable[str]): Lines, or a text file.
+        literal (RequiredLiteral): String every match contains.
+
+    Returns:
+        (Iterator[Tuple[int, str]]): Number of each line, from 1, and the \
+line.
+    """
+    if isinstance(lines, io.TextIOBase) and lines.seekable():
+        counted = 0
+        while True:
+            block = lines.read(BLOCK_SIZE)
+            if not block:
+                return
+            if not block.endswith("\n"):
+                block += lines.readline()
+            for number, line in find_lines(block, literal):
+                yield counted + number, line
+            counted += block.count("\n")
+
+    elif literal.ignore_case:
+        find = literal.finder()
+        for number, line in enumerate(lines, 1):
+            if find(line, 0) != -1:
+                yield number, line
+
+    else:
+        text = literal.text
+        for number, line in enumerate(lines, 1):
+            if text in line:
+                yield number, line
@@ -0,0 +1,97 @@
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Hashable
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class LRUCache:
+    """
+    Least recently used cache of values built from their keys.
+
+    Unlike functools.lru_cache, the cache is an object of its own, so \
+several can be kept, inspected and cleared apart, and its statistics \
+are those of the keys the callers look up.
+
+    Caches are shared by the threads of a process, such as those running \
+pipeline stages, so the values are only looked up and stored with a lock \
+held. Values are built without it, so a slow build does not hold up \
+other lookups, and two threads missing the same key may both build it.
+
+    Attributes:
+        maxsize (int): Maximum number of cached values, 0 disables caching.
+        load (Callable): Builds the value of a key, called with the \
+parts of the key.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that had to build the value.
+
+    Methods:
+        lookup (Hashable, ...): Returns the value of a key.
+        info (): Returns the cache statistics.
+        clear (): Empties the cache and resets the statistics.
+    """
+
+    def __init__(self, maxsize: int, load: Callable) -> None:
+        self.maxsize = maxsize
+        self.load = load
+        self.hits = 0
+        self.misses = 0
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, *key: Hashable) -> Any:
+        """
+        Returns the value of a key, building it on a miss and evicting \
+the least recently used value if the cache is then over its size.
+
+        Parameters:
+            key (Hashable): Parts of the key, passed to load on a miss.
+
+        Returns:
+            Any: The value, as returned by load.
+
+        Exceptions:
+            Exception: Whatever load raises, in which case nothing is \
+cached.
+        """
+        with self._lock:
+            value = self._values.get(key)
+            if value is not None:
+                self.hits += 1
+                self._values.move_to_end(key)
+                return value
+            self.misses += 1
+
+        value = self.load(*key)
+        if self.maxsize > 0:
+            with self._lock:
+                self._values[key] = value
+                self._values.move_to_end(key)
+                if len(self._values) > self.maxsize:
+                    self._values.popitem(last=False)
+        return value
+
+    def info(self) -> CacheInfo:
+        """
+        Returns the cache statistics.
+
+        Returns:
+            CacheInfo: Hits, misses, maximum size and current size.
+        """
+        with self._lock:
+            return CacheInfo(
+                self.hits, self.misses, self.maxsize, len(self._values)
+            )
+
+    def clear(self) -> None:
+        """
+        Empties the cache and resets the statistics.
+        """
+        with self._lock:
+            self._values.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
@@ -0,0 +1,54 @@
+import mmap
+import os
+from typing import List, Tuple
+
+
+def chunk_bounds(path: str, chunk_size: int) -> List[Tuple[int, int]]:
+    """
+    Splits a file into chunks of whole lines.
+
+    The file is memory-mapped, and each chunk ends just after the first \
+newline at or past chunk_size bytes from its start, so no line is split \
+and only the pages around the boundaries are read.
+
+    Parameters:
+        path (str): Path of the file.
+        chunk_size (int): Approximate size of a chunk in bytes.
+
+    Returns:
+        List[Tuple[int, int]]: Start and end offset of each chunk, in \
+order, covering the whole file.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    bounds = []
+    with open(path, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        start = 0
+        while start < size:
+            end = mapped.find(b"\n", start + chunk_size - 1)
+            end = size if end == -1 else end + 1
+            bounds.append((start, end))
+            start = end
+    return bounds
+
+
+def read_chunk(path: str, start: int, end: int) -> bytes:
+    """
+    Reads a chunk of a file through a memory map, without reading the \
+rest of the file.
+
+    Parameters:
+        path (str): Path of the file.
+        start (int): Offset of the first byte.
+        end (int): Offset past the last byte.
+
+    Returns:
+        bytes: Contents of the chunk.
+    """
+    with open(path, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        return mapped[start:end]
@@ -0,0 +1,457 @@
+import os
+import shlex
+from application_registry import registry
+from collections import Counter
+from itertools import chain, islice, repeat
+from error import ArgumentError, FlagError
+from ir import Sequence
+from pipe import split_lines
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+HELP = ("-h", "--help")
+
+
+class Step(NamedTuple):
+    """
+    Call of a pipeline with its arguments expanded, or several adjacent \
+calls fused into one.
+
+    Attributes:
+        calls (List[List[str]]): Application and arguments of every call \
+the step stands for, in order.
+        input_io (List[str]): Input file paths.
+        output_io (List[List[str]]): Output file paths and open modes.
+        rule (str): Name of the rule that fused the calls, or "" for a \
+single call.
+
+    Methods:
+        describe (): Returns the step as a command line.
+    """
+
+    calls: List[List[str]]
+    input_io: List[str]
+    output_io: List[List[str]]
+    rule: str = ""
+
+    def describe(self) -> str:
+        """
+        Returns the step as a command line, with fused calls in brackets.
+
+        Returns:
+            str: Calls and redirections of the step.
+        """
+        text = " | ".join(
+            " ".join(shlex.quote(word) for word in call) for call in self.calls
+        )
+        if self.rule:
+            text = f"[{text}]"
+        for path in self.input_io:
+            text += f" < {shlex.quote(path)}"
+        for path, mode in self.output_io:
+            text += f" {'>>' if mode == 'a' else '>'} {shlex.quote(path)}"
+        return text
+
+
+def single(step: Step, name: str) -> Optional[List[str]]:
+    """
+    Returns the arguments of a step made of one call of an application.
+
+    Parameters:
+        step (Step): Step to be checked.
+        name (str): Name of the application.
+
+    Returns:
+        Optional[List[str]]: Arguments of the call, or None if the step \
+is fused, calls another application or asks for help.
+    """
+    if step.rule or step.calls[0][0] != name:
+        return None
+    args = step.calls[0][1:]
+    if args and args[0] in HELP:
+        return None
+    return args
+
+
+def ends_with_newline(path: str) -> bool:
+    """
+    Tells whether a file is non-empty and ends with a newline.
+
+    Parameters:
+        path (str): Path of the file.
+
+    Returns:
+        bool: False if the file is empty, unterminated or cannot be read.
+    """
+    try:
+        with open(path, "rb") as file:
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) == b"\n"
+    except OSError:
+        return False
+
+
+def read_file(first: Step, second: Step) -> Optional[Step]:
+    """
+    cat FILE | app ARGS -> app ARGS FILE
+
+    The application reads the file itself. Only applied if the file is \
+non-empty and newline terminated, since cat adds a missing newline and \
+an application reading stdin fails on empty input.
+    """
+    args = single(first, "cat")
+    if (
+        args is None
+        or len(args) != 1
+        or args[0] != args[0].rstrip()
+        or first.input_io
+        or second.rule
+        or second.calls[0][0] not in registry
+        or not ends_with_newline(args[0])
+    ):
+        return None
+    name = second.calls[0][0]
+    arguments = registry.resolve(name).file_arguments(
+        second.calls[0][1:], args[0]
+    )
+    if arguments is None:
+        return None
+    return Step([[name] + arguments], [], second.output_io)
+
+
+def sort_arguments(step: Step) -> bool:
+    """
+    Tells whether a step is a single sort call with valid arguments.
+
+    Parameters:
+        step (Step): Step to be checked.
+
+    Returns:
+        bool: Whether the step can be fused with the call after it.
+    """
+    args = single(step, "sort")
+    if args is None:
+        return False
+    from apps.sort import Sort
+
+    try:
+        Sort.parse_arguments(args)
+    except (ArgumentError, FlagError):
+        return False
+    return True
+
+
+def sort_unique(first: Step, second: Step) -> Optional[Step]:
+    """
+    sort ARGS | uniq [-i] -> one sort that drops duplicate lines first
+    """
+    if not sort_arguments(first) or single(second, "uniq") not in ([], ["-i"]):
+        return None
+    return Step(
+        first.calls + second.calls,
+        first.input_io,
+        second.output_io,
+        "sort-unique",
+    )
+
+
+def sort_top(first: Step, second: Step) -> Optional[Step]:
+    """
+    sort ARGS | head [-n NUM] -> one sort keeping the NUM smallest lines
+    """
+    args = single(second, "head")
+    if not sort_arguments(first) or args is None:
+        return None
+    if args:
+        if len(args) != 2 or args[0] != "-n":
+            return None
+        try:
+            if int(args[1]) <= 0:
+                return None
+        except ValueError:
+            return None
+    return Step(
+        first.calls + second.calls,
+        first.input_io,
+        second.output_io,
+        "sort-top",
+    )
+
+
+def grep_all(first: Step, second: Step) -> Optional[Step]:
+    """
+    grep ARGS | grep PATTERN -> one grep checking every pattern per line
+    """
+    args = second.calls[0][1:]
+    if single(second, "grep") is None or len(args) != 1:
+        return None
+    if args[0].startswith("-"):
+        return None
+    if first.rule != "grep-all":
+        # Only calls printing the selected lines as they are can be fused
+        args = single(first, "grep")
+        if args is None or any(arg.startswith("-") for arg in args):
+            return None
+    return Step(
+        first.calls + second.calls,
+        first.input_io,
+        second.output_io,
+        "grep-all",
+    )
+
+
+# Rules tried on every pair of adjacent steps, in order.
+RULES: List[Tuple[str, Callable[[Step, Step], Optional[Step]]]] = [
+    ("read-file", read_file),
+    ("sort-unique", sort_unique),
+    ("sort-top", sort_top),
+    ("grep-all", grep_all),
+]
+
+
+def optimize(steps: List[Step]) -> Tuple[List[Step], List[str]]:
+    """
+    Rewrites a pipeline, replacing adjacent calls matching a rule with \
+one step that has the same output.
+
+    Steps are added left to right, and the last two are rewritten as long \
+as a rule matches them, so rewrites chain: cat FILE | sort | uniq becomes \
+sort FILE | uniq and then a single step. Calls connected by a redirection \
+rather than a pipe are left alone.
+
+    Parameters:
+        steps (List[Step]): Calls of the pipeline, in order.
+
+    Returns:
+        Tuple[List[Step], List[str]]: Rewritten pipeline, and the names \
+of the rules applied.
+    """
+    result: List[Step] = []
+    applied: List[str] = []
+    for step in steps:
+        result.append(step)
+        while len(result) > 1:
+            first, second = result[-2:]
+            if (
+                first.output_io
+                or second.input_io
+                or not first.calls[0]
+                or not second.calls[0]
+            ):
+                break
+            for name, rule in RULES:
+                fused = rule(first, second)
+                if fused is not None:
+                    break
+            else:
+                break
+            result[-2:] = [fused]
+            applied.append(name)
+    return result, applied
+
+
+def is_line(item: str) -> bool:
+    """
+    Tells whether an output item is exactly one newline terminated line, \
+so that a pipe passes it on unchanged whatever comes after it.
+
+    Parameters:
+        item (str): Output item.
+
+    Returns:
+        bool: Whether the item is a single complete line.
+    """
+    return item.find("\n") == len(item) - 1 >= 0
+
+
+def all_lines(items: List[str]) -> bool:
+    """
+    Tells whether every output item is exactly one complete line, \
+without checking the items one by one in Python.
+
+    Parameters:
+        items (List[str]): Output items.
+
+    Returns:
+        bool: Whether each item ends with its only newline.
+    """
+    return all(map(str.endswith, items, repeat("\n"))) and "".join(
+        items
+    ).count("\n") == len(items)
+
+
+def stream_sort_unique(
+    calls: List[List[str]], stdin: Iterable[str] = None
+) -> Iterator[str]:
+    """
+    Executes sort | uniq, sorting only one copy of every line.
+
+    If the input holds an incomplete line, which the pipe would join to \
+the line sorted after it, every copy is kept instead.
+
+    Parameters:
+        calls (List[List[str]]): The sort and uniq calls.
+        stdin (Iterable[str]): Lines of stdin.
+
+    Returns:
+        Iterator[str]: Output of uniq.
+
+    Exceptions:
+        ArgumentError: If there is no input.
+        FileError: If file does not exist.
+    """
+    from apps.sort import Sort
+    from apps.uniq import Uniq
+
+    sort = Sort()
+    reverse, filename = sort.parse_arguments(calls[0][1:])
+    counts = Counter(sort.input_lines(filename, stdin))
+    lines: Iterable[str] = sorted(counts, reverse=reverse)
+    if not lines:
+        raise ArgumentError("No standard input detected")
+    if not all_lines(lines):
+        lines = split_lines(
+            chain.from_iterable(repeat(line, counts[line]) for line in lines)
+        )
+    yield from Uniq.return_uniq(lines, calls[1][1:] == ["-i"])
+
+
+def stream_sort_top(
+    calls: List[List[str]],
+    stdin: Iterable[str] = None,
+    chunk_size: int = 1 << 16,
+) -> Iterator[str]:
+    """
+    Executes sort | head keeping only the lines to be output. The input \
+is sorted a chunk at a time together with the lines kept so far, so at \
+most chunk_size lines are held at once.
+
+    Incomplete lines, which the pipe would join to the line sorted after \
+them, are set aside and sorted in with the lines selected. One more line \
+than needed is selected, so a line joined to the last one is there.
+
+    Parameters:
+        calls (List[List[str]]): The sort and head calls.
+        stdin (Iterable[str]): Lines of stdin.
+        chunk_size (int): Number of lines sorted at once.
+
+    Returns:
+        Iterator[str]: Output of head.
+
+    Exceptions:
+        ArgumentError: If there is no input.
+        FileError: If file does not exist.
+    """
+    from apps.sort import Sort
+
+    sort = Sort()
+    reverse, filename = sort.parse_arguments(calls[0][1:])
+    count = int(calls[1][2]) if len(calls[1]) == 3 else 10
+    lines: List[str] = []
+    others: List[str] = []
+    items = sort.input_lines(filename, stdin)
+    for chunk in iter(lambda: list(islice(items, chunk_size)), []):
+        if not all_lines(chunk):
+            others.extend(item for item in chunk if not is_line(item))
+            chunk = [item for item in chunk if is_line(item)]
+        lines = sorted(lines + chunk, reverse=reverse)[: count + 1]
+    if others:
+        lines = sorted(lines + others, reverse=reverse)
+    if not lines:
+        raise ArgumentError("No standard input detected")
+    yield from islice(split_lines(lines), count)
+
+
+def stream_grep_all(
+    calls: List[List[str]], stdin: Iterable[str] = None
+) -> Iterator[str]:
+    """
+    Executes grep ARGS | grep PATTERN..., checking the patterns of the \
+later calls on each output line of the first one in turn.
+
+    As in the pipeline, a later call fails if no line reaches it.
+
+    Parameters:
+        calls (List[List[str]]): The grep calls.
+        stdin (Iterable[str]): Lines of stdin.
+
+    Returns:
+        Iterator[str]: Lines matched by every call.
+
+    Exceptions:
+        ArgumentError: If a pattern is invalid or a call has no input.
+        FileError: If file does not exist.
+    """
+    from apps.grep import Grep
+
+    # Compiled before any line is read, the last call first, as they are
+    # in the pipeline
+    matchers = [Grep.matcher(call[1]) for call in reversed(calls[1:])]
+    matchers.reverse()
+    reached = 0
+    lines = registry.resolve("grep").stream(calls[0][1:], stdin)
+    for line in split_lines(lines):
+        for i, match in enumerate(matchers):
+            if i == reached:
+                reached += 1
+            if not match(line):
+                break
+        else:
+            yield line
+    if reached < len(matchers):
+        raise ArgumentError("No standard input detected")
+
+
+# Executes the steps fused by each rule.
+FUSED: Dict[str, Callable[[List[List[str]], Iterable[str]], Iterator[str]]] = {
+    "sort-unique": stream_sort_unique,
+    "sort-top": stream_sort_top,
+    "grep-all": stream_grep_all,
+}
+
+
+def explain(plan: Sequence) -> Iterator[str]:
+    """
+    Describes how each pipeline of a command line would be executed.
+
+    The calls are expanded to decide on the rewrites, so command \
+substitutions are run, but the pipelines are not.
+
+    Parameters:
+        plan (Sequence): Compiled command line.
+
+    Returns:
+        Iterator[str]: For every pipeline, the calls as written, the \
+rules applied and the calls that would be executed.
+    """
+    for stages in plan:
+        steps = expand_steps(stages)
+        optimized, applied = optimize(steps)
+        yield f"pipeline: {' | '.join(step.describe() for step in steps)}\n"
+        yield f"   rules: {', '.join(applied) or '-'}\n"
+        yield f"    plan: {' | '.join(s.describe() for s in optimized)}\n"
+
+
+def expand_steps(stages: List) -> List[Step]:
+    """
+    Expands the calls of a pipeline into steps.
+
+    Parameters:
+        stages (List): Calls of the pipeline, providing expand().
+
+    Returns:
+        List[Step]: One step per call.
+    """
+    steps = []
+    for stage in stages:
+        arguments, input_io, output_io = stage.expand()
+        steps.append(Step([arguments], input_io, output_io))
+    return steps
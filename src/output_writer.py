@@ -0,0 +1,168 @@
+import sys
+import threading
+import time
+from typing import IO, Iterable, List, Optional
+
+
+class OutputWriter:
+    """
+    Collects output lines and writes them to stdout in large chunks.
+
+    Lines are written once size characters are pending, or once interval \
+seconds have passed since the last write, so output that is produced \
+slowly still appears promptly. While lines are pending, a background \
+thread writes them once they are due, so they also appear when no more \
+output follows for a while, e.g. while grep -r walks a large tree. Text \
+streams with a binary buffer, such as sys.stdout, are written to through \
+the buffer.
+
+    Adding a line takes no lock: appending to the pending list, and \
+taking its first lines with a slice and del, are each atomic, so lines \
+added while the background thread writes are kept for the next write.
+
+    Attributes:
+        stream (IO): Stream the output is written to.
+        size (int): Number of characters written at once.
+        interval (float): Longest time in seconds lines are held.
+        pending (List[str]): Lines not yet written.
+        length (int): Number of characters added since the last write \
+of the caller, which may count some the background thread wrote.
+        written (float): Time of the last write.
+        lock (Lock): Held while pending lines are written.
+
+    Methods:
+        write (str): Adds a line to the output.
+        writelines (Iterable[str]): Adds lines to the output.
+        flush (): Writes all pending lines.
+    """
+
+    def __init__(
+        self, stream: IO = None, size: int = 1 << 16, interval: float = 0.05
+    ) -> None:
+        self.stream = sys.stdout if stream is None else stream
+        self.size = size
+        self.interval = interval
+        self.pending: List[str] = []
+        self.length = 0
+        self.written = time.monotonic()
+        self.lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def write(self, line: str) -> None:
+        """
+        Adds a line to the output, writing pending lines if needed.
+
+        Parameters:
+            line (str): Line to be written.
+        """
+        self.writelines((line,))
+
+    def writelines(self, lines: Iterable[str]) -> None:
+        """
+        Adds lines to the output as they are produced. Same as calling \
+write for every line, with the per-line work kept to a minimum.
+
+        Parameters:
+            lines (Iterable[str]): Lines to be written.
+        """
+        append = self.pending.append
+        length = self.length
+        try:
+            for line in lines:
+                append(line)
+                length += len(line)
+                if (
+                    length >= self.size
+                    or time.monotonic() - self.written >= self.interval
+                ):
+                    self.flush()
+                    length = 0
+                elif self._flusher is None:
+                    self._start_flusher()
+        finally:
+            self.length = length
+
+    def flush(self) -> None:
+        """
+        Writes all pending lines, after anything already printed.
+
+        Exceptions:
+            Exception: If the background thread failed to write lines.
+        """
+        self._raise_error()
+        self.length = 0
+        with self.lock:
+            self._write_pending()
+
+    def _start_flusher(self) -> None:
+        """
+        Starts the thread writing pending lines once they are due, unless \
+one was started meanwhile.
+        """
+        with self.lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_later, daemon=True
+                )
+                self._flusher.start()
+
+    def _flush_later(self) -> None:
+        """
+        Writes pending lines whenever interval seconds have passed since \
+the last write, until there are none left, in the background thread. \
+An error is kept, to be raised by the next flush.
+        """
+        while True:
+            time.sleep(max(self.written + self.interval - time.monotonic(), 0))
+            with self.lock:
+                if self._error is not None:
+                    # Left set, so no other thread starts until it is raised
+                    return
+                # Cleared before looking at the lines, so a line added
+                # meanwhile is either seen here or starts another thread
+                self._flusher = None
+                if not self.pending:
+                    return
+                self._flusher = threading.current_thread()
+                if time.monotonic() - self.written >= self.interval:
+                    try:
+                        self._write_pending()
+                    except Exception as error:
+                        self._error = error
+
+    def _raise_error(self) -> None:
+        """
+        Raises the error the background thread stopped at, if any.
+        """
+        error, self._error = self._error, None
+        if error is not None:
+            self._flusher = None
+            raise error
+
+    def _write_pending(self) -> None:
+        """
+        Writes all pending lines. Called with the lock held.
+        """
+        self.written = time.monotonic()
+        pending = self.pending
+        count = len(pending)
+        if not count:
+            return
+        text = "".join(pending[:count])
+        del pending[:count]
+        self.stream.flush()
+        binary = getattr(self.stream, "buffer", None)
+        if binary is None:
+            self.stream.write(text)
+            self.stream.flush()
+        else:
+            errors = getattr(self.stream, "errors", None) or "strict"
+            binary.write(text.encode(self.stream.encoding, errors))
+            binary.flush()
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.flush()
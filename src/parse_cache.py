@@ -0,0 +1,184 @@
+import io
+from antlr.Comp0010ShellLexer import Comp0010ShellLexer
+from antlr.Comp0010ShellParser import Comp0010ShellParser
+from antlr4 import InputStream, CommonTokenStream, Token
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.ErrorStrategy import BailErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
+from lru_cache import LRUCache
+from typing import Optional
+
+
+def build_tree(
+    cmdline: str, two_stage: bool = True
+) -> Comp0010ShellParser.CommandContext:
+    """
+    Runs the ANTLR lexer and parser over a command line.
+
+    With two_stage set, the parser first uses the cheaper SLL prediction \
+and bails out on the first syntax error. Only then, or if it stops \
+before the end of the line, is the line parsed again by a fresh parser \
+in full LL mode with the default error recovery, which is also what \
+reports the syntax errors.
+
+    Parameters:
+        cmdline (str): Command line input.
+        two_stage (bool): Whether to try SLL prediction first.
+
+    Returns:
+        CommandContext: Root of the parse tree.
+    """
+    input_stream = InputStream(io.StringIO(cmdline).read())
+    lexer = Comp0010ShellLexer(input_stream)
+    stream = CommonTokenStream(lexer)
+    parser = Comp0010ShellParser(stream)
+    if not two_stage:
+        return parser.command()
+
+    parser._interp.predictionMode = PredictionMode.SLL
+    parser._errHandler = BailErrorStrategy()
+    parser.removeErrorListeners()
+    try:
+        tree = parser.command()
+        # The grammar does not end with EOF, so a parse that stops early
+        # is only accepted as a syntax error by the full parser
+        if stream.LA(1) == Token.EOF:
+            return tree
+    except ParseCancellationException:
+        pass
+    stream.seek(0)
+    return Comp0010ShellParser(stream).command()
+
+
+def build_flat_tree(
+    cmdline: str,
+) -> Optional[Comp0010ShellParser.CommandContext]:
+    """
+    Parses a command line call by call into a flat tree.
+
+    The command and pipe rules are left-recursive, so the parser nests \
+one node per ; or | and takes time and stack depth growing with their \
+number. Here the line is lexed once, each call is parsed on its own with \
+the non-recursive call rule, and the calls are gathered under a single \
+command node, with the calls of a pipeline under a single pipe node. \
+The separators are kept as terminal nodes, so the tree reads as the \
+command line does.
+
+    Parameters:
+        cmdline (str): Command line input.
+
+    Returns:
+        Optional[CommandContext]: Root of the flat tree, or None if the \
+command line is empty, has an empty call other than after a final ;, or \
+has a syntax error, which build_tree reports and recovers from.
+    """
+    lexer = Comp0010ShellLexer(InputStream(cmdline))
+    lexer.removeErrorListeners()
+    stream = CommonTokenStream(lexer)
+    parser = Comp0010ShellParser(stream)
+    parser._interp.predictionMode = PredictionMode.SLL
+    parser._errHandler = BailErrorStrategy()
+    parser.removeErrorListeners()
+
+    root = Comp0010ShellParser.CommandContext(parser)
+    pipeline = []
+    try:
+        while True:
+            pipeline.append(parser.call())
+            separator = stream.LT(1)
+            if separator.type == Comp0010ShellLexer.T__1:
+                pipeline.append(separator)
+                stream.consume()
+                continue
+            add_pipeline(root, pipeline, parser)
+            pipeline = []
+            if separator.type == Token.EOF:
+                return root
+            if separator.type != Comp0010ShellLexer.T__0:
+                return None
+            root.addTokenNode(separator)
+            stream.consume()
+            if stream.LA(1) == Token.EOF:
+                return root
+    except ParseCancellationException:
+        return None
+
+
+def add_pipeline(
+    root: Comp0010ShellParser.CommandContext,
+    pipeline: list,
+    parser: Comp0010ShellParser,
+) -> None:
+    """
+    Adds the calls of a pipeline and the | tokens between them to the \
+root of a flat tree.
+
+    Parameters:
+        root (CommandContext): Root of the tree.
+        pipeline (list): Calls and | tokens, in order.
+        parser (Comp0010ShellParser): Parser the nodes belong to.
+    """
+    parent = root
+    if len(pipeline) > 1:
+        parent = Comp0010ShellParser.PipeContext(parser, root)
+        root.addChild(parent)
+    for node in pipeline:
+        if isinstance(node, Comp0010ShellParser.CallContext):
+            node.parentCtx = parent
+            parent.addChild(node)
+        else:
+            parent.addTokenNode(node)
+
+
+def parse_tree(cmdline: str) -> Comp0010ShellParser.CommandContext:
+    """
+    Parses a command line into a flat tree if it can, and otherwise \
+with build_tree.
+
+    Parameters:
+        cmdline (str): Command line input.
+
+    Returns:
+        CommandContext: Root of the parse tree.
+    """
+    tree = build_flat_tree(cmdline)
+    return build_tree(cmdline) if tree is None else tree
+
+
+class ParseCache(LRUCache):
+    """
+    Least recently used cache of parse trees keyed by command line.
+
+    Parse trees only describe the syntax of a command line; globs and \
+backquotes are expanded every time the compiled command line runs, so a \
+cached tree can be executed any number of times.
+
+    Attributes:
+        maxsize (int): Maximum number of cached trees, 0 disables caching.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that had to run the parser.
+
+    Methods:
+        get (str): Returns the parse tree for a command line.
+        info (): Returns the cache statistics.
+        clear (): Empties the cache and resets the statistics.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        super().__init__(maxsize, parse_tree)
+
+    def get(self, cmdline: str) -> Comp0010ShellParser.CommandContext:
+        """
+        Returns the parse tree for a command line, parsing it on a miss.
+
+        Parameters:
+            cmdline (str): Command line input.
+
+        Returns:
+            CommandContext: Root of the parse tree.
+        """
+        return self.lookup(cmdline)
+
+
+# Shared by every parse in the process.
+tree_cache = ParseCache()
@@ -0,0 +1,53 @@
+import re
+from lru_cache import LRUCache
+from typing import Any, Callable
+
+
+class PatternCache(LRUCache):
+    """
+    Least recently used cache of compiled regular expressions, keyed by \
+pattern and flags.
+
+    Unlike the cache of the re module, which is small and cleared \
+entirely once full, the least recently used patterns are evicted one at \
+a time, so the patterns of a long running shell stay compiled.
+
+    Attributes:
+        maxsize (int): Maximum number of cached patterns, 0 disables \
+caching.
+        load (Callable): Compiles a pattern with flags, re.compile by \
+default, so other matchers slow to build can be cached the same way.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that had to compile the pattern.
+
+    Methods:
+        get (str, int): Returns the compiled pattern.
+        info (): Returns the cache statistics.
+        clear (): Empties the cache and resets the statistics.
+    """
+
+    def __init__(
+        self, maxsize: int = 512, compile: Callable = re.compile
+    ) -> None:
+        super().__init__(maxsize, compile)
+
+    def get(self, pattern: str, flags: int = 0) -> Any:
+        """
+        Returns the compiled pattern, compiling it on a miss.
+
+        Parameters:
+            pattern (str): Regular expression.
+            flags (int): Flags of the re module, e.g. re.IGNORECASE.
+
+        Returns:
+            Any: Compiled pattern, as returned by compile, by default a \
+regular expression.
+
+        Exceptions:
+            re.error: If the pattern is invalid.
+        """
+        return self.lookup(pattern, flags)
+
+
+# Shared by every application in the process.
+pattern_cache = PatternCache()
@@ -0,0 +1,85 @@
+from typing import Iterable, Iterator, List
+
+
+def split_lines(items: Iterable[str]) -> Iterator[str]:
+    """
+    Splits the output of a call into lines, as reading it back from a \
+pipe would. An item may hold several lines, or only part of one.
+
+    Parameters:
+        items (Iterable[str]): Output of a call.
+
+    Returns:
+        Iterator[str]: Lines of the output.
+    """
+    partial = ""
+    for item in items:
+        if not partial and item.find("\n") == len(item) - 1 >= 0:
+            yield item
+            continue
+        lines = (partial + item).split("\n")
+        partial = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    if partial:
+        yield partial
+
+
+class Pipe:
+    """
+    Hands the output of a call to the next call in a pipeline.
+
+    The lines are taken from the output list as they are read, instead \
+of joining the output into one string and splitting it again. Reading \
+consumes the pipe, as it would a file.
+
+    Attributes:
+        items (List[str]): Output of the previous call.
+        lines (Iterator[str]): Lines not yet read.
+
+    Methods:
+        readline (): Reads one line.
+        readlines (): Reads the remaining lines.
+        read (): Reads the remaining text.
+        close (): Does nothing, as there is nothing to release.
+    """
+
+    def __init__(self, items: List[str]) -> None:
+        self.items = items
+        self.lines = split_lines(items)
+
+    def __iter__(self) -> Iterator[str]:
+        return self
+
+    def __next__(self) -> str:
+        return next(self.lines)
+
+    def readline(self) -> str:
+        """
+        Reads one line.
+
+        Returns:
+            str: The next line, or "" at the end of the pipe.
+        """
+        return next(self.lines, "")
+
+    def readlines(self) -> List[str]:
+        """
+        Reads the remaining lines.
+
+        Returns:
+            List[str]: Lines not yet read.
+        """
+        return list(self.lines)
+
+    def read(self) -> str:
+        """
+        Reads the remaining text.
+
+        Returns:
+            str: Lines not yet read, joined.
+        """
+        return "".join(self.lines)
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,235 @@
+from application_registry import registry
+from inspect import GEN_CREATED, getgeneratorstate
+from optimizer import FUSED, expand_steps, optimize
+from error import RedirectError
+from ir import Sequence
+from pipe import split_lines
+from process_stage import stream_processes
+from sink import open_sink
+from stage_thread import StageThread
+from typing import IO, Iterable, Iterator, List
+
+# Calls chained as generators before the output so far is collected, so
+# that reading a line never nests deeper than this many calls.
+MAX_CHAINED = 64
+
+
+def read_lines(file: IO) -> Iterator[str]:
+    """
+    Yields the lines of an open file and closes it.
+
+    Parameters:
+        file (IO): File to be read.
+
+    Returns:
+        Iterator[str]: Lines of the file.
+    """
+    with file:
+        yield from file
+
+
+def open_input(path: str) -> Iterator[str]:
+    """
+    Opens the file of an input redirection.
+
+    Parameters:
+        path (str): Input file path.
+
+    Returns:
+        Iterator[str]: Lines of the file.
+
+    Exceptions:
+        RedirectError: If the file does not exist.
+    """
+    try:
+        return read_lines(open(path, "r"))
+    except FileNotFoundError:
+        raise RedirectError("Input file not found")
+
+
+def write_output(lines: Iterable[str], path: str, mode: str) -> None:
+    """
+    Writes lines to the file of an output redirection as they are produced.
+
+    Parameters:
+        lines (Iterable[str]): Lines to be written.
+        path (str): Output file path.
+        mode (str): "w" to truncate the file, "a" to append to it.
+    """
+    sink = open_sink(path, mode)
+    try:
+        sink.extend(lines)
+    finally:
+        sink.close()
+
+
+def stream_pipeline(
+    stages: List,
+    threaded: bool = False,
+    processes: int = 0,
+    optimized: bool = True,
+) -> Iterator[str]:
+    """
+    Executes the calls of a pipeline as a chain of generators, so that \
+each call reads the lines of the previous one as they are produced.
+
+    Every stage, such as a Command of the IR, provides expand(), \
+returning its arguments, input file paths and output file paths. All \
+stages are expanded before the first line is read, and the pipeline is \
+then rewritten by the optimizer unless optimized is False or worker \
+processes are used, as its rewrites run in this process. A call whose \
+output is redirected to a file passes no lines on. If a call does not \
+read its input at all, the calls before it are still run once it is \
+done, and their output is discarded, so that their errors are raised. \
+Once the last call is done, or its output is no longer read, every call \
+is closed, much as SIGPIPE stops the writers of a pipe: a call that \
+stopped reading early, such as head or grep -m, does not leave the calls \
+before it running or their files open.
+
+    In a pipeline of more than MAX_CHAINED calls, the output of every \
+MAX_CHAINED calls is collected before the next call reads it, so however \
+long the pipeline is, reading a line never nests deeper than that. Only \
+the calls after the last collection then stop early.
+
+    If threaded, every call runs in its own StageThread and the calls \
+are connected by bounded queues. Threads are only started once every \
+call up to the next output redirection is resolved, so a pipeline that \
+fails to start runs nothing, as it would in a single thread.
+
+    If processes is given, a call reading a pipe or input file whose \
+application has a combiner for its arguments (grep, sed, cut and sort) \
+processes its input in batches on that many worker processes.
+
+    Parameters:
+        stages (List): Calls of the pipeline, in order.
+        threaded (bool): Whether to run each call in its own thread.
+        processes (int): Number of worker processes for CPU-bound calls.
+        optimized (bool): Whether to rewrite the pipeline with the \
+optimizer first.
+
+    Returns:
+        Iterator[str]: Output of the last call.
+
+    Exceptions:
+        RedirectError: If there are invalid redirections.
+        ApplicationError: If an application is not supported.
+    """
+    steps = expand_steps(stages)
+    if optimized and not processes:
+        steps = optimize(steps)[0]
+
+    stream = None
+    pending: List[StageThread] = []
+    inputs: List[Iterator[str]] = []
+    calls: List = []
+    chained = 0
+    try:
+        for step in steps:
+            input_io, output_io = step.input_io, step.output_io
+            if len(input_io) > 1 or len(output_io) > 1:
+                raise RedirectError("Too many redirections")
+            if input_io:
+                if stream is not None:
+                    raise RedirectError(
+                        "Cannot redirect input and pipe at the same time"
+                    )
+                stream = open_input(input_io[0])
+                calls.append(stream)
+            elif stream is not None:
+                if chained >= MAX_CHAINED:
+                    start_all(pending)
+                    stream = list(stream)
+                    chained = 0
+                stream = split_lines(stream)
+                inputs.append(stream)
+            else:
+                chained = 0
+
+            if step.rule:
+                stream = FUSED[step.rule](step.calls, stream)
+            else:
+                arguments = step.calls[0]
+                application = registry.resolve(arguments[0])
+                if (
+                    processes
+                    and stream is not None
+                    and application.combiner(arguments[1:])
+                ):
+                    stream = stream_processes(
+                        arguments[0], arguments[1:], stream, processes
+                    )
+                else:
+                    stream = application.stream(arguments[1:], stream)
+            chained += 1
+            if threaded:
+                stream = StageThread(stream)
+                pending.append(stream)
+            calls.append(stream)
+
+            if output_io:
+                start_all(pending)
+                write_output(stream, *output_io[0])
+                stream = []
+        start_all(pending)
+        if stream is not None:
+            yield from stream
+        for lines in inputs:
+            if getgeneratorstate(lines) == GEN_CREATED:
+                for _ in lines:
+                    pass
+    finally:
+        close_all(calls, threaded)
+
+
+def close_all(calls: List, threaded: bool) -> None:
+    """
+    Closes the calls of a pipeline, last to first. A call that is not \
+done is stopped, and files it has open are closed.
+
+    If threaded, only the threads are closed; each one closes its call \
+as it stops, since a generator cannot be closed from another thread \
+while it runs.
+
+    Parameters:
+        calls (List): Outputs of the calls, and input files, in order.
+        threaded (bool): Whether each call runs in its own thread.
+    """
+    for call in reversed(calls):
+        if isinstance(call, StageThread) or not threaded:
+            close = getattr(call, "close", None)
+            if close is not None:
+                close()
+
+
+def start_all(threads: List[StageThread]) -> None:
+    """
+    Starts the threads of a pipeline and empties the list.
+
+    Parameters:
+        threads (List[StageThread]): Threads not yet started.
+    """
+    for thread in threads:
+        thread.start()
+    threads.clear()
+
+
+def stream_plan(
+    plan: Sequence,
+    threaded: bool = False,
+    processes: int = 0,
+    optimized: bool = True,
+) -> Iterator[str]:
+    """
+    Executes a sequence of pipelines lazily, one after the other.
+
+    Parameters:
+        plan (Sequence): Compiled command line.
+        threaded (bool): Whether to run each call in its own thread.
+        processes (int): Number of worker processes for CPU-bound calls.
+        optimized (bool): Whether to rewrite pipelines with the optimizer.
+
+    Returns:
+        Iterator[str]: Output of the command line.
+    """
+    for stages in plan:
+        yield from stream_pipeline(stages, threaded, processes, optimized)
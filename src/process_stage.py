@@ -0,0 +1,172 @@
+import atexit
+from application_registry import registry
+from collections import deque
+from itertools import chain, islice
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+# Pools by number of workers, shared by every pipeline, created on first
+# use. A pool is never replaced, as calls of other stages may still be
+# running on it.
+_pools: Dict[int, "ProcessPoolExecutor"] = {}
+
+
+def get_pool(workers: int) -> "ProcessPoolExecutor":
+    """
+    Returns the pool of this many worker processes, starting them on \
+first use. Stages asking for different numbers of workers get pools of \
+their own, which live until exit.
+
+    Workers are spawned rather than forked, since the shell may be \
+running pipeline stages in other threads at the time. multiprocessing \
+is only imported here, as most command lines never need it, and the pool \
+is shut down at exit, before the modules it uses are torn down.
+
+    Parameters:
+        workers (int): Number of worker processes.
+
+    Returns:
+        ProcessPoolExecutor: Pool of worker processes.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    pool = _pools.get(workers)
+    if pool is None:
+        if not _pools:
+            atexit.register(shutdown_pool)
+        pool = ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        _pools[workers] = pool
+    return pool
+
+
+def shutdown_pool() -> None:
+    """
+    Stops the worker processes of every pool, if they were started.
+    """
+    while _pools:
+        _pools.popitem()[1].shutdown()
+
+
+def run_batch(name: str, args: List[str], lines: List[str]) -> List[str]:
+    """
+    Executes an application on a batch of lines, in a worker process.
+
+    Parameters:
+        name (str): Name of the application.
+        args (List[str]): Arguments to be passed.
+        lines (List[str]): Batch of stdin lines.
+
+    Returns:
+        List[str]: Output for the batch.
+    """
+    return list(registry.resolve(name).stream(args, lines))
+
+
+def read_batches(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    """
+    Splits lines into consecutive batches.
+
+    Parameters:
+        lines (Iterable[str]): Lines to be split.
+        size (int): Maximum number of lines in a batch.
+
+    Returns:
+        Iterator[List[str]]: Non-empty batches of lines.
+    """
+    lines = iter(lines)
+    batch = list(islice(lines, size))
+    while batch:
+        yield batch
+        batch = list(islice(lines, size))
+
+
+def map_ordered(
+    function: Callable, calls: Iterable[Tuple], workers: int
+) -> Iterator:
+    """
+    Calls a function on every tuple of arguments in worker processes, \
+yielding the results in the order of the calls.
+
+    At most two calls per worker are in flight at a time, so results are \
+not computed far ahead of the caller. Calls not yet done are cancelled \
+once the caller stops reading. With no workers, the calls are made in \
+this process instead, one at a time.
+
+    Parameters:
+        function (Callable): Function importable by the workers.
+        calls (Iterable[Tuple]): Arguments of each call.
+        workers (int): Number of worker processes.
+
+    Returns:
+        Iterator: Results of the calls.
+    """
+    if workers <= 0:
+        yield from (function(*args) for args in calls)
+        return
+
+    pool = get_pool(workers)
+    pending: Deque["Future"] = deque()
+    try:
+        for args in calls:
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+            pending.append(pool.submit(function, *args))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def stream_processes(
+    name: str,
+    args: List[str],
+    stdin: Iterable[str],
+    workers: int,
+    batch_size: int = 4096,
+) -> Iterator[str]:
+    """
+    Executes an application on batches of its stdin in worker processes.
+
+    The application must have a combiner for the arguments. Outputs are \
+combined in the order of the batches. Empty stdin is passed to the \
+application in this process, so that errors are reported exactly as \
+without workers.
+
+    Parameters:
+        name (str): Name of the application.
+        args (List[str]): Arguments to be passed.
+        stdin (Iterable[str]): Lines of stdin.
+        workers (int): Number of worker processes.
+        batch_size (int): Maximum number of lines sent to a worker at once.
+
+    Returns:
+        Iterator[str]: Output lines.
+    """
+    application = registry.resolve(name)
+    batches = read_batches(stdin, batch_size)
+    first = next(batches, None)
+    if first is None:
+        yield from application.stream(args, [])
+        return
+
+    calls = ((name, args, batch) for batch in chain([first], batches))
+    outputs = map_ordered(run_batch, calls, workers)
+    try:
+        yield from application.combiner(args)(outputs)
+    finally:
+        outputs.close()
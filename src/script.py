@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import tempfile
+from compiler import compile_line
+from ir import Sequence, from_data
+from typing import Iterator, Optional
+
+# Changed whenever the layout of cached plans changes, so that plans
+# cached by an older shell are not read.
+PLAN_VERSION = 2
+
+
+def compile_script(text: str) -> Sequence:
+    """
+    Compiles every line of a script into pipelines.
+
+    Each line is parsed on its own, so a long script does not become one \
+deeply nested sequence. Blank lines are skipped.
+
+    Parameters:
+        text (str): Contents of the script.
+
+    Returns:
+        Sequence: Pipelines of the whole script.
+    """
+    plan = []
+    for line in text.splitlines():
+        if line.strip():
+            plan.extend(compile_line(line))
+    return Sequence(plan)
+
+
+def default_cache_dir() -> str:
+    """
+    Returns the directory compiled scripts are cached in.
+
+    Returns:
+        str: Directory in the user's cache directory.
+    """
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache, "comp0010shell", "plans")
+
+
+def cache_path(text: str, cache_dir: str) -> str:
+    """
+    Returns the file a compiled script is cached in, named after the hash \
+of its contents and of the plan version.
+
+    Parameters:
+        text (str): Contents of the script.
+        cache_dir (str): Cache directory.
+
+    Returns:
+        str: Path of the cached plan.
+    """
+    digest = hashlib.sha256(f"{PLAN_VERSION}\0{text}".encode()).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.json")
+
+
+def load_plan(path: str) -> Optional[Sequence]:
+    """
+    Reads a cached plan.
+
+    Parameters:
+        path (str): Path of the cached plan.
+
+    Returns:
+        Optional[Sequence]: The plan, or None if it is not cached or \
+cannot be read.
+    """
+    try:
+        with open(path) as file:
+            return from_data(json.load(file))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def save_plan(plan: Sequence, path: str) -> None:
+    """
+    Caches a plan. The plan is written to a temporary file first, so that \
+a shell reading the cache never sees a partial plan. Failing to write the \
+cache is not an error.
+
+    Parameters:
+        plan (Sequence): Compiled script.
+        path (str): Path of the cached plan.
+    """
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(plan, file)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError:
+        pass
+
+
+def script_plan(path: str, cache_dir: Optional[str] = None) -> Sequence:
+    """
+    Returns the compiled plan of a script file, from the cache if the \
+same contents were compiled before.
+
+    Parameters:
+        path (str): Path of the script.
+        cache_dir (Optional[str]): Cache directory. If not specified, \
+uses default_cache_dir(); if "", nothing is cached.
+
+    Returns:
+        Sequence: Pipelines of the script.
+    """
+    with open(path) as file:
+        text = file.read()
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+    if not cache_dir:
+        return compile_script(text)
+    plan_path = cache_path(text, cache_dir)
+    plan = load_plan(plan_path)
+    if plan is None:
+        plan = compile_script(text)
+        save_plan(plan, plan_path)
+    return plan
+
+
+def stream_script(
+    path: str,
+    threaded: bool = False,
+    processes: int = 0,
+    optimized: bool = True,
+    cache_dir: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Executes a script file lazily, one pipeline after the other, in a loop \
+rather than by recursion, however many statements it has.
+
+    Parameters:
+        path (str): Path of the script.
+        threaded (bool): Whether to run each call of a pipeline in its \
+own thread.
+        processes (int): Number of worker processes for CPU-bound calls.
+        optimized (bool): Whether pipelines are rewritten by the optimizer.
+        cache_dir (Optional[str]): Cache directory for compiled scripts.
+
+    Returns:
+        Iterator[str]: Output of the script.
+    """
+    from pipeline import stream_plan
+
+    plan = script_plan(path, cache_dir)
+    return stream_plan(plan, threaded, processes, optimized)
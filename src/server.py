@@ -0,0 +1,181 @@
+import array
+import os
+import signal
+import socket
+import socketserver
+import sys
+import traceback
+from client import decode_request, default_socket_path
+from typing import List, Tuple
+
+
+def receive_request(
+    sock: socket.socket,
+) -> Tuple[str, List[str], List[int]]:
+    """
+    Reads a request of the client and the file descriptors sent with it.
+
+    Parameters:
+        sock (socket.socket): Connection to the client.
+
+    Returns:
+        Tuple[str, List[str], List[int]]: Working directory and shell \
+arguments of the client, and its stdin, stdout and stderr.
+
+    Exceptions:
+        ValueError: If the request is incomplete.
+    """
+    fds = array.array("i")
+    data, ancdata, _, _ = sock.recvmsg(
+        1 << 16, socket.CMSG_LEN(3 * fds.itemsize)
+    )
+    for level, kind, payload in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(payload[: len(payload) - len(payload) % 4])
+    while len(data) < 4 or len(data) < 4 + int.from_bytes(data[:4], "big"):
+        chunk = sock.recv(1 << 16)
+        if not chunk:
+            raise ValueError("Incomplete request")
+        data += chunk
+    return (*decode_request(data[4:]), list(fds))
+
+
+def run_session(cwd: str, argv: List[str], fds: List[int]) -> int:
+    """
+    Runs the shell for one request, in a process of its own.
+
+    The client's stdin, stdout and stderr become those of the process, \
+and its working directory is the client's, so a session sees the same \
+as a shell started by the client would.
+
+    Parameters:
+        cwd (str): Client's working directory.
+        argv (List[str]): Shell arguments.
+        fds (List[int]): Client's stdin, stdout and stderr.
+
+    Returns:
+        int: Exit status of the shell.
+    """
+    from shell import run
+
+    for target, fd in enumerate(fds[:3]):
+        os.dup2(fd, target)
+        os.close(fd)
+    sys.stdin = open(0, "r", closefd=False)
+    sys.stdout = open(1, "w", closefd=False)
+    sys.stderr = open(2, "w", buffering=1, closefd=False)
+    try:
+        os.chdir(cwd)
+        run(argv)
+        status = 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            status = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            status = 1
+    except BaseException:
+        traceback.print_exc()
+        status = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    return status
+
+
+class SessionHandler(socketserver.BaseRequestHandler):
+    """
+    Handles a request in the forked process serving it, replying with \
+the exit status once the shell is done.
+    """
+
+    def handle(self) -> None:
+        self.server.socket.close()
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        status = run_session(*receive_request(self.request))
+        self.request.sendall(f"{status}\n".encode())
+
+
+class ShellServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """
+    Shell daemon listening on a Unix socket.
+
+    The parser and every application are loaded once, before the first \
+request. Each request is served by a forked copy of the warm process, \
+so sessions start without imports, and a session changing directory or \
+failing does not affect the others.
+    """
+
+    def server_bind(self) -> None:
+        mask = os.umask(0o077)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(mask)
+
+
+def warm_up() -> None:
+    """
+    Loads the parser and every application, and parses a command line \
+needing ANTLR, so that sessions forked afterwards share them.
+    """
+    from application_registry import registry
+    from parse_cache import tree_cache
+    import optimizer  # noqa: F401
+    import shell  # noqa: F401
+    import visitor  # noqa: F401
+
+    for name in registry:
+        registry.resolve(name)
+    tree_cache.get("echo `echo warm` | cat > /dev/null")
+
+
+def remove_stale_socket(path: str) -> None:
+    """
+    Removes a socket left behind by a daemon that is no longer running.
+
+    Parameters:
+        path (str): Socket path.
+
+    Exceptions:
+        OSError: If a daemon is listening on the socket.
+    """
+    if not os.path.exists(path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)
+            return
+    raise OSError(f"A shell daemon is already listening on {path}")
+
+
+def serve(path: str) -> None:  # pragma: no cover
+    """
+    Runs the shell daemon until it is interrupted or terminated.
+
+    Parameters:
+        path (str): Socket path.
+    """
+    warm_up()
+    remove_stale_socket(path)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    with ShellServer(path, SessionHandler) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    args = sys.argv[1:]
+    if args[:1] == ["--socket"] and len(args) == 2:
+        serve(args[1])
+    elif not args:
+        serve(default_socket_path())
+    else:
+        raise ValueError("Usage: server.py [--socket PATH]")
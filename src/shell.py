@@ -1,10 +1,5 @@
-import io
 import os
 import sys
-import readline
-from antlr.Comp0010ShellLexer import Comp0010ShellLexer
-from antlr.Comp0010ShellParser import Comp0010ShellParser
-from antlr4 import InputStream, CommonTokenStream
 from error import (
     ArgumentError,
     FlagError,
@@ -13,86 +8,219 @@ from error import (
     ApplicationError,
     DirectoryError,
 )
-from typing import List
-from visitor import Visitor
+from compiler import compile_line
+from executor import execute
+from ir import Sequence
+from output_writer import OutputWriter
+from pipeline import stream_plan
+from functools import partial
+from typing import Callable, Iterable, Iterator, List
 
 
-def parse(cmdline: str) -> List[str]:
+def parse(cmdline: str, fast: bool = True) -> List[str]:
     """
     Parses a command line input and returns the execution result.
 
     Parameters:
         cmdline (str): Command line input.
+        fast (bool): Whether simple command lines may skip ANTLR.
 
     Returns:
         List[str]: Output deque.
     """
-    input_stream = InputStream(io.StringIO(cmdline).read())
-    lexer = Comp0010ShellLexer(input_stream)
-    stream = CommonTokenStream(lexer)
-    parser = Comp0010ShellParser(stream)
-    tree = parser.command()
-    visitor = Visitor()
-    visitor.visit(tree)
-    return [item for sublist in visitor.output for item in sublist]
+    return execute(compile_line(cmdline, fast))
 
 
-def catch_error(cmdline: str) -> None:  # pragma: no cover
+def build_plan(cmdline: str) -> Sequence:
     """
-    Catches errors for interactive mode.
+    Compiles a command line input into a sequence of pipelines.
 
     Parameters:
         cmdline (str): Command line input.
+
+    Returns:
+        Sequence: Sequence of pipelines, each a tuple of calls.
+    """
+    return compile_line(cmdline)
+
+
+def stream(
+    cmdline: str,
+    threaded: bool = False,
+    processes: int = 0,
+    optimized: bool = True,
+) -> Iterator[str]:
+    """
+    Parses a command line input and executes it lazily. The calls of a \
+pipeline read each other's output line by line, so nothing is executed \
+until the first line is requested.
+
+    Parameters:
+        cmdline (str): Command line input.
+        threaded (bool): Whether to run each call of a pipeline in its \
+own thread.
+        processes (int): Number of worker processes for CPU-bound calls \
+of a pipeline. If 0, every call runs in this process.
+        optimized (bool): Whether pipelines are rewritten by the optimizer.
+
+    Returns:
+        Iterator[str]: Output lines.
+    """
+    return stream_plan(build_plan(cmdline), threaded, processes, optimized)
+
+
+def explain(cmdline: str) -> Iterator[str]:
+    """
+    Describes the rewrites the optimizer makes to each pipeline of a \
+command line, without executing the pipelines.
+
+    Parameters:
+        cmdline (str): Command line input.
+
+    Returns:
+        Iterator[str]: Pipelines as written, rules applied and pipelines \
+as they would be executed.
     """
-    try:
-        out = parse(cmdline)
-        for result in out:
-            print(result, end="")
-    except (
-        ValueError,
-        ArgumentError,
-        ApplicationError,
-        DirectoryError,
-        FileError,
-        FlagError,
-        RedirectError,
-    ) as e:
-        print(
-            f"The following error has occurred: [{e.__class__.__name__}] {e}"
-        )
-
-
-def interactive_mode() -> None:  # pragma: no cover
+    from optimizer import explain as explain_plan
+
+    return explain_plan(build_plan(cmdline))
+
+
+def catch_error(
+    cmdline: str, execute: Callable[[str], Iterable[str]] = stream
+) -> None:  # pragma: no cover
+    """
+    Catches errors for interactive mode. Output is printed as it is \
+produced, up to the error.
+
+    Parameters:
+        cmdline (str): Command line input.
+        execute (Callable): Executes a command line, returning its output.
+    """
+    with OutputWriter() as writer:
+        try:
+            writer.writelines(execute(cmdline))
+        except (
+            ValueError,
+            ArgumentError,
+            ApplicationError,
+            DirectoryError,
+            FileError,
+            FlagError,
+            RedirectError,
+        ) as e:
+            writer.flush()
+            print(
+                "The following error has occurred: "
+                f"[{e.__class__.__name__}] {e}"
+            )
+
+
+def interactive_mode(
+    execute: Callable[[str], Iterable[str]] = stream
+) -> None:  # pragma: no cover
     """
     Enters the interactive mode.
+
+    Parameters:
+        execute (Callable): Executes a command line, returning its output.
     """
+    import readline
+
     print("Welcome to the Comp0010 Shell! 🐚")
     while True:
         try:
             cmdline = input(os.getcwd() + "> ")
             readline.set_auto_history(True)
             readline.parse_and_bind("tab: complete")
-            catch_error(cmdline)
+            catch_error(cmdline, execute)
         except KeyboardInterrupt:
             print("\nExiting shell. Goodbye! 👋")
             break
 
 
-def run() -> None:  # pragma: no cover
+def run(argv: List[str] = None) -> None:  # pragma: no cover
     """
-    Runs the shell.
+    Runs the shell. Output is printed as it is produced, in large chunks.
+
+    Parameters:
+        argv (List[str]): Command line arguments. If not specified, uses \
+sys.argv.
+
+    A single argument other than an option is the path of a script to \
+be run, with its compiled plan cached by contents.
+
+    Options, given before -c or the script:
+        --threads: Runs each call of a pipeline in its own thread.
+        --processes N: Runs CPU-bound calls of a pipeline on N worker \
+processes.
+        --no-optimize: Runs pipelines as written.
+        --explain: Prints how pipelines would be rewritten instead of \
+running them.
+        --batch FILE: Runs the command lines of FILE, one per line, or of \
+stdin if FILE is -, printing their outcomes as JSON lines.
+        --workers N: Runs the command lines of a batch on N worker \
+processes.
     """
-    args_num = len(sys.argv) - 1
-    if args_num > 0:
-        if args_num != 2:
+    args = sys.argv[1:] if argv is None else list(argv)
+    options = {"threaded": False, "processes": 0, "optimized": True}
+    explaining = False
+    batch = None
+    workers = 0
+    while args and args[0] in (
+        "--threads",
+        "--processes",
+        "--no-optimize",
+        "--explain",
+        "--batch",
+        "--workers",
+    ):
+        option = args.pop(0)
+        if option == "--threads":
+            options["threaded"] = True
+        elif option == "--no-optimize":
+            options["optimized"] = False
+        elif option == "--explain":
+            explaining = True
+        elif option == "--batch":
+            if not args:
+                raise ValueError("--batch expects a file")
+            batch = args.pop(0)
+        else:
+            if not args or not args[0].isdigit():
+                raise ValueError(f"{option} expects a number")
+            if option == "--workers":
+                workers = int(args.pop(0))
+            else:
+                options["processes"] = int(args.pop(0))
+    if batch is not None:
+        if args:
+            raise ValueError("--batch cannot be combined with -c")
+        from batch import run_batch
+
+        with OutputWriter() as writer:
+            if batch == "-":
+                writer.writelines(run_batch(sys.stdin, workers, **options))
+            else:
+                with open(batch) as file:
+                    writer.writelines(run_batch(file, workers, **options))
+        return
+    if len(args) == 1 and not args[0].startswith("-"):
+        from script import stream_script
+
+        with OutputWriter() as writer:
+            writer.writelines(stream_script(args[0], **options))
+        return
+    execute = explain if explaining else partial(stream, **options)
+    if args:
+        if len(args) != 2:
             raise ValueError("Wrong number of command line arguments")
-        if sys.argv[1] != "-c":
-            raise ValueError(f"Unexpected command line argument {sys.argv[1]}")
-        out = parse(sys.argv[2])
-        for result in out:
-            print(result, end="")
+        if args[0] != "-c":
+            raise ValueError(f"Unexpected command line argument {args[0]}")
+        with OutputWriter() as writer:
+            writer.writelines(execute(args[1]))
     else:
-        interactive_mode()
+        interactive_mode(execute)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,70 @@
+import os
+from collections import deque
+from typing import Iterable, List
+
+
+class FileSink:
+    """
+    Output of a call redirected to a file. Applications add lines to it \
+as they would to their output list, and the lines go straight to the file.
+
+    Attributes:
+        file (IO): Target file, opened with a large write buffer.
+
+    Methods:
+        append (str): Writes a line.
+        extend (Iterable[str]): Writes lines as they are produced.
+        close (): Closes the file.
+    """
+
+    def __init__(self, path: str, mode: str) -> None:
+        self.file = open(path, mode, buffering=1 << 16)
+
+    def append(self, line: str) -> None:
+        self.file.write(line)
+
+    def extend(self, lines: Iterable[str]) -> None:
+        self.file.writelines(lines)
+
+    def __iadd__(self, lines: List[str]) -> "FileSink":
+        self.extend(lines)
+        return self
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class NullSink(FileSink):
+    """
+    Output of a call redirected to the null device. Lines are produced \
+and dropped without being stored or written.
+    """
+
+    def __init__(self) -> None:
+        pass
+
+    def append(self, line: str) -> None:
+        pass
+
+    def extend(self, lines: Iterable[str]) -> None:
+        deque(lines, maxlen=0)
+
+    def close(self) -> None:
+        pass
+
+
+def open_sink(path: str, mode: str) -> FileSink:
+    """
+    Opens the target of an output redirection.
+
+    Parameters:
+        path (str): Output file path.
+        mode (str): "w" to truncate the file, "a" to append to it.
+
+    Returns:
+        FileSink: Sink writing to the file, or discarding the lines if \
+the file is the null device.
+    """
+    if os.path.abspath(path) == os.devnull:
+        return NullSink()
+    return FileSink(path, mode)
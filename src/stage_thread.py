@@ -0,0 +1,169 @@
+import threading
+from queue import Empty, Full, Queue
+from typing import Iterable, Iterator, List, Optional
+
+# Marks the end of the output of a stage.
+_DONE = object()
+
+
+class StageThread(threading.Thread):
+    """
+    Runs one stage of a pipeline in its own thread, handing its output to \
+the next stage through a bounded queue.
+
+    Lines are sent in batches of up to batch_size lines. A consumer \
+that has waited latency seconds for a batch takes the lines of the \
+partly filled one instead, so a slow stage, such as one reading from a \
+terminal or stalled on its input, passes every line on as soon as it is \
+produced. Once the queue holds queue_size batches the stage blocks until \
+the consumer catches up.
+
+    Lines are appended to the batch without a lock, since appending, \
+and taking the first lines with a slice and del, are each atomic. The \
+lock is only held while lines are taken, so the consumer cannot take \
+lines ahead of a batch being put in the queue.
+
+    An exception raised by the stage is re-raised in the consumer after \
+the lines produced before it, as if the stage ran in the consumer's \
+thread. If the consumer stops reading early, the stage is stopped too.
+
+    Attributes:
+        lines (Iterable[str]): Output of the stage.
+        queue (Queue): Batches of lines not yet consumed.
+        batch_size (int): Maximum number of lines in a batch.
+        latency (float): Seconds after which a waiting consumer takes \
+the lines of a partly filled batch.
+        batch (List[str]): Lines not yet sent.
+        lock (Lock): Held while lines are taken from the batch.
+        error (Optional[BaseException]): Exception raised by the stage.
+        stopped (threading.Event): Set when the consumer stops reading.
+
+    Methods:
+        run (): Produces the output of the stage into the queue.
+        send (): Puts the lines of the batch in the queue.
+        put (object): Puts an item in the queue unless stopped.
+        drain (): Empties the queue.
+        close (): Stops the stage and releases its consumer.
+    """
+
+    def __init__(
+        self,
+        lines: Iterable[str],
+        queue_size: int = 16,
+        batch_size: int = 256,
+        latency: float = 0.01,
+    ) -> None:
+        super().__init__(daemon=True)
+        self.lines = lines
+        self.queue: Queue = Queue(queue_size)
+        self.batch_size = batch_size
+        self.latency = latency
+        self.batch: List[str] = []
+        self.lock = threading.Lock()
+        self.error: Optional[BaseException] = None
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        batch = self.batch
+        try:
+            for line in self.lines:
+                batch.append(line)
+                if len(batch) >= self.batch_size and not self.send():
+                    return
+            self.send()
+        except BaseException as e:
+            self.send()
+            self.error = e
+        finally:
+            if hasattr(self.lines, "close"):
+                self.lines.close()
+            self.put(_DONE)
+
+    def send(self) -> bool:
+        """
+        Puts the lines of the batch in the queue, if there are any.
+
+        Returns:
+            bool: False if the consumer stopped reading.
+        """
+        with self.lock:
+            lines = self._take()
+            return not lines or self.put(lines)
+
+    def _take(self) -> List[str]:
+        """
+        Takes the lines of the batch. Called with the lock held.
+
+        Returns:
+            List[str]: The lines, in order.
+        """
+        batch = self.batch
+        count = len(batch)
+        lines = batch[:count]
+        del batch[:count]
+        return lines
+
+    def put(self, item: object) -> bool:
+        """
+        Puts an item in the queue, waiting while it is full.
+
+        Parameters:
+            item (object): Batch of lines or the end marker.
+
+        Returns:
+            bool: False if the consumer stopped reading.
+        """
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.05)
+                return True
+            except Full:
+                pass
+        return False
+
+    def __iter__(self) -> Iterator[str]:
+        try:
+            while True:
+                try:
+                    item = self.queue.get(timeout=self.latency)
+                except Empty:
+                    # Without waiting on a stage busy putting a batch,
+                    # which is then found in the queue
+                    if not self.lock.acquire(blocking=False):
+                        continue
+                    try:
+                        if not self.queue.empty():
+                            continue
+                        item = self._take()
+                    finally:
+                        self.lock.release()
+                if item is _DONE:
+                    break
+                yield from item
+        finally:
+            self.stopped.set()
+            self.drain()
+        if self.error is not None:
+            raise self.error
+
+    def drain(self) -> None:
+        """
+        Empties the queue, so a stage blocked on it can see it was stopped.
+        """
+        try:
+            while True:
+                self.queue.get_nowait()
+        except Empty:
+            pass
+
+    def close(self) -> None:
+        """
+        Stops the stage, as when its consumer stops reading, and ends the \
+output seen by a consumer still waiting on the queue.
+        """
+        self.stopped.set()
+        self.drain()
+        try:
+            self.queue.put_nowait(_DONE)
+        except Full:
+            pass
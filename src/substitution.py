@@ -0,0 +1,62 @@
+from compiler import compile_line
+from executor import execute
+from parse_cache import ParseCache, tree_cache
+from typing import Dict
+
+
+class Substitution:
+    """
+    Evaluates backquoted command substitutions.
+
+    Substituted commands are compiled through the same fast path, parse \
+tree cache and visitor class as top-level commands, and executed \
+eagerly. Identical substitutions are only executed once while the \
+arguments of a call are being expanded; the results are forgotten as \
+soon as a call runs, since it may change what the next substitution \
+would print.
+
+    Attributes:
+        visitor_class (type): Visitor used to compile substitutions.
+        cache (ParseCache): Parse tree cache.
+        results (Dict[str, str]): Memoized substitution results.
+
+    Methods:
+        evaluate (str): Returns the output of a substituted command.
+        clear (): Forgets the memoized results.
+    """
+
+    def __init__(
+        self, visitor_class: type, cache: ParseCache = tree_cache
+    ) -> None:
+        self.visitor_class = visitor_class
+        self.cache = cache
+        self.results: Dict[str, str] = {}
+
+    def evaluate(self, cmdline: str) -> str:
+        """
+        Executes a substituted command line.
+
+        Parameters:
+            cmdline (str): Command line between the backquotes.
+
+        Returns:
+            str: Output of the command, with newlines replaced by spaces \
+and trailing whitespace removed.
+        """
+        if cmdline not in self.results:
+            sequence = compile_line(
+                cmdline, cache=self.cache, visitor_class=self.visitor_class
+            )
+            # Calls of the substituted command line expand their own
+            # substitutions with an engine of their own, since expanding
+            # a call clears the memo of its engine
+            nested = Substitution(self.visitor_class, self.cache)
+            output = "".join(execute(sequence, nested))
+            self.results[cmdline] = output.replace("\n", " ").rstrip()
+        return self.results[cmdline]
+
+    def clear(self) -> None:
+        """
+        Forgets the memoized results.
+        """
+        self.results.clear()
@@ -1,5 +1,5 @@
 from application import Application
-from typing import List
+from typing import Iterable, Iterator, List
 
 
 class UnsafeDecorator(Application):
@@ -10,7 +10,9 @@ class UnsafeDecorator(Application):
         wrapped_application (Application): Application to be decorated.
 
     Methods:
-        execute (List[str], List[str]): Executes the application.
+        execute (List[str], List[str], Iterable[str]): Executes the \
+application.
+        stream (List[str], Iterable[str]): Executes the application lazily.
 
     Implements:
         Application: Interface for all applications.
@@ -19,17 +21,38 @@ class UnsafeDecorator(Application):
     def __init__(self, wrapped_application: Application) -> None:
         self.wrapped_application = wrapped_application
 
-    def execute(self, args: List[str], out: List[str]) -> None:
+    def execute(
+        self, args: List[str], out: List[str], stdin: Iterable[str] = None
+    ) -> None:
         """
         Wraps the application in a try except block
 
         Parameters:
             args (List[str]): Arguments to be passed
             out (List[str]): Output for stdout
+            stdin (Iterable[str]): Lines of stdin
         """
         try:
             # Execute the wrapped command
-            self.wrapped_application.execute(args, out)
+            self.wrapped_application.execute(args, out, stdin)
         except Exception as e:
             # Catch any exceptions and print them to out
             out.append(f"An exception occurred: {str(e)}\n")
+
+    def stream(
+        self, args: List[str], stdin: Iterable[str] = None
+    ) -> Iterator[str]:
+        """
+        Wraps the application in a try except block
+
+        Parameters:
+            args (List[str]): Arguments to be passed
+            stdin (Iterable[str]): Lines of stdin
+
+        Returns:
+            (Iterator[str]): Output lines, followed by the exception if any
+        """
+        try:
+            yield from self.wrapped_application.stream(args, stdin)
+        except Exception as e:
+            yield f"An exception occurred: {str(e)}\n"
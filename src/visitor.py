@@ -1,30 +1,19 @@
-import io
-import re
-from antlr4 import ParseTreeVisitor, InputStream, CommonTokenStream
-from antlr.Comp0010ShellLexer import Comp0010ShellLexer
+from antlr4 import ParserRuleContext, ParseTreeVisitor
 from antlr.Comp0010ShellParser import Comp0010ShellParser
-from call import Call
-from collections import deque
-from error import ArgumentError
-from glob import glob
-from typing import List
+from ir import Command, Pipeline, Redirection, Sequence, Word
+from typing import List, Tuple
 
 
 class Visitor(ParseTreeVisitor):
     """
-    Visitor class to traverse the parse tree.
-
-    Attributes:
-        app_list (deque): Application list, commands \
-and arguments to be executed.
-        output (deque): Output array, for storing \
-execution outputs to be passed to stdout.
-        input_io (List[str]): Input file paths.
-        output_io (List[str]): Output file paths.
+    Visitor class to compile the parse tree into IR. Nothing is executed \
+or expanded while visiting, so the same IR can be run any number of times.
 
     Methods:
-        visitCall (CallContext, List[str]): Visits the call node.
+        compile (ParserRuleContext): Compiles a tree into a Sequence.
+        visitCommand (CommandContext): Visits the command node.
         visitPipe (PipeContext): Visits the pipe node.
+        visitCall (CallContext): Visits the call node.
         visitRedirection (RedirectionContext): Visits the redirection node.
         visitArgument (ArgumentContext): Visits the argument node.
         visitQuoted (QuotedContext): Visits the quoted node.
@@ -33,51 +22,88 @@ execution outputs to be passed to stdout.
         ParseTreeVisitor: Visitor class for parse trees.
     """
 
-    def __init__(self) -> None:
-        self.app_list = deque([])
-        self.output = deque([])
-        self.input_io = []
-        self.output_io = []
-
-    def visitCall(
-        self, ctx: Comp0010ShellParser.CallContext, pipe=None
-    ) -> None:
+    def compile(self, tree: ParserRuleContext) -> Sequence:
         """
-        Visits Call Node
-            - Visits all children
-            - Executes the commands and arguments left by children
+        Compiles a parse tree.
 
         Parameters:
-            ctx (CallContext): Call node context object
+            tree (ParserRuleContext): Root of the parse tree.
+
+        Returns:
+            Sequence: Compiled command line.
         """
-        self.app_list.append([])
-        self.output.append([])
-        self.visitChildren(ctx)
+        return Sequence(Pipeline(calls) for calls in self.pipelines(tree))
 
-        if pipe:
-            pipe = io.StringIO("".join(pipe))
+    def pipelines(self, ctx: ParserRuleContext) -> List[List[Command]]:
+        """
+        Compiles a command, pipe or call node into pipelines.
 
-        Call(
-            self.app_list.pop(),
-            self.input_io,
-            self.output_io,
-            self.output,
-            pipe,
-        )
+        Parameters:
+            ctx (ParserRuleContext): Command, pipe or call node.
 
-    def visitPipe(self, ctx: Comp0010ShellParser.PipeContext) -> None:
+        Returns:
+            List[List[Command]]: Sequence of pipelines.
+        """
+        result = self.visit(ctx)
+        return [[result]] if isinstance(result, Command) else result
+
+    def visitCommand(
+        self, ctx: Comp0010ShellParser.CommandContext
+    ) -> List[List[Command]]:
+        """
+        Visits Command Node
+
+        Parameters:
+            ctx (CommandContext): Command node context object
+        """
+        plan = []
+        for child in ctx.getChildren():
+            if isinstance(child, ParserRuleContext):
+                plan.extend(self.pipelines(child))
+        return plan
+
+    def visitPipe(
+        self, ctx: Comp0010ShellParser.PipeContext
+    ) -> List[List[Command]]:
         """
         Visits Pipe Node
+            - A pipe node holds calls, or nested pipes and commands, \
+each piped into the last pipeline of the nodes before it
 
         Parameters:
             ctx (PipeContext): Pipe node context object
         """
-        self.visit(ctx.getChild(0))
-        self.visitCall(ctx.getChild(2), self.output.pop())
+        plan = []
+        for child in ctx.getChildren():
+            if isinstance(child, ParserRuleContext):
+                pipelines = self.pipelines(child)
+                if plan:
+                    plan[-1].extend(pipelines.pop(0))
+                plan.extend(pipelines)
+        return plan
+
+    def visitCall(self, ctx: Comp0010ShellParser.CallContext) -> Command:
+        """
+        Visits Call Node
+            - Visits all children
+            - Collects the arguments and redirections left by children
+
+        Parameters:
+            ctx (CallContext): Call node context object
+        """
+        words, redirections = [], []
+        for child in ctx.getChildren():
+            if isinstance(child, ParserRuleContext):
+                node = self.visit(child)
+                if isinstance(node, Word):
+                    words.append(node)
+                else:
+                    redirections.append(node)
+        return Command(tuple(words), tuple(redirections))
 
     def visitRedirection(
         self, ctx: Comp0010ShellParser.RedirectionContext
-    ) -> None:
+    ) -> Redirection:
         """
         Visits Redirection Node
 
@@ -87,89 +113,38 @@ execution outputs to be passed to stdout.
         index = 2
         if ctx.getChildCount() == 2:
             index = 1
-        if ctx.getChild(0).getText() == "<":
-            self.input_io.append(ctx.getChild(index).getText())
-        elif ctx.getChild(0).getText() == ">":
-            self.output_io.append([ctx.getChild(index).getText(), "w"])
-        else:
-            self.output_io.append([ctx.getChild(index).getText(), "a"])
+        return Redirection(
+            ctx.getChild(0).getText(), ctx.getChild(index).getText()
+        )
 
-    def visitArgument(self, ctx: Comp0010ShellParser.ArgumentContext) -> None:
+    def visitArgument(self, ctx: Comp0010ShellParser.ArgumentContext) -> Word:
         """
         Visits Argument Node
 
         Parameters:
             ctx (ArgumentContext): Argument node context object
         """
-        children = ctx.getChildren()
-
-        argument = [""]
-        globbing = []
-
-        for child in children:
+        parts = []
+        for child in ctx.getChildren():
             if isinstance(child, Comp0010ShellParser.QuotedContext):
-                sub_arg = self.visit(child)
-                if sub_arg:
-                    argument[-1] += sub_arg.pop(0)
-                    argument.extend(sub_arg)
+                parts.append(self.visit(child))
             else:
-                argument[-1] += child.getText()
-                if "*" in child.getText():
-                    globbing.append(len(argument) - 1)
-
-        if globbing:
-            globbing = list(set(globbing))
-            for i in globbing:
-                globbed = glob(argument[i])
-                if globbed:
-                    argument = argument[:i] + globbed + argument[i + 1:]
-                else:
-                    raise ArgumentError(f"No matches found - {argument[i]}")
-
-        self.app_list[-1].extend(argument)
-        return
+                parts.append(("unquoted", child.getText()))
+        return Word(tuple(parts))
 
-    def visitQuoted(self, ctx: Comp0010ShellParser.QuotedContext) -> List[str]:
+    def visitQuoted(
+        self, ctx: Comp0010ShellParser.QuotedContext
+    ) -> Tuple[str, str]:
         """
         Visits Quoted Node
 
         Parameters:
             ctx (QuotedContext): Quoted node context object
         """
-
-        def reparse(text, output):
-            input_stream = InputStream(io.StringIO(text).read())
-            lexer = Comp0010ShellLexer(input_stream)
-            stream = CommonTokenStream(lexer)
-            parser = Comp0010ShellParser(stream)
-            tree = parser.command()
-            visitor = Visitor()
-            visitor.visit(tree)
-            for i in visitor.output:
-                output.extend(i)
-
-        quote = ctx.getText()
-
         if ctx.SINGLE_QUOTED():
-            return [quote[1:-1]]
-
+            kind = "single"
         elif ctx.DOUBLE_QUOTED():
-            output = re.finditer('[^\\"`]+|`([^`]*)`', ctx.getText())
-            quote = []
-            for sub_string in output:
-                if sub_string.group(1):
-                    output = []
-                    reparse(sub_string.group(1), output)
-                    output = "".join(output).replace("\n", " ").rstrip()
-                    quote.append(output)
-                else:
-                    quote.append(sub_string.group(0))
-            return ["".join(quote)]
-
+            kind = "double"
         else:
-            output = []
-            reparse(quote[1:-1], output)
-            output = "".join(output).replace("\n", " ").rstrip().split(" ")
-            while "" in output:
-                output.remove("")
-            return output
+            kind = "back"
+        return kind, ctx.getText()[1:-1]
@@ -0,0 +1,55 @@
+import os
+from typing import Iterator, List
+
+
+def walk_files(root: str) -> Iterator[str]:
+    """
+    Yields the paths of the regular files in a directory tree, depth \
+first, with the entries of every directory in order of name.
+
+    Directories are listed with os.scandir, whose entries already know \
+their type, so no file is stat-ed on its own, and the tree is walked \
+with a stack rather than by recursion, however deep it is. As in find \
+and ls, names starting with "." are ignored. Symbolic links are not \
+followed, so the walk never loops. Directories that cannot be read are \
+skipped.
+
+    Parameters:
+        root (str): Directory to be walked. Paths start with it.
+
+    Returns:
+        Iterator[str]: Paths of the files.
+    """
+    stack: List[Iterator[os.DirEntry]] = []
+    entries = scan(root)
+    while True:
+        entry = next(entries, None)
+        if entry is None:
+            if not stack:
+                return
+            entries = stack.pop()
+        elif entry.is_dir(follow_symlinks=False):
+            stack.append(entries)
+            entries = scan(entry.path)
+        elif entry.is_file(follow_symlinks=False):
+            yield entry.path
+
+
+def scan(directory: str) -> Iterator[os.DirEntry]:
+    """
+    Lists the entries of a directory not starting with ".", by name.
+
+    Parameters:
+        directory (str): Directory to be listed.
+
+    Returns:
+        Iterator[os.DirEntry]: Entries of the directory, none if it \
+cannot be read.
+    """
+    try:
+        with os.scandir(directory) as scanned:
+            entries = [e for e in scanned if not e.name.startswith(".")]
+    except OSError:
+        return iter(())
+    entries.sort(key=lambda entry: entry.name)
+    return iter(entries)
@@ -1,4 +1,5 @@
 import tempfile
+import itertools
 import unittest
 from hypothesis import given, strategies as st
 from unittest.mock import patch
@@ -144,3 +145,11 @@ class TestCat(unittest.TestCase):
         Cat().execute([self.test_file[0], self.test_file[1]], out)
         self.assertLessEqual(expected_output, len("".join(out)))
         self.teardown()
+
+    def test_cat_stream(self):
+        out = Cat().stream([], ["AAA\n", "BBB"])
+        self.assertEqual(["AAA\n", "BBB\n"], list(out))
+
+    def test_cat_stream_lazy(self):
+        out = Cat().stream([], itertools.repeat("AAA\n"))
+        self.assertEqual(["AAA\n"] * 3, list(itertools.islice(out, 3)))
@@ -155,3 +155,7 @@ class TestCut(unittest.TestCase):
         )
         self.assertEqual(out[0][:-1], "".join(sorted(out[0][:-1])))
         self.teardown()
+
+    def test_cut_stream(self):
+        out = Cut().stream(["-b", "1,3"], ["abc\n", "def\n"])
+        self.assertEqual(["ac\n", "df\n"], list(out))
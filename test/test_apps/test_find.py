@@ -3,6 +3,7 @@ import unittest
 from pathlib import Path
 import os
 from apps.find import Find
+from unittest.mock import patch
 from error import ArgumentError, FlagError, DirectoryError
 
 
@@ -133,3 +134,11 @@ class TestFind(unittest.TestCase):
         with self.assertRaises(FlagError):
             Find().execute(["./", "-name"], out)
         self.teardown()
+
+    def test_find_stream(self):
+        self.setup([["a.txt"], ["a.txt"]])
+        with patch("apps.find.listdir", wraps=os.listdir) as listdir:
+            out = Find().stream(["-name", "a.txt"])
+            self.assertTrue(next(out).endswith("/a.txt\n"))
+            self.assertEqual(2, listdir.call_count)
+        self.teardown()
@@ -1,10 +1,16 @@
+import itertools
 import os
+import re
 import tempfile
 import unittest
 from pathlib import Path
-from apps.grep import Grep
+from aho_corasick import Automaton
+from apps.grep import Grep, fixed_cache, search_chunk
+from parameterized import parameterized
+from pattern_cache import pattern_cache
+from process_stage import map_ordered
 from unittest.mock import patch
-from error import ArgumentError, FileError
+from error import ArgumentError, FileError, FlagError
 
 
 class TestGrep(unittest.TestCase):
@@ -163,3 +169,499 @@ class TestGrep(unittest.TestCase):
         with self.assertRaises(ArgumentError):
             Grep().execute(["[*", self.test_file[0]], out)
         self.teardown()
+
+    def test_grep_stream(self):
+        lines = itertools.cycle(["AAA\n", "BBB\n"])
+        out = Grep().stream(["B"], lines)
+        self.assertEqual(["BBB\n"] * 2, list(itertools.islice(out, 2)))
+
+    def test_grep_max_count_stdin(self):
+        lines = itertools.cycle(["AAA\n", "BBB\n"])
+        out = []
+        Grep().execute(["-m", "2", "B"], out, lines)
+        self.assertEqual(["BBB\n"] * 2, out)
+
+    def test_grep_max_count_files(self):
+        out = self.setup(["AAA\nABB\nACC\n", "AAA\nABB\n"])
+        Grep().execute(
+            ["-m", "2", "A", self.test_file[0], self.test_file[1]], out
+        )
+        expected_output = [
+            self.test_file[0] + ":AAA\n",
+            self.test_file[0] + ":ABB\n",
+            self.test_file[1] + ":AAA\n",
+            self.test_file[1] + ":ABB\n",
+        ]
+        self.assertEqual(expected_output, out)
+        self.teardown()
+
+    def test_grep_max_count_zero(self):
+        out = self.setup(["AAA\n"])
+        Grep().execute(["-m", "0", "A", self.test_file[0]], out)
+        self.assertEqual([], out)
+        self.teardown()
+
+    def test_grep_max_count_invalid(self):
+        with self.assertRaises(ArgumentError):
+            Grep().execute(["-m", "x", "A"], [], ["AAA\n"])
+
+    def test_grep_max_count_combiner(self):
+        self.assertIsNotNone(Grep().combiner(["A"]))
+        self.assertIsNone(Grep().combiner(["-m", "1", "A"]))
+
+    def test_grep_invert(self):
+        out = Grep().stream(["-v", "A"], ["AAA\n", "BBB\n", "CAA\n"])
+        self.assertEqual(["BBB\n", "CAA\n"], list(out))
+
+    def test_grep_ignore_case(self):
+        out = Grep().stream(["-i", "a"], ["AAA\n", "BBB\n", "aBB\n"])
+        self.assertEqual(["AAA\n", "aBB\n"], list(out))
+
+    def test_grep_count(self):
+        out = Grep().stream(["-c", "A"], ["AAA\n", "BBB\n", "ABB\n"])
+        self.assertEqual(["2\n"], list(out))
+
+    def test_grep_count_invert_files(self):
+        out = self.setup(["AAA\nBBB\n", "CCC\nDDD\n"])
+        Grep().execute(["-vc", "A", *self.test_file], out)
+        expected_output = [
+            self.test_file[0] + ":1\n",
+            self.test_file[1] + ":2\n",
+        ]
+        self.assertEqual(expected_output, out)
+        self.teardown()
+
+    def test_grep_count_max_count(self):
+        lines = itertools.cycle(["AAA\n", "BBB\n"])
+        out = Grep().stream(["-c", "-m", "3", "B"], lines)
+        self.assertEqual(["3\n"], list(out))
+
+    def test_grep_files_with_matches(self):
+        out = self.setup(["AAA\n", "BBB\n", "BBB\nAAA\n"])
+        Grep().execute(["-l", "A", *self.test_file], out)
+        expected_output = [self.test_file[0] + "\n", self.test_file[2] + "\n"]
+        self.assertEqual(expected_output, out)
+        self.teardown()
+
+    def test_grep_files_with_matches_single_file(self):
+        out = self.setup(["AAA\n"])
+        Grep().execute(["-l", "A", self.test_file[0]], out)
+        self.assertEqual([self.test_file[0] + "\n"], out)
+        self.teardown()
+
+    def test_grep_files_with_matches_stdin(self):
+        lines = itertools.cycle(["AAA\n", "BBB\n"])
+        out = Grep().stream(["-l", "B"], lines)
+        self.assertEqual(["(standard input)\n"], list(out))
+
+    def test_grep_line_number(self):
+        out = Grep().stream(["-n", "B"], ["AAA\n", "BBB\n", "BCC\n"])
+        self.assertEqual(["2:BBB\n", "3:BCC\n"], list(out))
+
+    def test_grep_line_number_files(self):
+        out = self.setup(["AAA\nBBB", "BBB\n"])
+        Grep().execute(["-n", "B", *self.test_file], out)
+        expected_output = [
+            self.test_file[0] + ":2:BBB\n",
+            self.test_file[1] + ":1:BBB\n",
+        ]
+        self.assertEqual(expected_output, out)
+        self.teardown()
+
+    def test_grep_no_eol_files(self):
+        out = self.setup(["AAA", "ABB\n"])
+        Grep().execute(["A", *self.test_file], out)
+        expected_output = [
+            self.test_file[0] + ":AAA\n",
+            self.test_file[1] + ":ABB\n",
+        ]
+        self.assertEqual(expected_output, out)
+        self.teardown()
+
+    @parameterized.expand(
+        [
+            (["-vn", "A"], ["2:BBB\n", "4:CCC\n"]),
+            (["-n", "-v", "-m1", "A"], ["2:BBB\n"]),
+            (["-vm", "1", "A"], ["BBB\n"]),
+            (["-in", "b"], ["2:BBB\n"]),
+            (["--", "A"], ["AAA\n", "ABB\n"]),
+            (["-v", "--", "-"], ["AAA\n", "BBB\n", "ABB\n", "CCC\n"]),
+            (["-c", "-m", "0", "A"], ["0\n"]),
+            (["-cn", "A"], ["2\n"]),
+            (["-ln", "B"], ["(standard input)\n"]),
+            (["-lc", "D"], []),
+            (["-F", "B"], ["BBB\n", "ABB\n"]),
+            (["-F", "A.A"], []),
+            (["-Fi", "bb"], ["BBB\n", "ABB\n"]),
+            (["-F", "CC\nAA"], ["AAA\n", "CCC\n"]),
+            (["-vF", "B"], ["AAA\n", "CCC\n"]),
+            (["-Fn", ""], ["1:AAA\n", "2:BBB\n", "3:ABB\n", "4:CCC\n"]),
+        ]
+    )
+    def test_grep_flags(self, args, expected_output):
+        lines = ["AAA\n", "BBB\n", "ABB\n", "CCC\n"]
+        self.assertEqual(expected_output, list(Grep().stream(args, lines)))
+
+    @parameterized.expand([(["-x", "A"],), (["-vq", "A"],)])
+    def test_grep_invalid_flag(self, args):
+        with self.assertRaises(FlagError):
+            Grep().execute(args, [], ["AAA\n"])
+
+    @parameterized.expand(
+        [(["-m"],), (["-v", "-m"],), (["-v"],), (["-f"],), (["-F"],)]
+    )
+    def test_grep_missing_arguments(self, args):
+        with self.assertRaises(ArgumentError):
+            Grep().execute(args, [], ["AAA\n"])
+
+    @parameterized.expand(
+        [
+            (["-f"], "B\nC+\n", ["BBB\n", "CCC\n"]),
+            (["-Ff"], "B\nC+\n", ["BBB\n", "ABB\n"]),
+            (["-iFf"], "bb\n", ["BBB\n", "ABB\n"]),
+            (["-cf"], "A\n", ["2\n"]),
+            (["-f"], "", []),
+            (["-vFf"], "", ["AAA\n", "BBB\n", "ABB\n", "CCC\n"]),
+        ]
+    )
+    def test_grep_pattern_file(self, flags, patterns, expected_output):
+        self.setup([patterns, "AAA\nBBB\nABB\nCCC\n"])
+        out = []
+        Grep().execute(flags + self.test_file, out)
+        self.assertEqual(expected_output, out)
+        lines = ["AAA\n", "BBB\n", "ABB\n", "CCC\n"]
+        out = Grep().stream(flags + ["test-0.txt"], lines)
+        self.assertEqual(expected_output, list(out))
+        self.teardown()
+
+    def test_grep_pattern_file_groups(self):
+        # Each pattern keeps its own groups, so \\1 is the (a) before it
+        self.setup(["(b)\n(a)\\1\n(?i)c\nd+\n", "aa\nbx\nC\nab\nddd\n"])
+        expected = ["aa\n", "bx\n", "C\n", "ddd\n"]
+        args = ["-f", self.test_file[0], self.test_file[1]]
+        out = []
+        Grep().execute(args, out)
+        self.assertEqual(expected, out)
+        stdin = ["aa\n", "bx\n", "C\n", "ab\n", "ddd\n"]
+        self.assertEqual(expected, list(Grep().stream(args[:2], stdin)))
+        options, rest = Grep.parse_arguments(args)
+        pattern, options, _ = Grep.pattern(options, rest)
+        size = os.path.getsize(self.test_file[1])
+        chunk = search_chunk(self.test_file[1], 0, size, pattern, options)
+        self.assertEqual((5, 4, expected), chunk)
+        self.teardown()
+
+    def test_grep_pattern_file_missing(self):
+        with self.assertRaises(FileError):
+            Grep().execute(["-f", "missing.txt"], [], ["AAA\n"])
+
+    @patch("apps.grep.AUTOMATON_MIN_STRINGS", 3)
+    def test_grep_fixed_strings_automaton(self):
+        lines = ["AAA\n", "BxB\n", "CCC\n", "DyD\n"]
+        with patch("apps.grep.Automaton", wraps=Automaton) as mock:
+            for _ in range(3):
+                out = Grep().stream(["-F", "x\ny\nz"], lines)
+                self.assertEqual(["BxB\n", "DyD\n"], list(out))
+            out = Grep().stream(["-F", "x\ny"], lines)
+            self.assertEqual(["BxB\n", "DyD\n"], list(out))
+        self.assertEqual(1, mock.call_count)
+
+    @parameterized.expand(
+        [
+            ("xſ", ["XS\n", "xſ\n"]),
+            ("xs", ["XS\n", "xſ\n"]),
+            ("K", ["K\n", "k\n", "K\n"]),
+            ("İ", ["i\n", "İ\n"]),
+            ("ΐ", ["ΐ\n"]),
+        ]
+    )
+    def test_grep_fixed_strings_case_folding(self, pattern, expected):
+        lines = ["XS\n", "xſ\n", "K\n", "k\n", "K\n"]
+        lines += ["i\n", "İ\n", "ΐ\n", "ss\n"]
+        patterns = f"{pattern}\nnone"
+        for threshold in (256, 2):
+            fixed_cache.clear()
+            with patch("apps.grep.AUTOMATON_MIN_STRINGS", threshold):
+                out = Grep().stream(["-iF", patterns], lines)
+                self.assertEqual(expected, list(out))
+        fixed_cache.clear()
+
+    def test_grep_invalid_regex_stdin(self):
+        with self.assertRaises(ArgumentError):
+            Grep().execute(["[*"], [], ["AAA\n"])
+
+    def test_grep_pattern_compiled_once(self):
+        pattern_cache.clear()
+        for _ in range(3):
+            Grep().execute(["-i", "B+"], [], ["AAA\n", "BBB\n"])
+        self.assertEqual((2, 1), pattern_cache.info()[:2])
+
+    def test_grep_file_arguments(self):
+        grep = Grep()
+        self.assertEqual(
+            ["-n", "A", "f"], grep.file_arguments(["-n", "A"], "f")
+        )
+        self.assertIsNone(grep.file_arguments(["-l", "A"], "f"))
+        self.assertIsNone(grep.file_arguments(["-x", "A"], "f"))
+        self.assertIsNone(grep.file_arguments(["["], "f"))
+
+    @parameterized.expand(
+        [
+            (["-v", "A"], True),
+            (["-vi", "A"], True),
+            (["-c", "A"], False),
+            (["-l", "A"], False),
+            (["-n", "A"], False),
+            (["-q", "A"], False),
+            (["-F", "A"], True),
+            (["-f", "patterns.txt"], False),
+        ]
+    )
+    def test_grep_flags_combiner(self, args, combined):
+        self.assertEqual(combined, Grep().combiner(args) is not None)
+
+
+class TestGrepLargeFile(unittest.TestCase):
+    contents = [
+        "INFO a1\nERROR b2\nINFO c3\nerror d4\n" * 40,
+        "ascii\r\nINFO crlf\r\n" * 20 + "INFO \u00e9t\u00e9\nERROR x\n" * 20,
+        "INFO last\nERROR no newline",
+    ]
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.test_dir.name)
+        os.chdir(tempfile.gettempdir())
+        self.test_file = []
+        for i, contents in enumerate(self.contents):
+            self.test_file.append(str(self.temp_path / f"log-{i}.txt"))
+            with open(self.test_file[i], "w", newline="") as f:
+                f.write(contents)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def run_grep(self, args, large, workers=1):
+        with patch.object(Grep, "is_large", return_value=large):
+            with patch("apps.grep.CHUNK_SIZE", 50):
+                with patch("apps.grep.os.cpu_count", return_value=workers):
+                    return list(Grep().stream(args))
+
+    @parameterized.expand(
+        [
+            (["INFO"],),
+            (["-v", "INFO"],),
+            (["-i", "error"],),
+            (["-n", "ERROR"],),
+            (["-vn", "INFO"],),
+            (["-c", "INFO"],),
+            (["-l", "e"],),
+            (["-m", "7", "INFO"],),
+            (["-n", "-m", "3", "E"],),
+            (["-c", "-m", "5", "INFO"],),
+            (["-m", "0", "INFO"],),
+            (["INFO ..t"],),
+            (["INFO \\u00e9"],),
+            (["\\w+\\s"],),
+            (["-F", "RROR"],),
+            (["-Fin", "error\nt\u00e9"],),
+        ]
+    )
+    def test_large_file_matches_lines(self, args):
+        for files in ([0], [1], [2], [0, 1, 2]):
+            call = args + [self.test_file[i] for i in files]
+            expected = self.run_grep(call, False)
+            self.assertEqual(expected, self.run_grep(call, True))
+
+    @parameterized.expand(
+        [
+            ("a\\sb",),
+            ("a\\Sb",),
+            ("a[\\s]b",),
+            ("a\\\\sb",),
+            ("\\w+\\b",),
+            ("a\\W",),
+            ("-v\na\\s",),
+        ]
+    )
+    def test_large_file_character_classes(self, args):
+        # \x1c to \x1f are whitespace in str patterns only
+        with open(self.test_file[0], "w") as f:
+            f.write("a\x1fb\na b\naxb\na\x1cb!\na\\sb\n" * 10)
+        args = args.split("\n")
+        call = args + [self.test_file[0]]
+        expected = self.run_grep(call, False)
+        self.assertTrue(expected)
+        self.assertEqual(expected, self.run_grep(call, True))
+        with open(self.test_file[0]) as f:
+            self.assertEqual(expected, list(Grep().stream(args, f)))
+
+    @parameterized.expand(
+        [
+            (["ERROR"],),
+            (["-n", ".*e.*a"],),
+            (["-ic", ".*error"],),
+            (["-n", "-m", "2", ".*R+OR"],),
+            (["-l", ".*t\u00e9"],),
+            (["-in", ".*CRLF$"],),
+        ]
+    )
+    def test_literal_filter_matches_lines(self, args):
+        for files in ([0], [1], [2], [0, 1, 2]):
+            call = args + [self.test_file[i] for i in files]
+            with patch.object(Grep, "prefilter", return_value=None):
+                expected = self.run_grep(call, False)
+            self.assertEqual(expected, self.run_grep(call, False))
+            self.assertEqual(expected, self.run_grep(call, True))
+            with open(self.test_file[files[0]]) as f:
+                stdin = f.readlines()
+            with patch.object(Grep, "prefilter", return_value=None):
+                expected = list(Grep().stream(args, stdin))
+            self.assertEqual(expected, list(Grep().stream(args, stdin)))
+
+    @parameterized.expand([("x\u017f",), ("\u212a",), ("K",)])
+    def test_literal_filter_case_folding(self, pattern):
+        # The long s folds to s, and the Kelvin sign to k, in re
+        with open(self.test_file[0], "w") as f:
+            f.write("xs one\nXS two\nk three\nno\n")
+        with open(self.test_file[0]) as f:
+            stdin = f.readlines()
+        expected = [line for line in stdin if re.match(pattern, line, re.I)]
+        self.assertTrue(expected)
+        self.assertEqual(
+            expected, list(Grep().stream(["-i", pattern], stdin))
+        )
+        self.assertEqual(
+            expected, self.run_grep(["-i", pattern, self.test_file[0]], False)
+        )
+        self.assertEqual(
+            expected, self.run_grep(["-i", pattern, self.test_file[0]], True)
+        )
+
+    def test_large_file_workers(self):
+        os.chdir(tempfile.gettempdir())
+        for file in self.test_file:
+            call = ["-n", "E", file]
+            expected = self.run_grep(call, False)
+            self.assertEqual(expected, self.run_grep(call, True, 2))
+
+    def test_large_file_stops_early(self):
+        with patch("apps.grep.search_chunk", wraps=search_chunk) as mock:
+            out = self.run_grep(["-l", "INFO", self.test_file[0]], True)
+        self.assertEqual([self.test_file[0] + "\n"], out)
+        self.assertEqual(1, mock.call_count)
+
+    @patch("apps.grep.os.cpu_count", return_value=4)
+    def test_large_file_threshold(self, _):
+        with open(self.test_file[0]) as f:
+            self.assertFalse(Grep.is_large(f))
+            with patch("apps.grep.LARGE_FILE_SIZE", 1):
+                self.assertTrue(Grep.is_large(f))
+                with patch("apps.grep.os.cpu_count", return_value=1):
+                    self.assertFalse(Grep.is_large(f))
+        with open(self.test_file[0], encoding="latin-1") as f:
+            with patch("apps.grep.LARGE_FILE_SIZE", 1):
+                self.assertFalse(Grep.is_large(f))
+
+
+class TestGrepRecursive(unittest.TestCase):
+    files = {
+        "a.txt": "INFO a\nERROR a\n",
+        "b/c.txt": "ERROR c\n",
+        "b/d/e.log": "INFO e\nERROR e",
+        "b/.hidden.txt": "ERROR hidden\n",
+        ".git/f.txt": "ERROR git\n",
+        "z.txt": "ERROR z\n",
+    }
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.test_dir.name)
+        os.chdir(self.test_dir.name)
+        for name, contents in self.files.items():
+            path = self.temp_path / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(contents)
+        (self.temp_path / "b" / "bin.dat").write_bytes(b"ERROR\0\x01\n")
+        (self.temp_path / "b" / "latin.txt").write_bytes(b"ERROR \xe9\n")
+
+    def tearDown(self):
+        os.chdir(tempfile.gettempdir())
+        self.test_dir.cleanup()
+
+    def run_grep(self, args, workers=1, stdin=None):
+        with patch("apps.grep.os.cpu_count", return_value=workers):
+            with patch("apps.grep.FILES_PER_BATCH", 2):
+                with patch("apps.grep.PARALLEL_MIN_FILES", 2):
+                    return list(Grep().stream(args, stdin))
+
+    def test_recursive(self):
+        self.assertEqual(
+            [
+                "./a.txt:ERROR a\n",
+                "./b/c.txt:ERROR c\n",
+                "./b/d/e.log:ERROR e\n",
+                "./b/latin.txt:ERROR \ufffd\n",
+                "./z.txt:ERROR z\n",
+            ],
+            self.run_grep(["-r", "ERROR", "."]),
+        )
+
+    def test_recursive_current_directory(self):
+        self.assertEqual(
+            ["a.txt:INFO a\n", "b/d/e.log:INFO e\n"],
+            self.run_grep(["-r", "INFO"], stdin=["INFO stdin\n"]),
+        )
+
+    @parameterized.expand(
+        [
+            (["-rn", "ERROR", "b", "a.txt"],),
+            (["-rl", "INFO", "."],),
+            (["-rc", "E", "b"],),
+            (["-rv", "ERROR", "b/d"],),
+            (["-r", "-m", "1", "E"],),
+            (["-r", "ERROR", "a.txt"],),
+            (["ERROR", "a.txt", "z.txt", "b/c.txt"],),
+            (["-rF", "RROR", "b"],),
+        ]
+    )
+    def test_recursive_workers(self, args):
+        expected = self.run_grep(args)
+        self.assertTrue(expected)
+        self.assertEqual(expected, self.run_grep(args, 2))
+
+    @parameterized.expand(
+        [
+            ({"PARALLEL_MIN_FILES": 4096}, False),
+            ({"PARALLEL_MIN_FILES": 3}, True),
+            ({"PARALLEL_MIN_FILES": 4}, False),
+            ({"PARALLEL_MIN_SIZE": 30}, True),
+            ({"PARALLEL_MIN_SIZE": 80}, False),
+        ]
+    )
+    def test_workers_only_for_enough_work(self, thresholds, parallel):
+        args = ["ERROR", "a.txt", "z.txt", "b/c.txt"]
+        with patch.multiple("apps.grep", **thresholds), patch(
+            "apps.grep.map_ordered", wraps=map_ordered
+        ) as mock, patch("apps.grep.os.cpu_count", return_value=2):
+            out = list(Grep().stream(args))
+        self.assertEqual(parallel, mock.called)
+        self.assertEqual(self.run_grep(args), out)
+
+    def test_recursive_single_file(self):
+        out = self.run_grep(["-r", "ERROR", "a.txt"])
+        self.assertEqual(["ERROR a\n"], out)
+
+    @parameterized.expand([(1,), (2,)])
+    def test_missing_file_after_output(self, workers):
+        with patch("apps.grep.os.cpu_count", return_value=workers), patch(
+            "apps.grep.PARALLEL_MIN_FILES", 2
+        ):
+            lines = Grep().stream(["ERROR", "a.txt", "missing", "z.txt"])
+            self.assertEqual("a.txt:ERROR a\n", next(lines))
+            with self.assertRaises(FileError):
+                next(lines)
+
+    def test_recursive_no_file_arguments(self):
+        self.assertIsNone(Grep().file_arguments(["-r", "A"], "f"))
+        self.assertIsNone(Grep().combiner(["-r", "A"]))
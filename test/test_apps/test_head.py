@@ -1,3 +1,4 @@
+import itertools
 import tempfile
 import unittest
 from pathlib import Path
@@ -120,3 +121,11 @@ class TestHead(unittest.TestCase):
         Head().execute(["-n", f"{n}", self.test_file[0]], out)
         self.assertLessEqual(len(out), n)
         self.teardown()
+
+    def test_head_stream_lazy(self):
+        out = Head().stream(["-n", "2"], itertools.repeat("AAA\n"))
+        self.assertEqual(["AAA\n", "AAA\n"], list(out))
+
+    def test_head_stream_no_stdin(self):
+        with self.assertRaises(ArgumentError):
+            list(Head().stream(["-n", "0"], []))
@@ -141,3 +141,19 @@ class TestSed(unittest.TestCase):
             with patch("sys.stdin", open(self.test_file[0])):
                 Sed().execute(["ashdahsdhsa"], out)
         self.teardown()
+
+    def test_sed_stream(self):
+        out = Sed().stream(["s/a/b/g"], ["aa\n", "ca"])
+        self.assertEqual(["bb\n", "cb\n"], list(out))
+
+    def test_sed_literal_filter(self):
+        lines = ["ERROR: timeout\n", "INFO: timeout\n", "ERROR\n", "x"]
+        out = Sed().stream(["s/(E.*R): time/\\1 at/"], lines)
+        self.assertEqual(
+            ["ERROR atout\n", "INFO: timeout\n", "ERROR\n", "x\n"],
+            list(out),
+        )
+
+    def test_sed_invalid_pattern(self):
+        with self.assertRaises(ArgumentError):
+            list(Sed().stream(["s/[/x/"], ["a\n"]))
@@ -183,3 +183,8 @@ class TestSort(unittest.TestCase):
         Sort().execute([self.test_file[0]], out)
         self.assertEqual(expected_output, "".join(out))
         self.teardown()
+
+    def test_sort_stdin_argument(self):
+        out = []
+        Sort().execute(["-r"], out, ["AAA\n", "CCC\n", "BBB\n"])
+        self.assertEqual(["CCC\n", "BBB\n", "AAA\n"], out)
@@ -125,3 +125,8 @@ class TestTail(unittest.TestCase):
         Tail().execute(["-n", f"{n}", self.test_file[0]], out)
         self.assertLessEqual(len(out), n)
         self.teardown()
+
+    def test_tail_stdin_argument(self):
+        out = []
+        Tail().execute(["-n", "1"], out, ["AAA\n", "BBB\n"])
+        self.assertEqual(["BBB\n"], out)
@@ -146,3 +146,13 @@ class TestUniq(unittest.TestCase):
         Uniq().execute([self.test_file[0]], out)
         self.assertLessEqual(len(out), len(contents))
         self.teardown()
+
+    def test_uniq_stream(self):
+        out = Uniq().stream(["-i"], ["AAA\n", "aaa\n", "BBB\n", "AAA"])
+        self.assertEqual(["AAA\n", "BBB\n", "AAA\n"], list(out))
+
+    def test_uniq_empty_file(self):
+        out = self.setup([""])
+        Uniq().execute([self.test_file[0]], out)
+        self.assertEqual([], out)
+        self.teardown()
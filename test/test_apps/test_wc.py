@@ -112,3 +112,8 @@ class TestWc(unittest.TestCase):
         Wc().execute(["-w"] + self.test_file, out2)
         self.assertLessEqual("".join(out2), "".join(out))
         self.teardown()
+
+    def test_wc_stdin_argument(self):
+        out = []
+        Wc().execute(["-l"], out, ["a b\n", "c\n"])
+        self.assertEqual(["2\n"], out)
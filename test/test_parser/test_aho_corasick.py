@@ -0,0 +1,88 @@
+import re
+import unittest
+from aho_corasick import Automaton, fold_case
+from hypothesis import given, settings, strategies as st
+
+
+def occurrences(patterns, text):
+    return sorted(
+        (start + len(pattern), pattern)
+        for pattern in set(patterns)
+        for start in range(len(text) - len(pattern) + 1)
+        if text.startswith(pattern, start)
+    )
+
+
+class TestAutomaton(unittest.TestCase):
+    def test_search(self):
+        automaton = Automaton(["he", "she", "his", "hers"])
+        self.assertEqual((4, "she"), automaton.search("ushers"))
+        self.assertEqual((4, "his"), automaton.search("this"))
+        self.assertIsNone(automaton.search("hallo"))
+
+    def test_find_all_overlapping(self):
+        automaton = Automaton(["he", "she", "his", "hers"])
+        self.assertEqual(
+            [(4, "she"), (4, "he"), (6, "hers")],
+            list(automaton.find_all("ushers")),
+        )
+
+    def test_ignore_case(self):
+        automaton = Automaton(["Error"], ignore_case=True)
+        self.assertEqual((5, "Error"), automaton.search("ERROR 1"))
+        self.assertIsNone(Automaton(["Error"]).search("ERROR 1"))
+
+    def test_ignore_case_as_re(self):
+        automaton = Automaton(["x\u017f", "\u212a"], ignore_case=True)
+        self.assertEqual((2, "x\u017f"), automaton.search("XS"))
+        self.assertEqual((3, "\u212a"), automaton.search("\u0130ak"))
+
+    @given(st.characters(), st.characters())
+    @settings(max_examples=500, deadline=None)
+    def test_fold_case_as_re(self, first, second):
+        folded = fold_case(first + second)
+        self.assertEqual(2, len(folded))
+        matches = re.fullmatch(re.escape(first), second, re.IGNORECASE)
+        self.assertEqual(bool(matches), folded[0] == folded[1])
+        self.assertEqual(bool(matches), fold_case(first) == fold_case(second))
+
+    def test_fold_case_pairs(self):
+        chars = "sS\u017fkK\u212aiI\u0130\u0131\u0390\u1fd3"
+        for first in chars:
+            for second in chars:
+                matches = re.fullmatch(first, second, re.IGNORECASE)
+                self.assertEqual(
+                    bool(matches), fold_case(first) == fold_case(second)
+                )
+
+    def test_empty_string(self):
+        automaton = Automaton(["", "b"])
+        self.assertEqual((0, ""), automaton.search("a"))
+        self.assertEqual(
+            [(0, ""), (1, ""), (2, "b"), (2, "")],
+            list(automaton.find_all("ab")),
+        )
+
+    def test_no_patterns(self):
+        automaton = Automaton([])
+        self.assertIsNone(automaton.search("abc"))
+        self.assertEqual(1, len(automaton))
+
+    def test_shared_prefixes(self):
+        self.assertEqual(4, len(Automaton(["ab", "abc", "ab"])))
+
+    @given(
+        st.lists(st.text("abc", max_size=4), max_size=6),
+        st.text("abcd", max_size=20),
+    )
+    @settings(max_examples=200, deadline=None)
+    def test_matches_naive_search(self, patterns, text):
+        automaton = Automaton(patterns)
+        found = occurrences(patterns, text)
+        self.assertEqual(found, sorted(automaton.find_all(text)))
+        first = automaton.search(text)
+        if found:
+            self.assertEqual(found[0][0], first[0])
+            self.assertIn(first, found)
+        else:
+            self.assertIsNone(first)
@@ -0,0 +1,71 @@
+import unittest
+from application_registry import (
+    ApplicationRegistry,
+    LazyApplicationMap,
+    registry,
+)
+from apps.cat import Cat
+from apps.help import Help
+from error import ApplicationError
+from help_decorator import HelpDecorator
+from unsafe_decorator import UnsafeDecorator
+
+
+class TestApplicationRegistry(unittest.TestCase):
+    def test_lazy_map(self):
+        loaded = []
+        application_map = LazyApplicationMap()
+        application_map.add("cat", lambda: loaded.append("cat") or Cat())
+        self.assertIn("cat", application_map)
+        self.assertEqual([], loaded)
+        self.assertIs(application_map["cat"], application_map["cat"])
+        self.assertEqual(["cat"], loaded)
+        with self.assertRaises(KeyError):
+            application_map["ls"]
+
+    def test_resolve_lazily(self):
+        applications = ApplicationRegistry()
+        self.assertEqual({}, applications.applications)
+        self.assertIn("_cat", applications)
+        self.assertEqual({}, applications.applications)
+
+    def test_resolve_helpful(self):
+        application = ApplicationRegistry().resolve("cat")
+        self.assertIsInstance(application, HelpDecorator)
+
+    def test_resolve_unsafe(self):
+        applications = ApplicationRegistry()
+        unsafe = applications.resolve("_cat")
+        self.assertIsInstance(unsafe, UnsafeDecorator)
+        self.assertIs(applications.resolve("cat"), unsafe.wrapped_application)
+        self.assertEqual({"_cat", "cat"}, set(applications.applications))
+
+    def test_resolve_cached(self):
+        applications = ApplicationRegistry()
+        self.assertIs(applications.resolve("ls"), applications.resolve("ls"))
+
+    def test_resolve_help(self):
+        applications = ApplicationRegistry()
+        self.assertIsInstance(applications.resolve("help"), Help)
+        self.assertIsInstance(
+            applications.resolve("_help").wrapped_application, Help
+        )
+
+    def test_resolve_unsupported(self):
+        with self.assertRaises(ApplicationError):
+            ApplicationRegistry().resolve("unsupported")
+        with self.assertRaises(ApplicationError):
+            ApplicationRegistry(unsafe=False).resolve("_cat")
+        with self.assertRaises(ApplicationError):
+            ApplicationRegistry(helpful=False).resolve("help")
+
+    def test_mapping(self):
+        applications = ApplicationRegistry(helpful=False)
+        self.assertEqual(46, len(applications))
+        self.assertEqual(46, len(list(applications)))
+        with self.assertRaises(KeyError):
+            applications["help"]
+
+    def test_shared_registry(self):
+        self.assertIsInstance(registry, ApplicationRegistry)
+        self.assertEqual(48, len(registry))
@@ -0,0 +1,99 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from parameterized import parameterized
+from unittest.mock import patch
+from batch import read_commands, run_batch, run_command, stream_batch
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.test_dir.name)
+        (self.temp_path / "dir").mkdir()
+        (self.temp_path / "a.txt").write_text("b\na\nb\n")
+        os.chdir(self.test_dir.name)
+
+    def tearDown(self):
+        os.chdir(tempfile.gettempdir())
+        self.test_dir.cleanup()
+
+    def test_read_commands(self):
+        lines = ["echo a\n", "\n", "  \n", "echo b\r\n", "echo c"]
+        self.assertEqual(
+            ["echo a", "echo b", "echo c"], list(read_commands(lines))
+        )
+
+    @parameterized.expand(
+        [
+            ("echo `echo a` | cat", 0, "a\n", ""),
+            ("sort a.txt | uniq", 0, "a\nb\n", ""),
+            ("echo a; cat missing.txt; echo b", 1, "a\n", "[FileError] "),
+            ("unknown", 1, "", "[ApplicationError] "),
+            ("cat", 1, "", "[ArgumentError] "),
+            ("exit", 0, "Exiting shell. Goodbye! 👋\n", ""),
+        ]
+    )
+    def test_run_command(self, cmdline, status, stdout, stderr):
+        result = run_command(cmdline, self.test_dir.name)
+        self.assertEqual(
+            (cmdline, status, stdout),
+            (result.command, result.status, result.stdout),
+        )
+        self.assertTrue(result.stderr.startswith(stderr))
+        self.assertEqual(bool(stderr), bool(result.stderr))
+
+    def test_run_command_cwd(self):
+        cwd = os.getcwd()
+        result = run_command("cd dir; pwd", cwd)
+        self.assertEqual(f"{cwd}/dir\n", result.stdout)
+        self.assertEqual(cwd, os.getcwd())
+
+    def test_run_command_stdin(self):
+        with patch("sys.stdin", ["a\n"]):
+            result = run_command("cat", self.test_dir.name)
+        self.assertEqual(1, result.status)
+
+    @parameterized.expand([(0,), (2,)])
+    def test_stream_batch(self, workers):
+        commands = ["cd dir", "pwd", "echo a | cat", "cat x", "uniq a.txt"]
+        results = list(stream_batch(commands * 3, workers, chunk_size=2))
+        self.assertEqual(
+            [
+                (0, ""),
+                (0, f"{os.getcwd()}\n"),
+                (0, "a\n"),
+                (1, ""),
+                (0, "b\na\nb\n"),
+            ]
+            * 3,
+            [(result.status, result.stdout) for result in results],
+        )
+        self.assertEqual(commands * 3, [result.command for result in results])
+
+    def test_run_batch(self):
+        frames = [json.loads(f) for f in run_batch(["echo a\n", "cat x\n"])]
+        self.assertEqual(3, len(frames))
+        del frames[0]["seconds"]
+        self.assertEqual(
+            {
+                "index": 0,
+                "command": "echo a",
+                "status": 0,
+                "stdout": "a\n",
+                "stderr": "",
+            },
+            frames[0],
+        )
+        self.assertEqual((1, 1), (frames[1]["index"], frames[1]["status"]))
+        summary = frames[2]["summary"]
+        self.assertEqual((2, 1), (summary["commands"], summary["failed"]))
+        self.assertGreater(summary["commands_per_second"], 0)
+
+    def test_run_batch_empty(self):
+        frames = [json.loads(frame) for frame in run_batch(["\n"])]
+        self.assertEqual(1, len(frames))
+        summary = frames[0]["summary"]
+        self.assertEqual((0, 0), (summary["commands"], summary["failed"]))
@@ -3,8 +3,11 @@ import unittest
 from pathlib import Path
 from call import Call
 import io
+import sys
+import threading
 from error import RedirectError, ApplicationError
-from hypothesis import given, strategies as st
+from application_factory import ApplicationFactory
+from hypothesis import assume, given, strategies as st
 
 
 class TestVisitor(unittest.TestCase):
@@ -93,7 +96,32 @@ class TestVisitor(unittest.TestCase):
         st.text(min_size=1),
     )
     def test_call_unsupported_hypothesis(self, application):
+        assume(application not in ApplicationFactory().application_map)
         out = self.setup([])
         with self.assertRaises(ApplicationError):
             Call([application], [], [], [out], None)
         self.teardown()
+
+    def test_call_pipe_keeps_stdin(self):
+        out = self.setup([])
+        stdin = sys.stdin
+        Call(["cat"], [], [], [out], io.StringIO("AAA\n"))
+        self.assertIs(stdin, sys.stdin)
+        self.teardown()
+
+    def test_call_concurrent(self):
+        outputs = [[] for _ in range(8)]
+
+        def run(i):
+            for _ in range(50):
+                out = []
+                Call(["sort"], [], [], [out], io.StringIO(f"{i}\n{i}a\n"))
+                outputs[i].append("".join(out))
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for i, out in enumerate(outputs):
+            self.assertEqual([f"{i}\n{i}a\n"] * 50, out)
@@ -0,0 +1,143 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from fast_parser import parse_simple, parse_word
+from hypothesis import given, settings, strategies as st
+from parameterized import parameterized
+import shell
+from shell import parse
+from unittest.mock import patch
+
+
+FILES = {
+    "a.txt": "ccc\naaa\nbbb\naaa\n",
+    "b.txt": "foo\nbar\nfoo\n",
+    "c.log": "first line\nsecond line\n",
+}
+
+TOKENS = [
+    "echo", "cat", "sort", "uniq", "head", "-n", "1", "a.txt", "b.txt",
+    "out.txt", "*.txt", "'x y'", "'*'", " ", "\t", "|", ";", "<", ">", ">>",
+]
+
+
+class TestFastParser(unittest.TestCase):
+    def run_both(self, cmdline):
+        results = []
+        for fast in (True, False):
+            with tempfile.TemporaryDirectory() as test_dir:
+                os.chdir(test_dir)
+                for name, contents in FILES.items():
+                    with open(name, "w") as f:
+                        f.write(contents)
+                try:
+                    with patch("sys.stdin", io.StringIO("")):
+                        out = parse(cmdline, fast=fast)
+                except Exception as e:
+                    out = (e.__class__, str(e))
+                files = {}
+                for name in sorted(os.listdir(".")):
+                    with open(name) as f:
+                        files[name] = f.read()
+                results.append((out, files))
+        return results
+
+    @parameterized.expand(
+        [
+            ("echo foo bar",),
+            ("  echo   foo\tbar  ",),
+            ("cat a.txt b.txt",),
+            ("cat a.txt | sort | uniq",),
+            ("cat a.txt|sort -r|head -n 2",),
+            ("echo foo ; echo bar",),
+            ("echo foo;echo bar | cat",),
+            ("echo foo | cat ; cat b.txt | uniq",),
+            ("echo 'foo   bar' baz",),
+            ("echo foo'bar'baz 'a''b'",),
+            ("echo '*'",),
+            ("echo *.txt",),
+            ("echo *'.txt'",),
+            ("echo *.none",),
+            ("cat < a.txt",),
+            ("cat <a.txt",),
+            ("< a.txt cat",),
+            ("< a.txt sort | head -n 1",),
+            ("echo foo > out.txt",),
+            ("echo foo >out.txt ; cat out.txt",),
+            ("> out.txt echo foo",),
+            ("echo foo >> a.txt ; cat a.txt",),
+            ("echo foo > 'out.txt'",),
+            ("echo foo > a.txt > b.txt",),
+            ("cat < a.txt < b.txt",),
+            ("echo foo | cat < a.txt",),
+            ("cat < missing.txt",),
+            ("cat missing.txt",),
+            ("missing foo",),
+            ("sort a.txt > out.txt | cat",),
+            ("echo foo ; echo bar > out.txt | cat",),
+            ("grep foo b.txt c.log",),
+            ("cat",),
+        ]
+    )
+    def test_differential(self, cmdline):
+        self.assertIsNotNone(parse_simple(cmdline))
+        fast, slow = self.run_both(cmdline)
+        self.assertEqual(slow, fast)
+
+    @parameterized.expand(
+        [
+            ("",),
+            ("   ",),
+            ('echo "foo"',),
+            ("echo `echo foo`",),
+            ("echo 'foo",),
+            ("echo foo\necho bar",),
+            ("echo foo ;",),
+            ("; echo foo",),
+            ("echo foo || cat",),
+            ("echo foo | ",),
+            ("echo foo >",),
+            ("> out.txt",),
+            ("<a.txt>out.txt cat",),
+        ]
+    )
+    def test_fallback(self, cmdline):
+        self.assertIsNone(parse_simple(cmdline))
+
+    def test_parse_word(self):
+        self.assertEqual(("foo bar*", False), parse_word("foo' bar*'"))
+        self.assertEqual(("*.txt", True), parse_word("*'.txt'"))
+
+    def test_parse_simple(self):
+        plan = parse_simple("<a.txt  sort | head >out.txt; echo 'x'")
+        self.assertEqual([2, 1], [len(pipeline) for pipeline in plan])
+        sort, head = plan[0]
+        self.assertEqual([("sort", False)], sort.arguments)
+        self.assertEqual(["a.txt"], sort.input_io)
+        self.assertEqual([["out.txt", "w"]], head.output_io)
+        self.assertEqual([("echo", False), ("x", False)], plan[1][0].arguments)
+
+    @settings(deadline=None, max_examples=200)
+    @given(st.lists(st.sampled_from(TOKENS), min_size=1, max_size=12))
+    def test_differential_hypothesis(self, tokens):
+        cmdline = "".join(tokens)
+        if parse_simple(cmdline) is not None:
+            fast, slow = self.run_both(cmdline)
+            self.assertEqual(slow, fast)
+
+    def test_fast_path_skips_antlr(self):
+        script = (
+            "import sys, shell; shell.parse('echo foo | cat');"
+            "print(sorted(m for m in sys.modules if m.startswith(('antlr', "
+            "'readline', 'apps.'))))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=os.path.dirname(os.path.abspath(shell.__file__)),
+            capture_output=True,
+            text=True,
+        ).stdout
+        self.assertEqual("['apps.cat', 'apps.echo']\n", out)
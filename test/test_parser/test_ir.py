@@ -0,0 +1,140 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from compiler import compile_line
+from error import ArgumentError
+from executor import execute
+from hypothesis import given, settings, strategies as st
+from ir import Command, Pipeline, Redirection, Sequence, Word, from_data
+from parameterized import parameterized
+
+
+TOKENS = [
+    "echo", "cat", "a.txt", "'x y'", '"a `echo b`"', "`echo c`", "*.txt",
+    "'*'", " ", "|", ";", "<", ">", ">>", "o.txt",
+]
+
+
+class TestIR(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.test_dir.name)
+        os.chdir(self.test_dir.name)
+        (self.temp_path / "a.txt").write_text("a\n")
+        (self.temp_path / "b.txt").write_text("b\n")
+
+    def tearDown(self):
+        os.chdir(tempfile.gettempdir())
+        self.test_dir.cleanup()
+
+    def test_compile_words(self):
+        sequence = compile_line("echo 'a b'\"c `echo d`\" `echo e`", False)
+        self.assertEqual(
+            Sequence(
+                [
+                    Pipeline(
+                        [
+                            Command(
+                                (
+                                    Word((("unquoted", "echo"),)),
+                                    Word(
+                                        (
+                                            ("single", "a b"),
+                                            ("double", "c `echo d`"),
+                                        )
+                                    ),
+                                    Word((("back", "echo e"),)),
+                                ),
+                                (),
+                            )
+                        ]
+                    )
+                ]
+            ),
+            sequence,
+        )
+
+    def test_compile_redirections(self):
+        sequence = compile_line("< a.txt cat > o.txt >> p.txt", False)
+        self.assertEqual(
+            (
+                Redirection("<", "a.txt"),
+                Redirection(">", "o.txt"),
+                Redirection(">>", "p.txt"),
+            ),
+            sequence[0][0].redirections,
+        )
+
+    def test_compile_pipelines(self):
+        sequence = compile_line("echo a | cat; echo b | cat | cat", False)
+        self.assertEqual([2, 3], [len(pipeline) for pipeline in sequence])
+        self.assertIsInstance(sequence, Sequence)
+        self.assertIsInstance(sequence[0], Pipeline)
+
+    def test_compile_does_not_execute(self):
+        sequence = compile_line("echo a > o.txt; echo `rmdir d`")
+        os.mkdir("d")
+        self.assertFalse(os.path.exists("o.txt"))
+        self.assertEqual(["\n"], execute(sequence))
+        self.assertTrue(os.path.exists("o.txt"))
+        self.assertFalse(os.path.exists("d"))
+
+    def test_expand(self):
+        command = compile_line("echo '*'.txt *.txt `echo x` < a >> b")[0][0]
+        arguments, input_io, output_io = command.expand()
+        self.assertEqual(["echo", "*.txt"], arguments[:2])
+        self.assertEqual(["a.txt", "b.txt"], sorted(arguments[2:4]))
+        self.assertEqual("x", arguments[4])
+        self.assertEqual((["a"], [["b", "a"]]), (input_io, output_io))
+
+    def test_expand_no_match(self):
+        command = compile_line("echo *.log", False)[0][0]
+        with self.assertRaises(ArgumentError):
+            command.expand()
+
+    def test_execute_again(self):
+        sequence = compile_line("cat *.txt", False)
+        self.assertEqual(["a\n", "b\n"], sorted(execute(sequence)))
+        (self.temp_path / "c.txt").write_text("c\n")
+        self.assertEqual(["a\n", "b\n", "c\n"], sorted(execute(sequence)))
+
+    def test_immutable(self):
+        command = compile_line("echo a")[0][0]
+        with self.assertRaises(AttributeError):
+            command.words = ()
+        with self.assertRaises(AttributeError):
+            compile_line("echo a").extra = 1
+
+    @parameterized.expand([(True,), (False,)])
+    def test_from_data(self, fast):
+        sequence = compile_line("echo 'a'b* | cat < a.txt > o; echo c", fast)
+        self.assertEqual(sequence, from_data(json.loads(json.dumps(sequence))))
+
+    @parameterized.expand([("[[[[1]]]]",), ('[[[[["a"]], []]]]',), ("1",)])
+    def test_from_data_invalid(self, text):
+        with self.assertRaises((TypeError, ValueError)):
+            from_data(json.loads(text))
+
+    @staticmethod
+    def expand_all(sequence):
+        try:
+            return [
+                [command.expand() for command in pipeline]
+                for pipeline in sequence
+            ]
+        except ArgumentError as e:
+            return str(e)
+
+    @given(st.lists(st.sampled_from(TOKENS), min_size=1, max_size=10))
+    @settings(max_examples=100, deadline=None)
+    def test_fast_and_antlr_agree(self, tokens):
+        cmdline = "".join(tokens)
+        try:
+            slow = compile_line(cmdline, False)
+        except Exception:
+            return
+        self.assertEqual(
+            self.expand_all(slow), self.expand_all(compile_line(cmdline))
+        )
@@ -0,0 +1,146 @@
+import io
+import re
+import unittest
+from hypothesis import given, settings, strategies as st
+from literal_filter import (
+    RequiredLiteral,
+    candidate_lines,
+    find_lines,
+    required_literal,
+)
+from parameterized import parameterized
+from unittest.mock import patch
+
+
+ATOMS = [
+    "a",
+    "b",
+    "ab",
+    "\n",
+    ".",
+    "a*",
+    "b+",
+    "(ab)+",
+    "(?:a|bc)",
+    "[ab]",
+    "b?",
+    "a{2}",
+    "x{0,2}",
+    "\\b",
+    "^",
+    "$",
+    "(a)",
+    "(?i:a)",
+    "(?=b)",
+]
+
+
+class TestRequiredLiteral(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ("ERROR.*timeout", "timeout"),
+            ("abc", "abc"),
+            ("a(bc)d", "abcd"),
+            ("^ERROR\\b:", "ERROR:"),
+            ("(ab)+x", "ab"),
+            ("x(abc){2,}", "abc"),
+            ("[ab]cd", "cd"),
+            ("a\\.b", "a.b"),
+            ("a(?i:bcd)e", "a"),
+            ("a|bcd", None),
+            ("x*", None),
+            ("(?:abc)?d", "d"),
+            ("", None),
+            ("(", None),
+        ]
+    )
+    def test_required_literal(self, pattern, text):
+        literal = required_literal(pattern)
+        self.assertEqual(text, literal if literal is None else literal.text)
+
+    def test_ignore_case(self):
+        self.assertEqual(
+            RequiredLiteral("Error", True),
+            required_literal("Error", re.IGNORECASE),
+        )
+        self.assertEqual(
+            RequiredLiteral("Error", True), required_literal("(?i)Error")
+        )
+
+    @given(
+        st.lists(st.sampled_from(ATOMS), min_size=1, max_size=5),
+        st.text("abAB\nx", max_size=12),
+        st.booleans(),
+    )
+    @settings(max_examples=300, deadline=None)
+    def test_every_match_contains_literal(self, atoms, text, ignore_case):
+        pattern = "".join(atoms)
+        flags = re.IGNORECASE if ignore_case else 0
+        literal = required_literal(pattern, flags)
+        if literal is None:
+            return
+        found = literal.finder()(text, 0) != -1
+        if re.search(pattern, text, flags):
+            self.assertTrue(found)
+
+
+class TestFindLines(unittest.TestCase):
+    def test_find_lines(self):
+        text = "a timeout\nb\nc timeout x\nd\ne timeout"
+        self.assertEqual(
+            [(1, "a timeout\n"), (3, "c timeout x\n"), (5, "e timeout")],
+            list(find_lines(text, RequiredLiteral("timeout"))),
+        )
+
+    def test_find_lines_bytes(self):
+        text = b"x\ny ERROR\nz\n"
+        self.assertEqual(
+            [(2, b"y ERROR\n")],
+            list(find_lines(text, RequiredLiteral("ERROR"))),
+        )
+
+    def test_find_lines_ignore_case(self):
+        text = "ÉtÉ Error\nb\nERROR\n"
+        self.assertEqual(
+            [(1, "ÉtÉ Error\n"), (3, "ERROR\n")],
+            list(find_lines(text, RequiredLiteral("error", True))),
+        )
+
+    def test_find_lines_ignore_case_folds_to_ascii(self):
+        text = "xs one\nXS two\nno\n"
+        literal = RequiredLiteral("x\u017f", True)
+        self.assertEqual(
+            [(1, "xs one\n"), (2, "XS two\n")],
+            list(find_lines(text, literal)),
+        )
+        self.assertEqual(
+            [(2, b"XS two\n")],
+            list(find_lines(b"no\nXS two\n", RequiredLiteral("xs", True))),
+        )
+
+    def test_find_lines_twice_in_line(self):
+        text = "ab ab\nab\n"
+        self.assertEqual(
+            [(1, "ab ab\n"), (2, "ab\n")],
+            list(find_lines(text, RequiredLiteral("ab"))),
+        )
+
+    def test_find_lines_across_lines(self):
+        text = "xa\nb\na\n"
+        self.assertEqual(
+            [(1, "xa\n")], list(find_lines(text, RequiredLiteral("a\nb")))
+        )
+
+    @parameterized.expand([(False,), (True,)])
+    def test_candidate_lines(self, ignore_case):
+        lines = ["ERROR x\n", "INFO\n", "error y\n", "\n", "x ERROR"]
+        literal = RequiredLiteral("ERROR", ignore_case)
+        expected = [
+            (number, line)
+            for number, line in enumerate(lines, 1)
+            if re.search("ERROR", line, re.I if ignore_case else 0)
+        ]
+        self.assertEqual(expected, list(candidate_lines(lines, literal)))
+        with patch("literal_filter.BLOCK_SIZE", 3):
+            f = io.StringIO("".join(lines))
+            self.assertEqual(expected, list(candidate_lines(f, literal)))
@@ -0,0 +1,73 @@
+import threading
+import time
+import unittest
+from lru_cache import CacheInfo, LRUCache
+
+
+class SwitchingKey(str):
+    # Lets other threads run whenever the cache hashes the key
+    def __hash__(self):
+        time.sleep(0)
+        return str.__hash__(self)
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_key_parts_passed_to_load(self):
+        cache = LRUCache(2, lambda *key: "".join(key))
+        self.assertEqual("ab", cache.lookup("a", "b"))
+        self.assertEqual("ab", cache.lookup("a", "b"))
+        self.assertEqual(CacheInfo(1, 1, 2, 1), cache.info())
+
+    def test_evicts_least_recently_used(self):
+        loaded = []
+        cache = LRUCache(2, lambda key: loaded.append(key) or key)
+        for key in "abaca":
+            cache.lookup(key)
+        self.assertEqual(["a", "b", "c"], loaded)
+        cache.lookup("b")
+        self.assertEqual(["a", "b", "c", "b"], loaded)
+
+    def test_error_not_cached(self):
+        def load(key):
+            raise KeyError(key)
+
+        cache = LRUCache(2, load)
+        with self.assertRaises(KeyError):
+            cache.lookup("a")
+        self.assertEqual(CacheInfo(0, 1, 2, 0), cache.info())
+
+    def test_disabled(self):
+        cache = LRUCache(0, str.upper)
+        self.assertEqual("A", cache.lookup("a"))
+        self.assertEqual(0, len(cache))
+
+    def test_clear(self):
+        cache = LRUCache(2, str.upper)
+        cache.lookup("a")
+        cache.lookup("a")
+        cache.clear()
+        self.assertEqual(CacheInfo(0, 0, 2, 0), cache.info())
+
+    def test_threads(self):
+        cache = LRUCache(2, str.upper)
+        errors = []
+
+        def lookups(offset):
+            try:
+                for i in range(300):
+                    key = SwitchingKey("abcd"[(i + offset) % 4])
+                    self.assertEqual(key.upper(), cache.lookup(key))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [
+            threading.Thread(target=lookups, args=(i,)) for i in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], errors)
+        info = cache.info()
+        self.assertEqual(1200, info.hits + info.misses)
+        self.assertEqual(2, info.currsize)
@@ -0,0 +1,50 @@
+import tempfile
+import unittest
+from pathlib import Path
+from hypothesis import given, settings, strategies as st
+from parameterized import parameterized
+from mapped_file import chunk_bounds, read_chunk
+
+
+class TestMappedFile(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.test_dir.name) / "file.txt")
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def write(self, data):
+        with open(self.path, "wb") as f:
+            f.write(data)
+
+    @parameterized.expand(
+        [
+            (b"", 4, []),
+            (b"ab\n", 1, [(0, 3)]),
+            (b"ab\ncd\nef", 3, [(0, 3), (3, 6), (6, 8)]),
+            (b"ab\ncd\nef\n", 4, [(0, 6), (6, 9)]),
+            (b"abcdef", 2, [(0, 6)]),
+            (b"\n\n\n", 1, [(0, 1), (1, 2), (2, 3)]),
+        ]
+    )
+    def test_chunk_bounds(self, data, chunk_size, bounds):
+        self.write(data)
+        self.assertEqual(bounds, chunk_bounds(self.path, chunk_size))
+
+    @given(
+        st.lists(st.sampled_from([b"a", b"bc", b"\n", b"\xc3\xa9"])),
+        st.integers(min_value=1, max_value=8),
+    )
+    @settings(max_examples=50, deadline=None)
+    def test_chunks_cover_lines(self, parts, chunk_size):
+        data = b"".join(parts)
+        self.write(data)
+        chunks = [
+            read_chunk(self.path, start, end)
+            for start, end in chunk_bounds(self.path, chunk_size)
+        ]
+        self.assertEqual(data, b"".join(chunks))
+        for chunk in chunks[:-1]:
+            self.assertTrue(chunk.endswith(b"\n"))
+            self.assertGreaterEqual(len(chunk), chunk_size)
@@ -0,0 +1,142 @@
+import tempfile
+import unittest
+from pathlib import Path
+from hypothesis import given, settings, strategies as st
+from parameterized import parameterized
+from unittest.mock import patch
+from optimizer import Step, expand_steps, optimize
+from shell import build_plan, explain, parse, stream
+
+
+class TestOptimizer(unittest.TestCase):
+    def setup(self, contents):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.test_dir.name)
+        self.test_file = []
+        for i in range(len(contents)):
+            self.test_file.append(str(self.temp_path) + f"/test-{i}.txt")
+            with open(self.test_file[i], "w") as f:
+                f.write(contents[i])
+        return []
+
+    def teardown(self):
+        self.test_dir.cleanup()
+
+    @staticmethod
+    def run_cmdline(cmdline, optimized):
+        try:
+            return list(stream(cmdline, optimized=optimized))
+        except Exception as e:
+            return (type(e), str(e))
+
+    def rules(self, cmdline):
+        steps = expand_steps(build_plan(cmdline)[0])
+        return optimize(steps)[1]
+
+    @parameterized.expand(
+        [
+            ("cat {0} | grep b", ["read-file"]),
+            ("cat {0} | grep -m 1 b", ["read-file"]),
+            ("cat {0} | head -n 2", ["read-file"]),
+            ("cat {0} | sort -r", ["read-file"]),
+            ("cat {0} | uniq -i", ["read-file"]),
+            ("cat {0} | sort | uniq", ["read-file", "sort-unique"]),
+            ("sort -r {0} | uniq -i", ["sort-unique"]),
+            ("sort < {0} | uniq", ["sort-unique"]),
+            ("sort {0} | head -n 2", ["sort-top"]),
+            ("sort -r {0} | head", ["sort-top"]),
+            ("cat {0} | grep b | grep B", ["read-file", "grep-all"]),
+            ("grep b {0} {1} | grep 1 | grep b", ["grep-all", "grep-all"]),
+            ("grep z {0} | grep b", ["grep-all"]),
+            ("grep b {0} | grep z | grep b", ["grep-all", "grep-all"]),
+            ("cat {0} | grep '['", []),
+            ("cat {1} | grep b", []),
+            ("cat {2} | grep b", []),
+            ("cat {0} {0} | grep b", []),
+            ("cat {3} | grep b", []),
+            ("cat {0} | cut -b 1", []),
+            ("cat {0} | grep -h", []),
+            ("sort {2} | uniq", ["sort-unique"]),
+            ("sort {2} | head -n 1", ["sort-top"]),
+            ("sort {3} | head -n 1", ["sort-top"]),
+            ("sort {0} | head -n 0", []),
+            ("sort {0} | head -n x", []),
+            ("sort -x {0} | uniq", []),
+            ("sort {0} | uniq {0}", []),
+            ("sort {0} > {4} | uniq", []),
+            ("grep -m 1 b {0} | grep b", []),
+            ("grep b {0} | grep -m 1 b", []),
+            ("cat {0} | grep -vn b", ["read-file"]),
+            ("cat {0} | grep -c b", ["read-file"]),
+            ("cat {0} | grep -l b", []),
+            ("grep -v b {0} | grep a", []),
+            ("grep b {0} | grep -v", []),
+            ("grep b {0} | grep '['", ["grep-all"]),
+            ("echo b | grep b | cat", []),
+        ]
+    )
+    def test_rewrite_matches_pipeline(self, cmdline, rules):
+        self.setup(["b1\na\nB2\nb1\nc\n", "b3\nb1", "", "", ""])
+        self.test_file[3] = str(self.temp_path / "missing.txt")
+        cmdline = cmdline.format(*self.test_file)
+        self.assertEqual(rules, self.rules(cmdline))
+        expected = self.run_cmdline(cmdline, False)
+        self.assertEqual(expected, self.run_cmdline(cmdline, True))
+        if isinstance(expected, list):
+            self.assertEqual(expected, parse(cmdline))
+        self.teardown()
+
+    @given(
+        st.lists(
+            st.sampled_from(
+                ["a\n", "B\n", "b\n", "\n", "c", "a\nb\n", "b\nc"]
+            ),
+            max_size=12,
+        ),
+        st.integers(min_value=1, max_value=8),
+        st.booleans(),
+    )
+    @settings(max_examples=50, deadline=None)
+    def test_sort_rules_hypothesis(self, lines, count, reverse):
+        flag = " -r" if reverse else ""
+        for cmdline in (
+            f"sort{flag} | uniq",
+            f"sort{flag} | uniq -i",
+            f"sort{flag} | head -n {count}",
+        ):
+            outputs = []
+            for optimized in (False, True):
+                with patch("sys.stdin", list(lines)):
+                    outputs.append(self.run_cmdline(cmdline, optimized))
+            self.assertEqual(outputs[0], outputs[1])
+
+    def test_optimize_keeps_redirected_calls(self):
+        steps = [
+            Step([["cat", "a.txt"]], [], [["out.txt", "w"]]),
+            Step([["grep", "a"]], [], []),
+        ]
+        self.assertEqual((steps, []), optimize(steps))
+
+    def test_explain(self):
+        self.setup(["b1\na\n"])
+        out = list(explain(f"cat {self.test_file[0]} | sort | uniq > o.txt"))
+        self.assertEqual(
+            [
+                f"pipeline: cat {self.test_file[0]} | sort | uniq > o.txt\n",
+                "   rules: read-file, sort-unique\n",
+                f"    plan: [sort {self.test_file[0]} | uniq] > o.txt\n",
+            ],
+            out,
+        )
+        self.assertFalse((self.temp_path / "o.txt").exists())
+        self.teardown()
+
+    def test_explain_no_rules(self):
+        self.assertEqual(
+            [
+                "pipeline: echo 'a b'\n",
+                "   rules: -\n",
+                "    plan: echo 'a b'\n",
+            ],
+            list(explain("echo 'a b'")),
+        )
@@ -0,0 +1,79 @@
+import io
+import time
+import unittest
+from unittest.mock import patch
+from output_writer import OutputWriter
+
+
+class TestOutputWriter(unittest.TestCase):
+    def setUp(self):
+        self.binary = io.BytesIO()
+        self.stream = io.TextIOWrapper(self.binary, encoding="utf-8")
+
+    def test_output_writer_holds_lines(self):
+        writer = OutputWriter(self.stream, size=100, interval=60)
+        writer.writelines(["AAA\n", "BBB\n"])
+        self.assertEqual(b"", self.binary.getvalue())
+        writer.flush()
+        self.assertEqual(b"AAA\nBBB\n", self.binary.getvalue())
+
+    def test_output_writer_size(self):
+        writer = OutputWriter(self.stream, size=8, interval=60)
+        writer.writelines(["AAA\n", "BBB\n", "CCC\n"])
+        self.assertEqual(b"AAA\nBBB\n", self.binary.getvalue())
+
+    def test_output_writer_interval(self):
+        writer = OutputWriter(self.stream, size=100, interval=0)
+        writer.write("AAA\n")
+        self.assertEqual(b"AAA\n", self.binary.getvalue())
+
+    def test_output_writer_after_stall(self):
+        stream = io.StringIO()
+        shown = []
+
+        def lines():
+            yield "AAA\n"
+            deadline = time.monotonic() + 5
+            while not stream.getvalue() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            shown.append(stream.getvalue())
+            yield "BBB\n"
+
+        with OutputWriter(stream, size=100, interval=0.05) as writer:
+            writer.writelines(lines())
+        self.assertEqual(["AAA\n"], shown)
+        self.assertEqual("AAA\nBBB\n", stream.getvalue())
+
+    def test_output_writer_background_error(self):
+        stream = io.StringIO()
+        writer = OutputWriter(stream, size=100, interval=0.01)
+        stream.close()
+        writer.write("AAA\n")
+        deadline = time.monotonic() + 5
+        while writer._error is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        with self.assertRaises(ValueError):
+            writer.flush()
+
+    def test_output_writer_context(self):
+        with OutputWriter(self.stream, interval=60) as writer:
+            writer.write("🐚\n")
+        self.assertEqual("🐚\n".encode(), self.binary.getvalue())
+
+    def test_output_writer_after_print(self):
+        with OutputWriter(self.stream, interval=60) as writer:
+            writer.write("BBB\n")
+            print("AAA", file=self.stream)
+        self.assertEqual(b"AAA\nBBB\n", self.binary.getvalue())
+
+    def test_output_writer_text_stream(self):
+        stream = io.StringIO()
+        with OutputWriter(stream) as writer:
+            writer.writelines(["AAA\n", "BBB\n"])
+        self.assertEqual("AAA\nBBB\n", stream.getvalue())
+
+    def test_output_writer_stdout(self):
+        with patch("sys.stdout", io.StringIO()) as stdout:
+            with OutputWriter() as writer:
+                writer.write("AAA\n")
+            self.assertEqual("AAA\n", stdout.getvalue())
@@ -0,0 +1,178 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from antlr.Comp0010ShellParser import Comp0010ShellParser
+from hypothesis import given, settings, strategies as st
+from parameterized import parameterized
+from parse_cache import ParseCache, build_flat_tree, build_tree, tree_cache
+from shell import build_plan, parse, stream
+from unittest.mock import patch
+from visitor import Visitor
+
+CALLS = ["echo a", "cat < x", " sort -r > y ", "echo 'p|q;r'", 'echo "`b`"']
+
+
+class TestParseCache(unittest.TestCase):
+    def setup(self, contents):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.test_dir.name)
+        self.test_file = []
+        for i in range(len(contents)):
+            self.test_file.append(str(self.temp_path) + f"/test-{i}.txt")
+            with open(self.test_file[i], "w") as f:
+                f.write(contents[i])
+        return []
+
+    def teardown(self):
+        self.test_dir.cleanup()
+
+    @parameterized.expand(
+        [
+            ("echo foo | cat ; echo bar",),
+            ("cat < a > b",),
+            ('echo "a `echo b`" c',),
+            ("echo foo;",),
+            ("",),
+            ("<a>b cat",),
+            ("echo a |",),
+        ]
+    )
+    def test_build_tree_two_stage(self, cmdline):
+        sll = build_tree(cmdline)
+        ll = build_tree(cmdline, two_stage=False)
+        self.assertEqual(
+            ll.toStringTree(recog=ll.parser),
+            sll.toStringTree(recog=sll.parser),
+        )
+
+    @parameterized.expand([("echo a", 1), ("echo a |", 2)])
+    def test_build_tree_needs_whole_line(self, cmdline, parsers):
+        # The fast parse stops before a trailing |, which must not be
+        # dropped without the full parser seeing it
+        with patch(
+            "parse_cache.Comp0010ShellParser", wraps=Comp0010ShellParser
+        ) as mock:
+            build_tree(cmdline)
+        self.assertEqual(parsers, mock.call_count)
+
+    @staticmethod
+    def plan_text(tree):
+        return Visitor().compile(tree)
+
+    @parameterized.expand(
+        [
+            ("echo a",),
+            ("a; b; c",),
+            ("a | b | c",),
+            ("a ; b | c | d; e",),
+            ("echo foo;",),
+            ("cat < a > b;echo `x;y` | grep 'a|b'",),
+        ]
+    )
+    def test_build_flat_tree(self, cmdline):
+        self.assertEqual(
+            self.plan_text(build_tree(cmdline)),
+            self.plan_text(build_flat_tree(cmdline)),
+        )
+
+    @parameterized.expand(
+        [("",), ("  ",), (";a",), ("a;;b",), ("a ;  ",), ("a |",), ("<a>b c",)]
+    )
+    def test_build_flat_tree_falls_back(self, cmdline):
+        self.assertIsNone(build_flat_tree(cmdline))
+
+    @given(
+        st.lists(
+            st.tuples(st.sampled_from(CALLS), st.sampled_from([";", "|"])),
+            min_size=1,
+            max_size=8,
+        )
+    )
+    @settings(max_examples=50, deadline=None)
+    def test_build_flat_tree_hypothesis(self, segments):
+        cmdline = "".join(call + sep for call, sep in segments)[:-1]
+        self.assertEqual(
+            self.plan_text(build_tree(cmdline)),
+            self.plan_text(build_flat_tree(cmdline)),
+        )
+
+    @parameterized.expand(
+        [
+            (";", "echo b", ["a\n"] + ["b\n"] * 10000, 10001),
+            ("|", "cat", ["a\n"], 1),
+        ]
+    )
+    def test_long_command_line(self, separator, call, expected, pipelines):
+        # Far more segments than nested nodes would fit in the stack
+        cmdline = separator.join(["echo `echo a`"] + [call] * 10000)
+        self.assertEqual(pipelines, len(build_plan(cmdline)))
+        self.assertEqual(expected, parse(cmdline))
+        self.assertEqual(expected, list(stream(cmdline)))
+
+    def test_cache_hit(self):
+        cache = ParseCache()
+        tree = cache.get("echo foo")
+        self.assertIs(tree, cache.get("echo foo"))
+        self.assertEqual((1, 1, 256, 1), tuple(cache.info()))
+
+    def test_cache_miss(self):
+        cache = ParseCache()
+        cache.get("echo foo")
+        cache.get("echo bar")
+        self.assertEqual(0, cache.hits)
+        self.assertEqual(2, cache.misses)
+        self.assertEqual(2, len(cache))
+
+    def test_cache_eviction(self):
+        cache = ParseCache(maxsize=2)
+        cache.get("echo a")
+        cache.get("echo b")
+        cache.get("echo a")
+        cache.get("echo c")
+        self.assertEqual(2, len(cache))
+        cache.get("echo a")
+        self.assertEqual(2, cache.hits)
+        cache.get("echo b")
+        self.assertEqual(4, cache.misses)
+
+    def test_cache_disabled(self):
+        cache = ParseCache(maxsize=0)
+        cache.get("echo a")
+        cache.get("echo a")
+        self.assertEqual(0, len(cache))
+        self.assertEqual(2, cache.misses)
+
+    def test_cache_clear(self):
+        cache = ParseCache()
+        cache.get("echo a")
+        cache.get("echo a")
+        cache.clear()
+        self.assertEqual((0, 0, 256, 0), tuple(cache.info()))
+
+    def test_parse_uses_cache(self):
+        tree_cache.clear()
+        parse("echo foo", fast=False)
+        parse("echo foo", fast=False)
+        self.assertEqual(1, tree_cache.hits)
+
+    def test_cached_glob_reevaluated(self):
+        self.setup(["a"])
+        os.chdir(self.temp_path)
+        first = parse("echo *", fast=False)
+        with open("test-1.txt", "w") as f:
+            f.write("b")
+        second = parse("echo *", fast=False)
+        self.assertEqual(["test-0.txt\n"], first)
+        self.assertEqual({"test-0.txt", "test-1.txt"}, set(second[0].split()))
+        self.teardown()
+
+    def test_cached_backquote_reevaluated(self):
+        self.setup(["foo\n"])
+        first = parse("echo `cat " + self.test_file[0] + "`", fast=False)
+        with open(self.test_file[0], "w") as f:
+            f.write("bar\n")
+        second = parse("echo `cat " + self.test_file[0] + "`", fast=False)
+        self.assertEqual(["foo\n"], first)
+        self.assertEqual(["bar\n"], second)
+        self.teardown()
@@ -0,0 +1,56 @@
+import re
+import unittest
+from pattern_cache import PatternCache, pattern_cache
+
+
+class TestPatternCache(unittest.TestCase):
+    def test_hit(self):
+        cache = PatternCache()
+        compiled = cache.get("a+b")
+        self.assertIs(compiled, cache.get("a+b"))
+        self.assertEqual((1, 1, 512, 1), cache.info())
+
+    def test_flags_in_key(self):
+        cache = PatternCache()
+        self.assertIsNone(cache.get("a").match("A"))
+        self.assertIsNotNone(cache.get("a", re.IGNORECASE).match("A"))
+        self.assertEqual(2, len(cache))
+
+    def test_evicts_least_recently_used(self):
+        cache = PatternCache(maxsize=2)
+        cache.get("a")
+        cache.get("b")
+        cache.get("a")
+        cache.get("c")
+        self.assertEqual(2, len(cache))
+        cache.get("a")
+        self.assertEqual(2, cache.info().hits)
+        cache.get("b")
+        self.assertEqual(4, cache.info().misses)
+
+    def test_disabled(self):
+        cache = PatternCache(maxsize=0)
+        cache.get("a")
+        cache.get("a")
+        self.assertEqual((0, 2, 0, 0), cache.info())
+
+    def test_invalid(self):
+        cache = PatternCache()
+        with self.assertRaises(re.error):
+            cache.get("[")
+        self.assertEqual(0, len(cache))
+
+    def test_clear(self):
+        cache = PatternCache()
+        cache.get("a")
+        cache.clear()
+        self.assertEqual((0, 0, 512, 0), cache.info())
+
+    def test_shared(self):
+        self.assertIsInstance(pattern_cache, PatternCache)
+
+    def test_compile(self):
+        cache = PatternCache(compile=lambda pattern, flags: pattern * 2)
+        self.assertEqual("abab", cache.get("ab"))
+        cache.get("ab")
+        self.assertEqual((1, 1, 512, 1), cache.info())
@@ -0,0 +1,47 @@
+import unittest
+from parameterized import parameterized
+from pipe import Pipe, split_lines
+from shell import parse
+
+
+class TestPipe(unittest.TestCase):
+    def test_split_lines(self):
+        items = ["a\n", "", "b", "c\nd\n", "e\n\n", "f"]
+        out = list(split_lines(items))
+        self.assertEqual(["a\n", "bc\n", "d\n", "e\n", "\n", "f"], out)
+
+    def test_split_lines_shares_items(self):
+        items = ["AAA\n", "BBB\n"]
+        out = list(split_lines(items))
+        self.assertIs(items[0], out[0])
+        self.assertIs(items[1], out[1])
+
+    def test_pipe_iter(self):
+        self.assertEqual(["a\n", "b\n"], list(Pipe(["a\nb\n"])))
+
+    def test_pipe_readline(self):
+        pipe = Pipe(["a\n", "b"])
+        self.assertEqual("a\n", pipe.readline())
+        self.assertEqual("b", pipe.readline())
+        self.assertEqual("", pipe.readline())
+
+    def test_pipe_readlines(self):
+        pipe = Pipe(["a\n", "b\n", "c\n"])
+        pipe.readline()
+        self.assertEqual(["b\n", "c\n"], pipe.readlines())
+        self.assertEqual([], pipe.readlines())
+
+    def test_pipe_read(self):
+        pipe = Pipe(["a\n", "b"])
+        self.assertEqual("a\nb", pipe.read())
+        pipe.close()
+
+    @parameterized.expand(
+        [
+            ("echo b a | sed 's/ /\\n/' | sort", ["a\n", "b\n"]),
+            ("echo c; echo b a | cat | sort -r", ["c\n", "b a\n"]),
+            ("echo AAA | uniq -i | wc -l", ["1\n"]),
+        ]
+    )
+    def test_pipe_in_pipeline(self, cmdline, expected):
+        self.assertEqual(expected, parse(cmdline))
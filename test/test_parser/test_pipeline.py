@@ -0,0 +1,188 @@
+import itertools
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from parameterized import parameterized
+from application_registry import registry
+from error import ApplicationError, FileError, RedirectError
+from pipeline import stream_pipeline
+from shell import parse, stream
+
+
+class TestPipeline(unittest.TestCase):
+    def setup(self, contents):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.test_dir.name)
+        self.test_file = []
+        for i in range(len(contents)):
+            self.test_file.append(str(self.temp_path) + f"/test-{i}.txt")
+            with open(self.test_file[i], "w") as f:
+                f.write(contents[i])
+        return []
+
+    def teardown(self):
+        self.test_dir.cleanup()
+
+    @parameterized.expand(
+        [
+            ("cat {0} | grep b",),
+            ("cat {0} | sort -r | head -n 2",),
+            ("cat {0} | uniq | cut -b 1",),
+            ("sed s/a/x/ < {0} | cat",),
+            ("cat {0} {0} | tail -n 3 | wc -l",),
+            ("echo `cat {0} | head -n 1` ; cat {0} | grep c",),
+            ("cat '{0}' | head -n 1 ; echo \"done\"",),
+        ]
+    )
+    def test_stream_matches_parse(self, cmdline):
+        self.setup(["abc\nbcd\nbcd\ncde\n"])
+        cmdline = cmdline.format(self.test_file[0])
+        self.assertEqual(parse(cmdline), list(stream(cmdline)))
+        self.teardown()
+
+    @parameterized.expand(
+        [
+            ("cat {0} | grep b",),
+            ("cat {0} | sort -r | head -n 2",),
+            ("cat {0} | uniq | cut -b 1 ; echo done",),
+            ("cat {0} > {0}.out ; cat {0}.out | head -n 1",),
+        ]
+    )
+    def test_threaded_matches_parse(self, cmdline):
+        self.setup(["abc\nbcd\nbcd\ncde\n" * 500])
+        cmdline = cmdline.format(self.test_file[0])
+        self.assertEqual(parse(cmdline), list(stream(cmdline, True)))
+        self.teardown()
+
+    @parameterized.expand([(False,), (True,)])
+    def test_long_pipeline(self, threaded):
+        self.setup(["abc\nbcd\nbcd\ncde\n"])
+        cmdline = f"cat {self.test_file[0]}" + " | sort | uniq" * 100
+        with patch("pipeline.MAX_CHAINED", 7):
+            out = list(stream(cmdline, threaded, optimized=False))
+        self.assertEqual(["abc\n", "bcd\n", "cde\n"], out)
+        self.assertEqual(out, list(stream(cmdline + " | cat" * 2000)))
+        self.teardown()
+
+    @parameterized.expand([(False,), (True,)])
+    def test_error_after_output(self, threaded):
+        self.setup(["abc\nbcd\n"])
+        out = []
+        with self.assertRaises(FileError):
+            cmdline = f"cat {self.test_file[0]} /nonexistent.txt | grep ."
+            for line in stream(cmdline, threaded):
+                out.append(line)
+        self.assertEqual(["abc\n"], out)
+        self.teardown()
+
+    def test_threaded_stops_upstream(self):
+        lines = itertools.repeat("xyz\n")
+        with patch("sys.stdin", lines):
+            out = stream("cat | grep x | head -n 3", True)
+            self.assertEqual(["xyz\n"] * 3, list(out))
+
+    @parameterized.expand(
+        [
+            ("cat {0} | head -n 1", ["abc\n"]),
+            ("head -n 1 < {0}", ["abc\n"]),
+            ("cat < {0} | grep -m 1 .", ["abc\n"]),
+            ("grep -m 1 . {0} {0}", ["{0}:abc\n", "{0}:abc\n"]),
+        ]
+    )
+    def test_stream_closes_files(self, cmdline, expected):
+        self.setup(["abc\nbcd\n"])
+        files = []
+
+        def tracked_open(*args, **kwargs):
+            files.append(builtins_open(*args, **kwargs))
+            return files[-1]
+
+        builtins_open = open
+        out = stream(cmdline.format(self.test_file[0]))
+        with patch("builtins.open", tracked_open):
+            self.assertEqual(next(out), expected[0].format(self.test_file[0]))
+            self.assertTrue(files)
+            rest = list(out)
+        self.assertEqual(
+            [line.format(self.test_file[0]) for line in expected[1:]], rest
+        )
+        self.assertTrue(all(f.closed for f in files))
+        self.teardown()
+
+    def test_stream_closed_early(self):
+        self.setup(["abc\nbcd\n"])
+        closed = []
+
+        def lines():
+            try:
+                yield from itertools.repeat("xyz\n")
+            finally:
+                closed.append(True)
+
+        with patch("sys.stdin", lines()):
+            out = stream("cat | grep x | head -n 3")
+            self.assertEqual("xyz\n", next(out))
+            out.close()
+        self.assertEqual([True], closed)
+        self.teardown()
+
+    def test_threaded_upstream_finishes(self):
+        before = threading.active_count()
+        lines = itertools.repeat("xyz\n")
+        with patch("sys.stdin", lines):
+            out = stream("cat | grep x | head -n 3 | grep y", True)
+            self.assertEqual([], list(out))
+        deadline = time.monotonic() + 5
+        while threading.active_count() > before:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_threaded_unsupported_application(self):
+        with self.assertRaises(ApplicationError):
+            list(stream("echo a | foo", True))
+
+    def test_stream_is_lazy(self):
+        lines = itertools.repeat("xyz\n")
+        with patch("sys.stdin", lines):
+            out = stream("cat | grep x | head -n 3")
+            self.assertEqual(["xyz\n"] * 3, list(out))
+
+    def test_stream_output_redirection(self):
+        self.setup(["abc\nbcd\n"])
+        output = str(self.temp_path / "out.txt")
+        out = stream(f"cat {self.test_file[0]} > {output} | echo done")
+        self.assertEqual(["done\n"], list(out))
+        with open(output) as f:
+            self.assertEqual("abc\nbcd\n", f.read())
+        self.teardown()
+
+    def test_stream_input_not_found(self):
+        with self.assertRaises(RedirectError):
+            list(stream("cat < /nonexistent/file.txt"))
+
+    def test_stream_too_many_redirections(self):
+        with self.assertRaises(RedirectError):
+            list(stream("cat < a.txt < b.txt"))
+
+    def test_stream_input_and_pipe(self):
+        with self.assertRaises(RedirectError):
+            list(stream("echo a | cat < a.txt"))
+
+    def test_default_stream_materializes(self):
+        out = registry.resolve("sort").stream([], ["b\n", "a\n"])
+        self.assertEqual(["a\n", "b\n"], list(out))
+
+    def test_help_decorator_stream(self):
+        out = list(registry.resolve("cat").stream(["--help"]))
+        self.assertTrue(out)
+
+    def test_unsafe_decorator_stream(self):
+        out = list(registry.resolve("_cat").stream(["/nonexistent.txt"]))
+        self.assertEqual(1, len(out))
+        self.assertTrue(out[0].startswith("An exception occurred"))
+
+    def test_stream_pipeline_empty(self):
+        self.assertEqual([], list(stream_pipeline([])))
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+from parameterized import parameterized
+from unittest.mock import patch
+from application_registry import registry
+from error import ArgumentError
+from process_stage import (
+    get_pool,
+    map_ordered,
+    read_batches,
+    stream_processes,
+)
+from shell import parse, stream
+
+
+class TestProcessStage(unittest.TestCase):
+    lines = [f"{word}{i % 17}\n" for i in range(100) for word in "ab"]
+
+    def setUp(self):
+        # Worker processes are started in the current directory, which
+        # other tests may have removed.
+        os.chdir(tempfile.gettempdir())
+
+    def test_read_batches(self):
+        batches = list(read_batches(iter("abcdefg"), 3))
+        self.assertEqual([list("abc"), list("def"), ["g"]], batches)
+
+    def test_read_batches_empty(self):
+        self.assertEqual([], list(read_batches([], 3)))
+
+    @parameterized.expand([(0,), (2,)])
+    def test_map_ordered(self, workers):
+        calls = [(f"{i}",) for i in range(20)]
+        out = map_ordered(int, calls, workers)
+        self.assertEqual(list(range(20)), list(out))
+
+    def test_map_ordered_lazy(self):
+        calls = iter([("1",), ("2",), ("3",)])
+        out = map_ordered(int, calls, 0)
+        self.assertEqual(1, next(out))
+        out.close()
+        self.assertEqual([("2",), ("3",)], list(calls))
+
+    @parameterized.expand(
+        [
+            ("grep", ["b1"]),
+            ("sed", ["s/a/x/"]),
+            ("cut", ["-b", "2-"]),
+            ("sort", []),
+            ("sort", ["-r"]),
+        ]
+    )
+    def test_stream_processes(self, name, args):
+        expected = list(registry.resolve(name).stream(args, self.lines))
+        out = stream_processes(name, args, iter(self.lines), 2, 7)
+        self.assertEqual(expected, list(out))
+
+    def test_stream_processes_error(self):
+        with self.assertRaises(ArgumentError) as expected:
+            list(parse("echo a | sed s/a"))
+        with self.assertRaises(ArgumentError) as error:
+            list(stream("echo a | sed s/a", processes=2))
+        self.assertEqual(str(expected.exception), str(error.exception))
+
+    def test_stream_processes_no_stdin(self):
+        with self.assertRaises(ArgumentError):
+            list(stream_processes("grep", ["a"], [], 2))
+
+    @parameterized.expand(
+        [
+            ("echo b a | sed 's/ /\\n/' | sort",),
+            ("echo abc | cut -b 1,3 | grep a",),
+            ("echo abc | grep --help",),
+            ("echo abc | _grep '['",),
+            ("echo ab; echo cd | sort -r ; echo ef | uniq",),
+        ]
+    )
+    def test_matches_parse(self, cmdline):
+        self.assertEqual(parse(cmdline), list(stream(cmdline, processes=2)))
+
+    def test_pools_per_worker_count(self):
+        self.assertIs(get_pool(2), get_pool(2))
+        self.assertIsNot(get_pool(2), get_pool(3))
+
+    @patch("apps.grep.FILES_PER_BATCH", 1)
+    @patch("apps.grep.PARALLEL_MIN_FILES", 1)
+    @patch("apps.grep.os.cpu_count", return_value=4)
+    def test_grep_recursive_in_processes(self, _):
+        # More output than one batch of sed, so both stages have calls
+        # in flight at once, on pools of different sizes
+        with tempfile.TemporaryDirectory() as test_dir:
+            expected = []
+            for i in range(50):
+                path = os.path.join(test_dir, f"{i:02}.txt")
+                with open(path, "w") as f:
+                    f.writelines(f"AAA {j}\nCCC\n" for j in range(200))
+                expected += [f"{path}:BBB {j}\n" for j in range(200)]
+            cmdline = f"grep -r AAA {test_dir} | sed s/AAA/BBB/"
+            self.assertEqual(expected, list(stream(cmdline, processes=2)))
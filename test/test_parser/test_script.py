@@ -0,0 +1,124 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from parameterized import parameterized
+from unittest.mock import patch
+from error import FileError
+from script import (
+    cache_path,
+    compile_script,
+    load_plan,
+    script_plan,
+    stream_script,
+)
+from shell import parse
+
+
+class TestScript(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.test_dir.name)
+        self.cache_dir = str(self.temp_path / "cache")
+        self.script = str(self.temp_path / "script.sh")
+        os.chdir(self.test_dir.name)
+        for name in ("a.txt", "b.txt"):
+            (self.temp_path / name).write_text(f"{name}\nline\n")
+
+    def tearDown(self):
+        os.chdir(tempfile.gettempdir())
+        self.test_dir.cleanup()
+
+    def write_script(self, text):
+        with open(self.script, "w") as f:
+            f.write(text)
+        return self.script
+
+    def run_script(self, text, cache_dir=None):
+        self.write_script(text)
+        return list(stream_script(self.script, cache_dir=cache_dir))
+
+    @parameterized.expand(
+        [
+            ("echo a b",),
+            ("echo 'a  b'c",),
+            ('echo "x `echo b`" y',),
+            ("echo `echo c d`e",),
+            ("echo '*'.txt",),
+            ("cat *.txt | grep line",),
+            ("echo a*'.txt'",),
+            ("echo `echo *.txt`",),
+            ("echo a > o.txt; cat < o.txt",),
+            ("echo b>>o.txt; < o.txt cat",),
+            ('echo "`echo a` `echo a`"',),
+            ("echo a; echo b | cat; echo c",),
+        ]
+    )
+    def test_script_matches_parse(self, cmdline):
+        expected = parse(cmdline)
+        for cache_dir in ("", self.cache_dir, self.cache_dir):
+            if os.path.exists("o.txt"):
+                os.remove("o.txt")
+            self.assertEqual(expected, self.run_script(cmdline, cache_dir))
+
+    def test_script_lines(self):
+        text = "echo a\n\n  \necho `echo b`; echo c\ncat a.txt\n"
+        self.assertEqual(
+            ["a\n", "b\n", "c\n", "a.txt\n", "line\n"],
+            self.run_script(text),
+        )
+
+    def test_script_cached(self):
+        text = "echo `echo a`\necho b | cat\n"
+        self.assertEqual(["a\n", "b\n"], self.run_script(text, self.cache_dir))
+        path = cache_path(text, self.cache_dir)
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(compile_script(text), load_plan(path))
+        with patch("script.compile_script") as compile_mock:
+            out = self.run_script(text, self.cache_dir)
+        compile_mock.assert_not_called()
+        self.assertEqual(["a\n", "b\n"], out)
+
+    def test_script_cache_keyed_by_contents(self):
+        self.run_script("echo a\n", self.cache_dir)
+        self.assertEqual(["b\n"], self.run_script("echo b\n", self.cache_dir))
+        self.assertEqual(2, len(os.listdir(self.cache_dir)))
+
+    def test_script_cache_version(self):
+        path = cache_path("echo a\n", self.cache_dir)
+        with patch("script.PLAN_VERSION", -1):
+            self.assertNotEqual(path, cache_path("echo a\n", self.cache_dir))
+
+    def test_script_cache_corrupt(self):
+        text = "echo a\n"
+        path = cache_path(text, self.cache_dir)
+        os.makedirs(self.cache_dir)
+        with open(path, "w") as f:
+            f.write('[[["echo"')
+        self.assertIsNone(load_plan(path))
+        self.assertEqual(["a\n"], self.run_script(text, self.cache_dir))
+        self.assertEqual(compile_script(text), load_plan(path))
+
+    def test_script_cache_unwritable(self):
+        Path(self.cache_dir).write_text("")
+        self.assertEqual(["a\n"], self.run_script("echo a\n", self.cache_dir))
+
+    def test_script_no_cache(self):
+        self.run_script("echo a\n", "")
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_script_error(self):
+        out = []
+        self.write_script("echo a\ncat missing.txt\necho b\n")
+        with self.assertRaises(FileError):
+            for line in stream_script(self.script, cache_dir=""):
+                out.append(line)
+        self.assertEqual(["a\n"], out)
+
+    def test_script_long(self):
+        text = "".join(f"echo '{i}'; echo `echo x`\n" for i in range(3000))
+        plan = script_plan(self.write_script(text), self.cache_dir)
+        self.assertEqual(6000, len(plan))
+        out = self.run_script(text, self.cache_dir)
+        self.assertEqual(6000, len(out))
+        self.assertEqual(["2999\n", "x\n"], out[-2:])
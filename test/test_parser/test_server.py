@@ -0,0 +1,134 @@
+import io
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from client import decode_request, encode_request, peer_uid, send_request
+from server import remove_stale_socket
+
+SERVER = Path(__file__).parents[2] / "src" / "server.py"
+
+
+class TestServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.test_dir = tempfile.TemporaryDirectory()
+        cls.temp_path = Path(cls.test_dir.name)
+        cls.socket_path = str(cls.temp_path / "shell.sock")
+        cls.server = subprocess.Popen(
+            [sys.executable, str(SERVER), "--socket", cls.socket_path],
+            cwd=cls.test_dir.name,
+        )
+        for _ in range(300):
+            if os.path.exists(cls.socket_path):
+                break
+            time.sleep(0.05)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.terminate()
+        cls.server.wait()
+        cls.test_dir.cleanup()
+
+    def setUp(self):
+        os.chdir(self.test_dir.name)
+
+    def request(self, argv, stdin=""):
+        files = []
+        for name, contents in (("in", stdin), ("out", ""), ("err", "")):
+            path = self.temp_path / name
+            path.write_text(contents)
+            files.append(open(path, "r+"))
+        try:
+            fds = [file.fileno() for file in files]
+            status = send_request(self.socket_path, argv, fds)
+        finally:
+            for file in files:
+                file.close()
+        out = (self.temp_path / "out").read_text()
+        err = (self.temp_path / "err").read_text()
+        return status, out, err
+
+    def test_encode_request(self):
+        data = encode_request("/a b", ["-c", "echo 'x\ny'", ""])
+        self.assertEqual(len(data) - 4, int.from_bytes(data[:4], "big"))
+        self.assertEqual(
+            ("/a b", ["-c", "echo 'x\ny'", ""]), decode_request(data[4:])
+        )
+
+    def test_request(self):
+        status, out, _ = self.request(["-c", "echo `echo hi` | cat"])
+        self.assertEqual((0, "hi\n"), (status, out))
+
+    def test_request_stdin(self):
+        status, out, _ = self.request(["-c", "sort | uniq"], "b\na\nb\n")
+        self.assertEqual((0, "a\nb\n"), (status, out))
+
+    def test_request_cwd(self):
+        directory = self.temp_path / "dir"
+        directory.mkdir(exist_ok=True)
+        os.chdir(directory)
+        status, out, _ = self.request(["-c", "pwd; cd ..; pwd"])
+        self.assertEqual(
+            (0, f"{directory}\n{self.temp_path}\n"), (status, out)
+        )
+        status, out, _ = self.request(["-c", "pwd"])
+        self.assertEqual((0, f"{directory}\n"), (status, out))
+
+    def test_request_error(self):
+        status, out, err = self.request(["-c", "unknown"])
+        self.assertEqual((1, ""), (status, out))
+        self.assertIn("ApplicationError", err)
+
+    def test_request_exit(self):
+        status, out, _ = self.request(["-c", "echo a; exit; echo b"])
+        self.assertEqual(0, status)
+        self.assertIn("a\n", out)
+        self.assertNotIn("b\n", out)
+
+    def test_no_daemon(self):
+        path = str(self.temp_path / "missing.sock")
+        self.assertIsNone(send_request(path, ["-c", "echo hi"]))
+
+    def test_peer_uid(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.socket_path)
+            self.assertEqual(os.getuid(), peer_uid(sock, self.socket_path))
+
+    def test_daemon_of_other_user(self):
+        read, write = os.pipe()
+        try:
+            with patch("client.peer_uid", return_value=os.getuid() + 1):
+                with patch("sys.stderr", new_callable=io.StringIO) as err:
+                    status = send_request(
+                        self.socket_path, ["-c", "echo hi"], [0, write, 2]
+                    )
+            self.assertIsNone(status)
+            self.assertIn("not run by this user", err.getvalue())
+            os.close(write)
+            write = None
+            # No descriptor was handed over, so nothing holds the pipe open
+            self.assertEqual(b"", os.read(read, 100))
+        finally:
+            os.close(read)
+            if write is not None:
+                os.close(write)
+
+    def test_remove_stale_socket(self):
+        path = str(self.temp_path / "stale.sock")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(path)
+        sock.close()
+        remove_stale_socket(path)
+        self.assertFalse(os.path.exists(path))
+        remove_stale_socket(path)
+
+    def test_remove_stale_socket_listening(self):
+        with self.assertRaises(OSError):
+            remove_stale_socket(self.socket_path)
+        self.assertTrue(os.path.exists(self.socket_path))
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from call import Call
+from shell import parse, stream
+from sink import FileSink, NullSink, open_sink
+
+
+class TestSink(unittest.TestCase):
+    def setup(self, contents):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.test_dir.name)
+        self.test_file = []
+        for i in range(len(contents)):
+            self.test_file.append(str(self.temp_path) + f"/test-{i}.txt")
+            with open(self.test_file[i], "w") as f:
+                f.write(contents[i])
+        return []
+
+    def teardown(self):
+        self.test_dir.cleanup()
+
+    def test_file_sink(self):
+        self.setup([])
+        path = str(self.temp_path / "out.txt")
+        sink = FileSink(path, "w")
+        sink.append("AAA\n")
+        sink.extend(iter(["BBB\n"]))
+        sink += ["CCC\n"]
+        sink.close()
+        with open(path) as f:
+            self.assertEqual("AAA\nBBB\nCCC\n", f.read())
+        self.teardown()
+
+    def test_null_sink(self):
+        produced = []
+
+        def lines():
+            for line in ["AAA\n", "BBB\n"]:
+                produced.append(line)
+                yield line
+
+        sink = NullSink()
+        sink.append("AAA\n")
+        sink.extend(lines())
+        sink.close()
+        self.assertEqual(["AAA\n", "BBB\n"], produced)
+
+    def test_open_sink(self):
+        self.assertIsInstance(open_sink(os.devnull, "w"), NullSink)
+        self.assertIsInstance(open_sink("/dev/../dev/null", "a"), NullSink)
+
+    def test_redirect_opens_target_first(self):
+        self.setup(["AAA\n"])
+        Call(["cat", self.test_file[0]], [], [[self.test_file[0], "w"]], [[]])
+        with open(self.test_file[0]) as f:
+            self.assertEqual("", f.read())
+        self.teardown()
+
+    def test_redirect_dev_null(self):
+        self.setup(["AAA\n"])
+        out = parse(f"cat {self.test_file[0]} > {os.devnull}; echo BBB")
+        self.assertEqual(["BBB\n"], out)
+        out = stream(f"cat {self.test_file[0]} > {os.devnull}; echo BBB")
+        self.assertEqual(["BBB\n"], list(out))
+        self.teardown()
+
+    def test_redirect_append(self):
+        self.setup(["AAA\n"])
+        parse(f"echo BBB >> {self.test_file[0]}")
+        list(stream(f"echo CCC >> {self.test_file[0]}"))
+        with open(self.test_file[0]) as f:
+            self.assertEqual("AAA\nBBB\nCCC\n", f.read())
+        self.teardown()
@@ -0,0 +1,95 @@
+import itertools
+import threading
+import unittest
+from stage_thread import StageThread
+
+
+class TestStageThread(unittest.TestCase):
+    def test_stage_thread(self):
+        lines = [f"{i}\n" for i in range(1000)]
+        stage = StageThread(iter(lines), queue_size=2, batch_size=16)
+        stage.start()
+        self.assertEqual(lines, list(stage))
+
+    def test_stage_thread_empty(self):
+        stage = StageThread(iter([]))
+        stage.start()
+        self.assertEqual([], list(stage))
+
+    def test_stage_thread_error(self):
+        def lines():
+            yield "a\n"
+            yield "b\n"
+            raise ValueError("broken")
+
+        stage = StageThread(lines(), batch_size=16)
+        stage.start()
+        out = []
+        with self.assertRaises(ValueError):
+            for line in stage:
+                out.append(line)
+        self.assertEqual(["a\n", "b\n"], out)
+
+    def test_stage_thread_stopped(self):
+        closed = threading.Event()
+
+        def lines():
+            try:
+                yield from itertools.repeat("a\n")
+            finally:
+                closed.set()
+
+        stage = StageThread(lines(), queue_size=1, batch_size=4)
+        stage.start()
+        out = iter(stage)
+        self.assertEqual(["a\n"] * 10, list(itertools.islice(out, 10)))
+        out.close()
+        stage.join(timeout=5)
+        self.assertFalse(stage.is_alive())
+        self.assertTrue(closed.is_set())
+
+    def test_stage_thread_sends_slow_lines(self):
+        ready = threading.Event()
+
+        def lines():
+            yield "a\n"
+            ready.wait(timeout=5)
+            yield "b\n"
+
+        stage = StageThread(lines(), batch_size=16, latency=0)
+        stage.start()
+        out = iter(stage)
+        self.assertEqual("a\n", next(out))
+        ready.set()
+        self.assertEqual(["b\n"], list(out))
+
+    def test_stage_thread_stalled_after_first_line(self):
+        ready = threading.Event()
+        waited = []
+
+        def lines():
+            yield "a\n"
+            waited.append(ready.wait(timeout=5))
+            yield "b\n"
+
+        stage = StageThread(lines(), batch_size=16)
+        stage.start()
+        out = iter(stage)
+        self.assertEqual("a\n", next(out))
+        ready.set()
+        self.assertEqual(["b\n"], list(out))
+        self.assertEqual([True], waited)
+
+    def test_stage_thread_close(self):
+        upstream = StageThread(itertools.repeat("a\n"), queue_size=1)
+        upstream.start()
+        stage = StageThread(
+            (line for line in upstream if line == "b\n"), queue_size=1
+        )
+        stage.start()
+        stage.close()
+        upstream.close()
+        stage.join(timeout=5)
+        upstream.join(timeout=5)
+        self.assertFalse(stage.is_alive())
+        self.assertFalse(upstream.is_alive())
@@ -0,0 +1,73 @@
+import tempfile
+import unittest
+from executor import execute
+from pathlib import Path
+from parse_cache import ParseCache
+from shell import parse
+from substitution import Substitution
+from unittest.mock import patch
+from visitor import Visitor
+
+
+class TestSubstitution(unittest.TestCase):
+    def setup(self, contents):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.test_dir.name)
+        self.test_file = []
+        for i in range(len(contents)):
+            self.test_file.append(str(self.temp_path) + f"/test-{i}.txt")
+            with open(self.test_file[i], "w") as f:
+                f.write(contents[i])
+        return []
+
+    def teardown(self):
+        self.test_dir.cleanup()
+
+    def test_evaluate(self):
+        substitution = Substitution(Visitor, ParseCache())
+        out = substitution.evaluate("echo foo; echo bar")
+        self.assertEqual("foo bar", out)
+
+    def test_evaluate_memoized(self):
+        cache = ParseCache()
+        substitution = Substitution(Visitor, cache)
+        substitution.evaluate('echo "foo"')
+        substitution.evaluate('echo "foo"')
+        self.assertEqual(1, cache.misses)
+        self.assertEqual(0, cache.hits)
+        self.assertEqual({'echo "foo"': "foo"}, substitution.results)
+
+    def test_evaluate_parse_cached(self):
+        cache = ParseCache()
+        substitution = Substitution(Visitor, cache)
+        substitution.evaluate('echo "foo"')
+        substitution.clear()
+        substitution.evaluate('echo "foo"')
+        self.assertEqual(1, cache.hits)
+
+    def test_evaluate_fast_path(self):
+        cache = ParseCache()
+        substitution = Substitution(Visitor, cache)
+        self.assertEqual("foo", substitution.evaluate("echo foo"))
+        self.assertEqual(0, cache.misses)
+
+    def test_memo_shared_within_call(self):
+        self.setup([])
+        out = parse('echo `echo foo` "`echo foo`" a`echo foo`')
+        self.assertEqual("foo foo afoo\n", "".join(out))
+        self.teardown()
+
+    def test_memo_cleared_between_calls(self):
+        self.setup(["foo\n"])
+        cmd = "cat " + self.test_file[0]
+        out = parse(
+            f"echo `{cmd}`; echo bar > {self.test_file[0]}; echo `{cmd}`"
+        )
+        self.assertEqual("foo\nbar\n", "".join(out))
+        self.teardown()
+
+    def test_memo_shared_across_substitutions(self):
+        with patch("substitution.execute", wraps=execute) as mock:
+            out = parse("echo `echo a` `echo b` `echo a`")
+        self.assertEqual("a b a\n", "".join(out))
+        self.assertEqual(2, mock.call_count)
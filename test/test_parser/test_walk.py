@@ -0,0 +1,68 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from walk import walk_files
+
+
+class TestWalk(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.root = self.test_dir.name
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def touch(self, *names):
+        for name in names:
+            path = Path(self.root) / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("")
+
+    def walk(self, root=None):
+        root = self.root if root is None else root
+        return [
+            os.path.relpath(path, self.root) for path in walk_files(root)
+        ]
+
+    def test_walk_order(self):
+        self.touch("b.txt", "a/z.txt", "a/b/c.txt", "c/d.txt", "a.txt")
+        self.assertEqual(
+            ["a/b/c.txt", "a/z.txt", "a.txt", "b.txt", "c/d.txt"],
+            self.walk(),
+        )
+
+    def test_walk_skips_hidden(self):
+        self.touch(".a.txt", ".git/b.txt", "c/.d.txt", "e.txt")
+        self.assertEqual(["e.txt"], self.walk())
+
+    def test_walk_skips_links(self):
+        self.touch("a/b.txt")
+        os.symlink(os.path.join(self.root, "a"), os.path.join(self.root, "l"))
+        os.symlink(
+            os.path.join(self.root, "a", "b.txt"),
+            os.path.join(self.root, "a", "c.txt"),
+        )
+        self.assertEqual(["a/b.txt"], self.walk())
+
+    def test_walk_paths_start_with_root(self):
+        self.touch("a/b.txt")
+        paths = list(walk_files(os.path.join(self.root, "a")))
+        self.assertEqual([os.path.join(self.root, "a", "b.txt")], paths)
+
+    def test_walk_empty_and_missing(self):
+        self.assertEqual([], self.walk())
+        self.assertEqual([], self.walk(os.path.join(self.root, "missing")))
+
+    def test_walk_deep(self):
+        path = os.path.join(self.root, *(["d"] * 200))
+        os.makedirs(path)
+        Path(path, "f.txt").write_text("")
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(100)
+        try:
+            paths = list(walk_files(self.root))
+        finally:
+            sys.setrecursionlimit(limit)
+        self.assertEqual([os.path.join(path, "f.txt")], paths)